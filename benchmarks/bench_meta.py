@@ -0,0 +1,100 @@
+"""
+Benchmark of SingletonMeta steady state access.
+
+Compares instance lookup of SingletonMeta against the unsynchronized
+implementation it replaced, from 1 and 32 concurrent threads,
+then access of thread scoped and lazy classes from 1 thread.
+
+Usage: python benchmarks/bench_meta.py [calls per thread]
+"""
+
+import sys
+import threading
+import time
+
+from kutil.meta import SingletonMeta, SCOPE_THREAD
+
+
+class UnsynchronizedSingletonMeta(type):
+    """
+    Previous implementation, without any locking.
+    """
+
+    _instances = {}
+
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls._instances:
+            instance = super().__call__(*args, **kwargs)
+            cls._instances[cls] = instance
+            instance.post_init()
+
+        return cls._instances[cls]
+
+
+class Synchronized(metaclass=SingletonMeta):
+    def post_init(self):
+        pass
+
+
+class Unsynchronized(metaclass=UnsynchronizedSingletonMeta):
+    def post_init(self):
+        pass
+
+
+class ThreadScoped(metaclass=SingletonMeta, scope=SCOPE_THREAD):
+    def post_init(self):
+        pass
+
+
+class Lazy(metaclass=SingletonMeta, lazy=True):
+    def post_init(self):
+        pass
+
+
+def measure(cls: type, thread_count: int, calls: int):
+    """
+    Returns average nanoseconds per call when each
+    of the threads calls the class provided amount of times.
+    """
+
+    cls()
+    barrier = threading.Barrier(thread_count + 1)
+
+    def access():
+        barrier.wait()
+
+        for _ in range(calls):
+            cls()
+
+    threads = [threading.Thread(target=access) for _ in range(thread_count)]
+
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.join()
+
+    return (time.perf_counter() - start) * 1e9 / (thread_count * calls)
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    for thread_count in (1, 32):
+        baseline = min(measure(Unsynchronized, thread_count, calls) for _ in range(3))
+        current = min(measure(Synchronized, thread_count, calls) for _ in range(3))
+
+        print(f"{thread_count:>2} threads: unsynchronized {baseline:6.1f} ns/call, "
+              f"SingletonMeta {current:6.1f} ns/call ({current / baseline:.2f}x)")
+
+    # Lazy class is measured before it's resolved, while calls return the proxy.
+    for name, cls in (("thread scoped", ThreadScoped), ("lazy", Lazy)):
+        current = min(measure(cls, 1, calls) for _ in range(3))
+        print(f"{name:>13}: SingletonMeta {current:6.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark of get_running_processes on a host running many processes.
+
+Process table of 5000 processes is simulated, so that results don't
+depend on the machine. Compares against the previous implementation
+(list membership, name() call per process, early exit).
+
+Usage: python benchmarks/bench_process.py [process count] [requested names]
+"""
+
+import sys
+import timeit
+from unittest import mock
+
+import psutil
+
+from kutil.process import get_running_processes, set_process_backend, PSUTIL_BACKEND
+
+
+class FakeProcess:
+    """
+    Process with prefetched info, name() stands for the
+    per-process call previous implementation made.
+    """
+
+    __slots__ = ("pid", "info")
+
+    def __init__(self, pid: int, name: str):
+        self.pid = pid
+        self.info = {"name": name}
+
+    def name(self):
+        return self.info["name"]
+
+
+def previous_get_running_processes(processes: list[str]):
+    running_processes = []
+
+    for process in psutil.process_iter(['name']):
+        if len(running_processes) == len(processes):
+            break
+
+        try:
+            if process.name() in processes:
+                running_processes.append(process)
+
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+    return running_processes
+
+
+def main():
+    process_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    name_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    # Every requested name runs twice near the end of the table,
+    # so neither implementation can stop early.
+    table = [FakeProcess(pid, f"process-{pid % 700}.exe") for pid in range(process_count)]
+    requested = [f"service-{index}.exe" for index in range(name_count)]
+    table += [FakeProcess(process_count + index, name) for index, name in enumerate(requested * 2)]
+
+    # Simulated table is served by psutil, /proc backend is measured in bench_procfs.
+    set_process_backend(PSUTIL_BACKEND)
+
+    with mock.patch("psutil.process_iter", side_effect=lambda attrs: iter(table)):
+        runs = 20
+        previous = min(timeit.repeat(lambda: previous_get_running_processes(requested), number=runs, repeat=5)) / runs
+        current = min(timeit.repeat(lambda: get_running_processes(requested), number=runs, repeat=5)) / runs
+
+    print(f"{len(table)} processes, {name_count} names: previous {previous * 1000:.2f} ms, "
+          f"current {current * 1000:.2f} ms (speedup {previous / current:.2f}x)")
+
+    start = timeit.default_timer()
+    get_running_processes(requested)
+    print(f"Real process table of this host: {(timeit.default_timer() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
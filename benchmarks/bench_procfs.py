@@ -0,0 +1,63 @@
+"""
+Benchmark of process scanning through /proc against psutil.
+
+Runs on the real process table of the host (Linux only). Compares
+reading name, exe and create_time of all processes, and lookup of
+a few names with get_running_processes on both backends.
+
+Usage: python benchmarks/bench_procfs.py [repeat]
+"""
+
+import sys
+import timeit
+
+import psutil
+
+from kutil import procfs
+from kutil.process import get_running_processes, set_process_backend, PROC_BACKEND, PSUTIL_BACKEND
+
+ATTRIBUTES = ["name", "exe", "create_time"]
+
+
+def scan_psutil():
+    return [(process.pid, *process.info.values()) for process in psutil.process_iter(ATTRIBUTES)]
+
+
+def scan_procfs():
+    return list(procfs.iter_processes())
+
+
+def measure(function, repeat: int):
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    if not procfs.is_available():
+        print("/proc isn't available on this host.")
+        return
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    names = ["python", "sshd", "missing"]
+    process_count = len(procfs.get_pids())
+
+    # psutil caches Process objects between process_iter calls,
+    # measured times are of the warm scans both backends face in a loop.
+    # Ratio below 1 means /proc backend is slower than psutil.
+    psutil_scan = measure(scan_psutil, repeat)
+    procfs_scan = measure(scan_procfs, repeat)
+
+    print(f"{process_count} processes, full scan: psutil {psutil_scan:.2f} ms, "
+          f"/proc {procfs_scan:.2f} ms (speedup {psutil_scan / procfs_scan:.2f}x)")
+
+    results = {}
+
+    for backend in (PSUTIL_BACKEND, PROC_BACKEND):
+        set_process_backend(backend)
+        results[backend] = measure(lambda: get_running_processes(names, attrs=ATTRIBUTES), repeat)
+
+    print(f"get_running_processes({names}): psutil {results[PSUTIL_BACKEND]:.2f} ms, "
+          f"/proc {results[PROC_BACKEND]:.2f} ms (speedup {results[PSUTIL_BACKEND] / results[PROC_BACKEND]:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark of get_members with and without discovery cache.
+
+Generates a package of plugin modules, few of which define subclasses
+of the base class, and measures discovery as a fresh start would do it
+(package modules unloaded before each run).
+
+Usage: python benchmarks/bench_reflection.py [module count] [plugin count]
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import timeit
+
+from kutil.reflection import get_members, set_member_cache_path
+
+PACKAGE_NAME = "bench_plugins"
+
+
+def create_package(directory: str, module_count: int, plugin_count: int):
+    package_directory = os.path.join(directory, PACKAGE_NAME)
+    os.makedirs(package_directory)
+
+    with open(os.path.join(package_directory, "__init__.py"), "w") as file:
+        file.write("")
+
+    with open(os.path.join(package_directory, "base.py"), "w") as file:
+        file.write("class Plugin:\n    pass\n")
+
+    for index in range(module_count):
+        with open(os.path.join(package_directory, f"module_{index}.py"), "w") as file:
+            if index < plugin_count:
+                file.write(f"from {PACKAGE_NAME}.base import Plugin\n\nclass Plugin{index}(Plugin):\n    pass\n")
+
+            else:
+                helpers = "\n".join(f"class Helper{index}_{number}:\n    pass\n" for number in range(10))
+                file.write(f"import json\n\n{helpers}\n")
+
+
+def unload_package():
+    for module_name in [name for name in sys.modules if name.startswith(f"{PACKAGE_NAME}.")]:
+        del sys.modules[module_name]
+
+
+def discover(cached: bool):
+    unload_package()
+    plugin_class = importlib.import_module(f"{PACKAGE_NAME}.base").Plugin
+    return list(get_members(PACKAGE_NAME, plugin_class, cached=cached))
+
+
+def main():
+    module_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    plugin_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with tempfile.TemporaryDirectory() as directory:
+        create_package(directory, module_count, plugin_count)
+        sys.path.insert(0, directory)
+        set_member_cache_path(os.path.join(directory, "members.json"))
+
+        assert len(discover(cached=True)) == plugin_count
+
+        uncached = min(timeit.repeat(lambda: discover(cached=False), number=1, repeat=5)) * 1000
+        cached = min(timeit.repeat(lambda: discover(cached=True), number=1, repeat=5)) * 1000
+
+    print(f"{module_count} modules, {plugin_count} plugins: walk {uncached:.1f} ms, "
+          f"cached {cached:.1f} ms (speedup {uncached / cached:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
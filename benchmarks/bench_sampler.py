@@ -0,0 +1,77 @@
+"""
+Benchmark of ResourceSampler ticks against reading metrics
+with a separate psutil call per metric.
+
+Samples CPU percent, RSS and thread count of every process of
+the host this runs on, that the current user can access, with
+both process backends (psutil oneshot and /proc on Linux).
+
+Usage: python benchmarks/bench_sampler.py [ticks]
+"""
+
+import sys
+import timeit
+
+import psutil
+
+from kutil import procfs
+from kutil.process import (
+    ResourceSampler,
+    set_process_backend,
+    CPU_PERCENT_METRIC,
+    NUM_THREADS_METRIC,
+    RSS_METRIC,
+    PROC_BACKEND,
+    PSUTIL_BACKEND,
+)
+
+
+def accessible_processes():
+    processes = []
+
+    for process in psutil.process_iter():
+        try:
+            process.memory_info()
+            processes.append(process)
+
+        except psutil.Error:
+            continue
+
+    return processes
+
+
+def sample_per_metric(processes: list[psutil.Process]):
+    samples = []
+
+    for process in processes:
+        try:
+            samples.append((process.cpu_percent(None), process.memory_info().rss, process.num_threads()))
+
+        except psutil.Error:
+            continue
+
+    return samples
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    processes = accessible_processes()
+
+    per_metric = min(timeit.repeat(lambda: sample_per_metric(processes), number=1, repeat=ticks)) * 1000
+    print(f"{len(processes)} processes, 3 metrics per tick: per metric calls {per_metric:.2f} ms")
+
+    backends = [PSUTIL_BACKEND, PROC_BACKEND] if procfs.is_available() else [PSUTIL_BACKEND]
+
+    for backend in backends:
+        set_process_backend(backend)
+
+        sampler = ResourceSampler(metrics=[CPU_PERCENT_METRIC, RSS_METRIC, NUM_THREADS_METRIC], capacity=ticks)
+        sampler.add(*processes)
+
+        batched = min(timeit.repeat(sampler.sample, number=1, repeat=ticks)) * 1000
+        # Ratio below 1 means the sampler is slower than per metric calls.
+        print(f"ResourceSampler, {backend} backend: {batched:.2f} ms (speedup {per_metric / batched:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
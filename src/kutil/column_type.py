@@ -0,0 +1,210 @@
+from datetime import datetime
+from itertools import chain, islice, zip_longest
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Sequence
+
+from kutil.date import ISO_DATE_FORMAT, string_to_date
+from kutil.number import is_float, is_int
+
+BOOL_TYPE = "bool"
+INT_TYPE = "int"
+FLOAT_TYPE = "float"
+DATE_TYPE = "date"
+STRING_TYPE = "string"
+
+# Cell values treated as missing, they don't narrow the type.
+DEFAULT_NULL_VALUES = frozenset({""})
+
+_BOOL_VALUES = {"true": True, "false": False}
+
+
+class ColumnType(NamedTuple):
+    """
+    Inferred type of a column.
+
+    name - one of BOOL_TYPE, INT_TYPE, FLOAT_TYPE, DATE_TYPE, STRING_TYPE.
+    converter - converts cell string to value of the type, null values to None.
+    nullable - whether null values were seen before type was known.
+    """
+
+    name: str
+    converter: Callable[[str], Any]
+    nullable: bool = False
+
+
+def _is_bool(value: str):
+    return value.lower() in _BOOL_VALUES
+
+
+def _to_bool(value: str):
+    return _BOOL_VALUES[value.lower()]
+
+
+def _is_number(value: str):
+    return is_float(value) or is_int(value)
+
+
+def _is_iso_date(value: str):
+    """
+    Checks if value can be converted with kutil.date.string_to_date.
+    Values not ending with 'Z' are rejected without parsing.
+    """
+
+    if not value.endswith("Z") or "T" not in value:
+        return False
+
+    try:
+        datetime.strptime(value, ISO_DATE_FORMAT)
+        return True
+
+    except ValueError:
+        return False
+
+
+# Candidate types with their checks and converters,
+# most specific first. Every int is also a float.
+_CANDIDATES = (
+    (BOOL_TYPE, _is_bool, _to_bool),
+    (INT_TYPE, is_int, int),
+    (FLOAT_TYPE, _is_number, float),
+    (DATE_TYPE, _is_iso_date, string_to_date),
+)
+
+
+class ColumnTypeInferrer:
+    """
+    Incrementally infers type of a single column.
+
+    Starts with all candidate types and drops the ones each value doesn't
+    fit, so every value is checked only against types still possible.
+    Once nothing but string is left, inference is done and further
+    values are ignored.
+    """
+
+    def __init__(self, null_values: Iterable[str] = DEFAULT_NULL_VALUES):
+        """
+        Initializes inferrer with values that are treated as missing.
+        """
+
+        self.null_values = frozenset(null_values)
+
+        self.__candidates = list(_CANDIDATES)
+        self.__nullable = False
+        self.__seen = 0
+
+    @property
+    def done(self):
+        """
+        Whether type is already known to be string.
+        """
+        return not self.__candidates
+
+    def update(self, value: Optional[str]):
+        """
+        Used to narrow candidate types with the value,
+        None is treated as null value.
+        Returns False once inference is done.
+        """
+
+        candidates = self.__candidates
+
+        if not candidates:
+            return False
+
+        if value is None or value in self.null_values:
+            self.__nullable = True
+            return True
+
+        self.__seen += 1
+
+        for candidate in candidates[:]:
+            if not candidate[1](value):
+                candidates.remove(candidate)
+
+        return bool(candidates)
+
+    def feed(self, values: Iterable[str]):
+        """
+        Used to narrow candidate types with the values,
+        stops consuming them once inference is done.
+        """
+
+        for value in values:
+            if not self.update(value):
+                return
+
+    def get_column_type(self) -> ColumnType:
+        """
+        Returns the most specific type that fits all values seen so far.
+        Column without non-null values is considered string.
+        """
+
+        if self.__candidates and self.__seen:
+            name, _, converter = self.__candidates[0]
+
+        else:
+            name, converter = STRING_TYPE, str
+
+        if self.__nullable:
+            converter = _make_nullable(converter, self.null_values)
+
+        return ColumnType(name, converter, self.__nullable)
+
+
+def _make_nullable(converter: Callable[[str], Any], null_values: frozenset):
+    """
+    Used to wrap converter, so that null values (and None) are converted to None.
+    """
+
+    def convert(value: Optional[str]):
+        return None if value is None or value in null_values else converter(value)
+
+    return convert
+
+
+def infer_column_type(values: Iterable[str],
+                      sample_size: Optional[int] = None,
+                      null_values: Iterable[str] = DEFAULT_NULL_VALUES) -> ColumnType:
+    """
+    Used to infer type of the column in a single pass.
+
+    Values may be any iterable, including a stream, it's consumed only
+    until sample_size values are checked or type is known to be string.
+    """
+
+    inferrer = ColumnTypeInferrer(null_values)
+    inferrer.feed(values if sample_size is None else islice(values, sample_size))
+
+    return inferrer.get_column_type()
+
+
+def infer_column_types(rows: Iterable[Sequence[str]],
+                       sample_size: Optional[int] = None,
+                       null_values: Iterable[str] = DEFAULT_NULL_VALUES) -> list[ColumnType]:
+    """
+    Used to infer types of all columns of tabular data (e.g. rows of
+    csv.reader) in a single pass over the rows.
+
+    Number of columns is taken from the first row, missing cells of
+    shorter rows are treated as null values. Rows are consumed only until
+    sample_size rows are checked or all columns are known to be strings.
+    """
+
+    rows = iter(rows)
+    first_row = next(rows, None)
+
+    if first_row is None:
+        return []
+
+    inferrers = [ColumnTypeInferrer(null_values) for _ in first_row]
+    rows = chain((first_row,), rows)
+
+    for row in rows if sample_size is None else islice(rows, sample_size):
+        active = False
+
+        for inferrer, value in zip_longest(inferrers, row[:len(inferrers)]):
+            active = inferrer.update(value) or active
+
+        if not active:
+            break
+
+    return [inferrer.get_column_type() for inferrer in inferrers]
@@ -4,6 +4,9 @@ import pytz
 from babel.dates import format_datetime
 from babel.localtime import get_localzone
 
+# ISO format of UTC dates, e.g. '2024-01-15T10:30:00.000Z'.
+ISO_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
 
 def string_to_date(date_string: str):
     """
@@ -14,7 +17,7 @@ def string_to_date(date_string: str):
     based on the system's current timezone.
     """
 
-    creation_datetime_naive = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
+    creation_datetime_naive = datetime.strptime(date_string, ISO_DATE_FORMAT)
     utc_datetime = pytz.utc.localize(creation_datetime_naive)
     time_zone = pytz.timezone(str(get_localzone()))
 
@@ -1,27 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+# Every FileType ever created, keyed by (stem, mime type).
+# Used to hand out the same instance for equal definitions.
+_interned: dict[tuple[str, str], "FileType"] = {}
 
 
 class FileType:
     """
     Represents a file extension and provides utility methods for path manipulation.
 
-    This class helps in consistently adding or removing extensions from strings 
+    This class helps in consistently adding or removing extensions from strings
     and provides formats with or without the leading dot.
+
+    Instances are interned, so creating a FileType with the same stem and
+    MIME type twice returns the very same object. This makes them cheap to
+    compare (identity) and safe to use as dictionary keys.
     """
 
-    def __init__(self, stem: str, mime_type: str):
+    __slots__ = ("__stem", "__mime_type", "__extension")
+
+    def __new__(cls, stem: str, mime_type: str):
         """
-        Initializes the FileExtension with the raw extension string.
+        Returns interned FileType for provided stem and MIME type,
+        creating it on first request.
         """
 
-        self.__stem = stem
-        self.__mime_type = mime_type
+        key = (stem, mime_type)
+        file_type = _interned.get(key)
+
+        if file_type is None:
+            file_type = super().__new__(cls)
+            file_type.__stem = stem
+            file_type.__mime_type = mime_type
+            file_type.__extension = f".{stem}"
+            _interned[key] = file_type
+
+        return file_type
 
     @property
     def extension(self):
         """
         Returns the extension with a leading dot (e.g., '.json').
         """
-        return f".{self.stem}"
+        return self.__extension
 
     @property
     def stem(self):
@@ -38,7 +60,7 @@ class FileType:
         """
         Appends the extension to a string if it is not already present.
 
-        Checks if the string ends with the dot-prefixed extension before 
+        Checks if the string ends with the dot-prefixed extension before
         concatenating to avoid duplication.
         """
 
@@ -53,6 +75,15 @@ class FileType:
         """
         return string.replace(self.extension, "")
 
+    def __reduce__(self):
+        """
+        Makes sure unpickled and copied instances resolve to interned one.
+        """
+        return FileType, (self.__stem, self.__mime_type)
+
+    def __repr__(self):
+        return f"FileType({self.__stem!r}, {self.__mime_type!r})"
+
     def __str__(self):
         """
         Returns the string representation of the extension (with dot).
@@ -60,6 +91,101 @@ class FileType:
         return self.extension
 
 
+class FileTypeRegistry:
+    """
+    Indexed collection of file types.
+
+    Keeps dictionary indexes by stem, extension and MIME type so that
+    any lookup, including classification of a path, is a single
+    dictionary access instead of a scan over all known types.
+    """
+
+    def __init__(self, *file_types: FileType):
+        """
+        Initializes registry with provided file types.
+        """
+
+        self.__by_stem: dict[str, FileType] = {}
+        self.__by_extension: dict[str, FileType] = {}
+        self.__by_mime_type: dict[str, list[FileType]] = {}
+
+        for file_type in file_types:
+            self.register(file_type)
+
+    def register(self, file_type: FileType):
+        """
+        Used to add file type to registry.
+
+        Stem and extension indexes are case-insensitive and the most recently
+        registered type wins. Several types may share one MIME type, in which
+        case the first registered one is considered canonical.
+        """
+
+        stem = file_type.stem.lower()
+        previous = self.__by_stem.get(stem)
+
+        if previous is not None:
+            self.__by_mime_type[previous.mime_type].remove(previous)
+
+        self.__by_stem[stem] = file_type
+        self.__by_extension[file_type.extension.lower()] = file_type
+        self.__by_mime_type.setdefault(file_type.mime_type, []).append(file_type)
+
+        return file_type
+
+    def from_stem(self, stem: str) -> Optional[FileType]:
+        """
+        Used to get file type by its stem (e.g. 'json').
+        """
+        return self.__by_stem.get(stem) or self.__by_stem.get(stem.lower())
+
+    def from_extension(self, extension: str) -> Optional[FileType]:
+        """
+        Used to get file type by its dot-prefixed extension (e.g. '.json').
+        """
+        return self.__by_extension.get(extension) or self.__by_extension.get(extension.lower())
+
+    def from_mime_type(self, mime_type: str) -> Optional[FileType]:
+        """
+        Used to get canonical file type registered for MIME type.
+        """
+
+        file_types = self.__by_mime_type.get(mime_type)
+        return file_types[0] if file_types else None
+
+    def all_from_mime_type(self, mime_type: str) -> tuple[FileType, ...]:
+        """
+        Used to get all file types registered for MIME type.
+        """
+        return tuple(self.__by_mime_type.get(mime_type, ()))
+
+    def from_path(self, path: str) -> Optional[FileType]:
+        """
+        Used to classify path by its suffix.
+        e.g. /path/to/file.json -> JSON
+
+        Slices everything starting from the last dot and looks it up in
+        the extension index. When the dot belongs to a directory name the
+        slice contains a path separator and simply doesn't match.
+        """
+
+        dot_index = path.rfind(".")
+
+        if dot_index == -1:
+            return None
+
+        return self.from_extension(path[dot_index:])
+
+    def __contains__(self, file_type: FileType):
+        return self.__by_stem.get(file_type.stem.lower()) is file_type
+
+    def __iter__(self) -> Iterator[FileType]:
+        return iter(self.__by_stem.values())
+
+    def __len__(self):
+        return len(self.__by_stem)
+
+
 JSON = FileType("json", "application/json")
 LOG = FileType("log", "text/plain")
 YML = FileType("yml", "application/x-yaml")
@@ -68,3 +194,174 @@ JPG = FileType("jpg", "image/jpeg")
 SVG = FileType("svg", "image/svg+xml")
 ZIP = FileType("zip", "application/zip")
 KSS = FileType("kss", "application/x-kss")
+
+# Registry of all file types known to kutil.
+FILE_TYPES = FileTypeRegistry(JSON, LOG, YML, YAML, JPG, SVG, ZIP, KSS)
+
+
+def from_path(path: str) -> Optional[FileType]:
+    """
+    Used to classify path using registry of known file types.
+    Returns None if file type of the path is not known.
+    """
+    return FILE_TYPES.from_path(path)
+
+
+# Amount of bytes read from the beginning of the file
+# when detecting its type by content.
+DEFAULT_HEADER_SIZE = 1024
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+_JSON_LITERALS = (b"true", b"false", b"null")
+
+# Matched signature is either file type itself or a callable
+# that makes the final decision by looking at the whole header.
+_Signature = Union[FileType, Callable[[bytes], Optional[FileType]]]
+
+
+class _SignatureTrie:
+    """
+    Byte-wise prefix trie of magic signatures.
+
+    Allows matching header against all known signatures in a single
+    walk that is bounded by the length of the longest signature.
+    """
+
+    def __init__(self):
+        self.__root: dict = {}
+
+    def insert(self, signature: bytes, value: _Signature):
+        """
+        Used to add signature to the trie.
+        """
+
+        node = self.__root
+
+        for byte in signature:
+            node = node.setdefault(byte, {})
+
+        node[None] = value
+
+    def match(self, header: bytes) -> Optional[_Signature]:
+        """
+        Used to get value of the longest signature that header starts with.
+        """
+
+        node = self.__root
+        matched = node.get(None)
+
+        for byte in header:
+            node = node.get(byte)
+
+            if node is None:
+                break
+
+            matched = node.get(None, matched)
+
+        return matched
+
+
+def _sniff_xml(header: bytes):
+    """
+    Used to recognize SVG among XML documents.
+    """
+    return SVG if b"<svg" in header else None
+
+
+def _sniff_json(header: bytes):
+    """
+    Used to tell JSON document from other text that starts
+    with bracket (e.g. INI section).
+
+    Looks at the first significant character after opening bracket,
+    which must be one that is allowed to start JSON value or key.
+    """
+
+    body = header[1:].lstrip()
+
+    if not body:
+        return JSON
+
+    first = body[:1]
+
+    if header.startswith(b"{"):
+        return JSON if first in (b'"', b"}") else None
+
+    if first in b'{["-]' or first.isdigit():
+        return JSON
+
+    return JSON if body.startswith(_JSON_LITERALS) else None
+
+
+_BINARY_SIGNATURES = _SignatureTrie()
+_BINARY_SIGNATURES.insert(b"PK\x03\x04", ZIP)
+_BINARY_SIGNATURES.insert(b"PK\x05\x06", ZIP)  # Empty archive
+_BINARY_SIGNATURES.insert(b"PK\x07\x08", ZIP)  # Spanned archive
+_BINARY_SIGNATURES.insert(b"\xff\xd8\xff", JPG)
+
+_TEXT_SIGNATURES = _SignatureTrie()
+_TEXT_SIGNATURES.insert(b"<svg", SVG)
+_TEXT_SIGNATURES.insert(b"<?xml", _sniff_xml)
+_TEXT_SIGNATURES.insert(b"<!DOCTYPE svg", SVG)
+_TEXT_SIGNATURES.insert(b"<!--", _sniff_xml)
+_TEXT_SIGNATURES.insert(b"{", _sniff_json)
+_TEXT_SIGNATURES.insert(b"[", _sniff_json)
+
+
+def detect_file_type_from_bytes(header: bytes) -> Optional[FileType]:
+    """
+    Used to detect file type from the first bytes of file contents.
+    Returns None if contents don't match any known signature.
+
+    Binary signatures are matched against raw header, text ones against
+    header with leading BOM and whitespace stripped.
+    """
+
+    signature = _BINARY_SIGNATURES.match(header)
+
+    if signature is None:
+        header = header.removeprefix(_UTF8_BOM).lstrip()
+        signature = _TEXT_SIGNATURES.match(header)
+
+    if signature is None or isinstance(signature, FileType):
+        return signature
+
+    return signature(header)
+
+
+def detect_file_type(path: str, header_size: int = DEFAULT_HEADER_SIZE) -> Optional[FileType]:
+    """
+    Used to detect file type by its contents rather than extension.
+
+    Reads only first header_size bytes of the file using unbuffered
+    read, so typing a file costs a single small read regardless of its size.
+    """
+
+    with open(path, "rb", buffering=0) as file:
+        header = file.read(header_size)
+
+    return detect_file_type_from_bytes(header)
+
+
+def detect_file_types(paths: Iterable[str],
+                      header_size: int = DEFAULT_HEADER_SIZE,
+                      max_workers: Optional[int] = None) -> dict[str, Optional[FileType]]:
+    """
+    Used to detect file types of many files at once.
+
+    Header reads are spread across a thread pool since they are I/O bound.
+    Files that can't be read (e.g. were removed meanwhile) are mapped to None
+    instead of failing the whole batch.
+    """
+
+    def detect(path: str):
+        try:
+            return detect_file_type(path, header_size)
+
+        except OSError:
+            return None
+
+    paths = list(paths)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(paths, executor.map(detect, paths)))
@@ -0,0 +1,297 @@
+import gzip
+import json
+import logging
+import os.path
+import re
+from datetime import datetime, date
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Union
+
+from kutil.file import list_directory
+from kutil.file_type import LOG
+from kutil.log_rotation import GZIP_EXTENSION
+from kutil.logger import get_service_name
+
+# Beginning of text record, e.g. '2024-01-15 10:30:00,123'.
+_TEXT_TIMESTAMP_PATTERN = re.compile(rb"^(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2}),(\d{3})")
+# Beginning of structured record, e.g. '{"timestamp": "2024-01-15T10:30:00.123+02:00"'.
+_JSON_TIMESTAMP_PATTERN = re.compile(rb'^\{"timestamp":\s?"([^"]+)"')
+_TEXT_RECORD_PATTERN = re.compile(
+    r"^.{23} - \((?P<name>.+):(?P<lineno>\d+)\) \[[^]]*] \[(?P<level>\w+)] : (?P<message>.*)$",
+    re.DOTALL
+)
+
+
+class LogEntry(NamedTuple):
+    """
+    Single record read from log file.
+
+    message includes continuation lines (e.g. traceback),
+    raw holds the record exactly as it's written in the file.
+    """
+
+    timestamp: datetime
+    name: str
+    level: str
+    message: str
+    raw: str
+
+
+def query_logs(log_directory: str,
+               start: datetime,
+               end: datetime,
+               logger_name: Optional[str] = None,
+               level: Optional[Union[int, str]] = None,
+               service_name: Optional[str] = None) -> Iterator[LogEntry]:
+    """
+    Used to stream records logged within [start, end] time range
+    from current log file and its rotated backups.
+
+    Files are chosen by date suffixes of backups, so only the ones that can
+    contain the range are opened. Within plain files the first record of
+    the range is found by binary search over byte offsets, so only the
+    relevant slice of the file is read. Compressed backups are scanned.
+
+    Records may be additionally filtered by logger name (including its
+    children) and minimal level. Naive datetimes are treated as local time.
+    Both text and structured (JSON) records are supported.
+    """
+
+    start = _to_local(start)
+    end = _to_local(end)
+    min_level = _get_level_number(level) if isinstance(level, str) else level
+
+    if min_level is None and level is not None:
+        raise ValueError(f"Unknown log level '{level}'.")
+
+    for file_path in select_log_files(log_directory, start.date(), end.date(), service_name):
+        for entry in _read_range(file_path, start, end):
+            if logger_name is not None and not _is_logger_or_child(entry.name, logger_name):
+                continue
+
+            if min_level is not None and (_get_level_number(entry.level) or 0) < min_level:
+                continue
+
+            yield entry
+
+
+def select_log_files(log_directory: str,
+                     start: date,
+                     end: date,
+                     service_name: Optional[str] = None) -> list[str]:
+    """
+    Used to get log files that may contain records between start and end dates,
+    ordered from oldest to newest.
+
+    Backup named with date D holds records after the date of previous backup
+    up to D inclusive. Backups of the same date (size based rollover) share
+    the range. Current file holds records since the date of the last backup.
+    """
+
+    log_file_name = LOG.add_extension(service_name or get_service_name())
+    backup_pattern = re.compile(
+        rf"^{re.escape(log_file_name)}\.(\d{{4}}-\d{{2}}-\d{{2}})\.log(?:\.(\d+))?(?:{re.escape(GZIP_EXTENSION)})?$"
+    )
+
+    backups = []
+
+    for file_name in list_directory(log_directory):
+        match = backup_pattern.match(file_name)
+
+        if match is not None:
+            backup_date = date.fromisoformat(match.group(1))
+            backups.append((backup_date, int(match.group(2) or 0), os.path.join(log_directory, file_name)))
+
+    files = []
+    previous_date = None
+    last_date = None
+
+    for backup_date, _, file_path in sorted(backups):
+        if backup_date != last_date:
+            previous_date = last_date
+            last_date = backup_date
+
+        if backup_date >= start and (previous_date is None or previous_date < end):
+            files.append(file_path)
+
+    current_path = os.path.join(log_directory, log_file_name)
+
+    if os.path.exists(current_path) and (last_date is None or last_date <= end):
+        files.append(current_path)
+
+    return files
+
+
+def _read_range(file_path: str, start: datetime, end: datetime) -> Iterator[LogEntry]:
+    """
+    Used to read records of the file that are within time range.
+    Stops at the first record after the range.
+    """
+
+    compressed = file_path.endswith(GZIP_EXTENSION)
+    opener = gzip.open if compressed else open
+
+    with opener(file_path, "rb") as file:
+        if not compressed:
+            file.seek(_find_start_offset(file, os.fstat(file.fileno()).st_size, start))
+
+        for entry in _read_entries(file):
+            if entry.timestamp > end:
+                return
+
+            if entry.timestamp >= start:
+                yield entry
+
+
+def _find_start_offset(file: BinaryIO, size: int, start: datetime):
+    """
+    Used to find offset of the first record that was logged at or after start.
+
+    Binary search over byte offsets, each probe skips to the next line
+    and reads until the first line that begins a record.
+    """
+
+    low, high = 0, size
+
+    while low < high:
+        middle = (low + high) // 2
+        offset, timestamp = _next_record(file, middle)
+
+        if timestamp is None or timestamp >= start:
+            high = middle
+
+        else:
+            low = offset + 1
+
+    return _next_record(file, low)[0]
+
+
+def _next_record(file: BinaryIO, offset: int):
+    """
+    Used to get offset and timestamp of the first record
+    that begins at or after provided offset.
+    Returns (end of file, None) if there is no such record.
+    """
+
+    if offset == 0:
+        file.seek(0)
+
+    else:
+        # Step back by one byte, so that offset that
+        # is already at the line start isn't skipped.
+        file.seek(offset - 1)
+        file.readline()
+
+    while True:
+        position = file.tell()
+        line = file.readline()
+
+        if not line:
+            return position, None
+
+        timestamp = _parse_timestamp(line)
+
+        if timestamp is not None:
+            return position, timestamp
+
+
+def _read_entries(file: BinaryIO) -> Iterator[LogEntry]:
+    """
+    Used to read records starting from current position of the file.
+    Lines that don't begin a record are attached to the previous one.
+    """
+
+    timestamp = None
+    lines = []
+
+    for line in file:
+        line_timestamp = _parse_timestamp(line)
+
+        if line_timestamp is None:
+            if timestamp is not None:
+                lines.append(line)
+
+            continue
+
+        if timestamp is not None:
+            yield _make_entry(timestamp, lines)
+
+        timestamp = line_timestamp
+        lines = [line]
+
+    if timestamp is not None:
+        yield _make_entry(timestamp, lines)
+
+
+def _parse_timestamp(line: bytes) -> Optional[datetime]:
+    """
+    Used to get timestamp of the record if line begins one.
+    Works with both text and structured records.
+    """
+
+    match = _TEXT_TIMESTAMP_PATTERN.match(line)
+
+    if match is not None:
+        year, month, day, hour, minute, second, millisecond = (int(group) for group in match.groups())
+        return datetime(year, month, day, hour, minute, second, millisecond * 1000)
+
+    match = _JSON_TIMESTAMP_PATTERN.match(line)
+
+    if match is not None:
+        try:
+            return _to_local(datetime.fromisoformat(match.group(1).decode("ascii")))
+
+        except ValueError:
+            return None
+
+    return None
+
+
+def _make_entry(timestamp: datetime, lines: list[bytes]):
+    """
+    Used to create entry out of record lines.
+    """
+
+    raw = b"".join(lines).decode("utf-8", errors="replace").rstrip("\n")
+
+    if raw.startswith("{"):
+        try:
+            first, _, rest = raw.partition("\n")
+            record = json.loads(first)
+            message = "\n".join(part for part in (record.get("message", ""), rest) if part)
+
+            return LogEntry(timestamp, record.get("name", ""), record.get("level", ""), message, raw)
+
+        except ValueError:
+            return LogEntry(timestamp, "", "", raw, raw)
+
+    match = _TEXT_RECORD_PATTERN.match(raw)
+
+    if match is None:
+        return LogEntry(timestamp, "", "", raw, raw)
+
+    return LogEntry(timestamp, match.group("name"), match.group("level"), match.group("message"), raw)
+
+
+def _to_local(value: datetime):
+    """
+    Used to convert aware datetime to naive local time,
+    naive datetime is returned as is.
+    """
+
+    if value.tzinfo is None:
+        return value
+
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _get_level_number(level_name: str) -> Optional[int]:
+    """
+    Used to get numeric value of level name, None if level is unknown.
+    """
+
+    level = logging.getLevelName(level_name)
+    return level if isinstance(level, int) else None
+
+
+def _is_logger_or_child(name: str, logger_name: str):
+    return name == logger_name or name.startswith(logger_name + ".")
@@ -0,0 +1,180 @@
+import gzip
+import os.path
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import TimedRotatingFileHandler
+
+# Extension added to compressed backups.
+GZIP_EXTENSION = ".gz"
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+    Timed rotating file handler that also rotates when file grows over
+    max_bytes and optionally compresses backups with gzip.
+
+    Backups are named the same way as by TimedRotatingFileHandler, when
+    there are several backups for the same period (e.g. size rotations
+    during one day) an index is appended: 'app.log.2024-01-15.log',
+    'app.log.2024-01-15.log.1', ... with index growing chronologically.
+
+    Compression and retention run on a background thread, so rollover
+    itself only renames the file. Retention keeps at most backupCount
+    backups and at most max_total_bytes of them, whichever is stricter,
+    zero disables corresponding limit.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 0, max_total_bytes: int = 0, compress: bool = False, **kwargs):
+        """
+        Initializes handler, kwargs are passed to TimedRotatingFileHandler.
+        """
+
+        super().__init__(filename, **kwargs)
+
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.compress = compress
+
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kutil-log-rotation")
+        self.__backup_pattern = re.compile(
+            rf"^{re.escape(os.path.basename(self.baseFilename))}\.(?P<suffix>.+?)"
+            rf"(?:\.(?P<index>\d+))?(?:{re.escape(GZIP_EXTENSION)})?$"
+        )
+
+    def shouldRollover(self, record):
+        """
+        Determines if rollover should occur either because rotation time
+        came or because file size reached max_bytes.
+
+        Size is taken with fstat, since stream is flushed after every record.
+        """
+
+        if super().shouldRollover(record):
+            return True
+
+        if self.max_bytes <= 0 or self.stream is None:
+            return False
+
+        return os.fstat(self.stream.fileno()).st_size >= self.max_bytes
+
+    def rotation_filename(self, default_name: str):
+        """
+        Appends index to the backup name if backups for the same
+        period already exist (compressed or not).
+
+        Index follows the highest existing one rather than filling gaps
+        left by retention, so that it keeps growing chronologically.
+        """
+
+        indexes = [
+            index for suffix, index, _ in self.__list_backups()
+            if f"{self.baseFilename}.{suffix}" == default_name
+        ]
+
+        name = f"{default_name}.{max(indexes) + 1}" if indexes else default_name
+        return super().rotation_filename(name)
+
+    def rotate(self, source: str, dest: str):
+        """
+        Renames the file and schedules its compression
+        and retention of backups in background.
+        """
+
+        super().rotate(source, dest)
+        self.__executor.submit(self.__process_backup, dest)
+
+    def getFilesToDelete(self):
+        """
+        Retention is applied in background after backup is compressed.
+        """
+        return []
+
+    def get_backups(self):
+        """
+        Used to get paths of existing backups sorted from oldest to newest.
+        """
+        return [path for _, _, path in self.__list_backups()]
+
+    def close(self):
+        """
+        Waits for pending compression before closing the file.
+        """
+
+        self.__executor.shutdown(wait=True)
+        super().close()
+
+    def __list_backups(self):
+        """
+        Used to get (suffix, index, path) of existing backups
+        sorted from oldest to newest.
+        """
+
+        directory = os.path.dirname(self.baseFilename)
+        backups = []
+
+        for file_name in os.listdir(directory):
+            match = self.__backup_pattern.match(file_name)
+
+            if match is None or not self.extMatch.match(match.group("suffix")):
+                continue
+
+            backups.append((
+                match.group("suffix"),
+                int(match.group("index") or 0),
+                os.path.join(directory, file_name)
+            ))
+
+        return sorted(backups)
+
+    def __process_backup(self, backup_path: str):
+        """
+        Used to compress fresh backup and remove
+        backups that are over the retention limits.
+        """
+
+        if self.compress and os.path.exists(backup_path):
+            compress_file(backup_path)
+
+        self.__apply_retention()
+
+    def __apply_retention(self):
+        """
+        Used to delete oldest backups until both count
+        and total size limits are satisfied.
+        """
+
+        backups = [(path, os.path.getsize(path)) for path in self.get_backups()]
+        backup_count = len(backups)
+        total_bytes = sum(size for _, size in backups)
+
+        for path, size in backups:
+            over_count = 0 < self.backupCount < backup_count
+            over_size = 0 < self.max_total_bytes < total_bytes
+
+            if not over_count and not over_size:
+                break
+
+            os.remove(path)
+            backup_count -= 1
+            total_bytes -= size
+
+
+def compress_file(file_path: str):
+    """
+    Used to gzip the file, original file is removed afterwards.
+
+    Writes to temporary file first, so that partially
+    compressed file never appears under final name.
+    """
+
+    target_path = file_path + GZIP_EXTENSION
+    temporary_path = target_path + ".tmp"
+
+    with open(file_path, "rb") as source, gzip.open(temporary_path, "wb") as target:
+        shutil.copyfileobj(source, target)
+
+    os.replace(temporary_path, target_path)
+    os.remove(file_path)
+
+    return target_path
@@ -0,0 +1,238 @@
+import logging
+import threading
+import time
+import weakref
+from typing import NamedTuple, Optional
+
+from kutil.log_stats import record_suppressed
+
+# Logback key under which sampling rules are configured.
+# e.g. {"SAMPLING": {"kutil.process": {"rate": 10, "burst": 50}}}
+SAMPLING_KEY = "SAMPLING"
+
+DEFAULT_SUMMARY_INTERVAL = 60.0
+
+# Record attribute that holds amount of suppressed
+# records, set only on summary records.
+SUPPRESSED_ATTRIBUTE = "sampling_suppressed"
+
+# Filters that may hold suppressed records not summarized yet.
+_filters: "weakref.WeakSet[SamplingFilter]" = weakref.WeakSet()
+
+
+class SamplingRule(NamedTuple):
+    """
+    Token bucket configuration of the logger.
+
+    rate - amount of records per second that are let through.
+    burst - maximal amount of records let through at once.
+    per_call_site - whether each logging call site has its own bucket.
+    summary_interval - minimal amount of seconds between summaries of suppressed records.
+    """
+
+    rate: float
+    burst: float
+    per_call_site: bool = False
+    summary_interval: float = DEFAULT_SUMMARY_INTERVAL
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """
+        Used to create rule from logback entry.
+        Raises ValueError if rate or burst are not positive.
+        """
+
+        rate = float(config["rate"])
+        burst = float(config.get("burst", rate))
+
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid sampling rule {config}.")
+
+        return cls(
+            rate=rate,
+            burst=burst,
+            per_call_site=bool(config.get("per_call_site", False)),
+            summary_interval=float(config.get("summary_interval", DEFAULT_SUMMARY_INTERVAL))
+        )
+
+
+def get_sampling_rule(logger_name: str, logback: dict) -> Optional[SamplingRule]:
+    """
+    Used to get sampling rule configured in logback for provided logger.
+
+    Same as with levels the longest configured dotted prefix of logger
+    name wins. Returns None if sampling is not configured for logger.
+    """
+
+    sampling = logback.get(SAMPLING_KEY)
+
+    if not sampling:
+        return None
+
+    name = logger_name
+
+    while True:
+        config = sampling.get(name)
+
+        if config is not None:
+            return SamplingRule.from_config(config)
+
+        separator_index = name.rfind(".")
+
+        if separator_index == -1:
+            return None
+
+        name = name[:separator_index]
+
+
+def validate_sampling(logback: dict):
+    """
+    Used to make sure all sampling rules of logback are valid.
+    Raises KeyError, TypeError or ValueError otherwise.
+    """
+
+    for config in (logback.get(SAMPLING_KEY) or {}).values():
+        SamplingRule.from_config(config)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Logger filter that limits amount of records using token bucket.
+
+    Being attached to the logger (not handler) it rejects records before
+    they reach handlers, so suppressed record costs only its creation and
+    a bucket update. Once in summary interval, a WARNING record telling how
+    many records were suppressed is logged by the same logger.
+
+    Summary is only logged when a later record reaches the filter, so
+    records suppressed before the logger goes quiet are summarized by
+    flush_summary (see flush_summaries, called by shutdown_logging).
+    """
+
+    def __init__(self, logger: logging.Logger, rule: SamplingRule):
+        """
+        Initializes filter for the logger it would be attached to.
+        """
+
+        super().__init__()
+
+        self.rule = rule
+        self.__logger = logger
+        self.__buckets: dict[Optional[tuple[str, int]], list[float]] = {}
+        self.__suppressed = 0
+        self.__last_summary = time.monotonic()
+        self.__lock = threading.Lock()
+
+        _filters.add(self)
+
+    def filter(self, record: logging.LogRecord):
+        if getattr(record, SUPPRESSED_ATTRIBUTE, None) is not None:
+            return True
+
+        rule = self.rule
+        key = (record.pathname, record.lineno) if rule.per_call_site else None
+        now = time.monotonic()
+        summary = None
+
+        with self.__lock:
+            bucket = self.__buckets.get(key)
+
+            if bucket is None:
+                bucket = self.__buckets[key] = [rule.burst, now]
+
+            tokens = min(rule.burst, bucket[0] + (now - bucket[1]) * rule.rate)
+            allowed = tokens >= 1
+
+            bucket[0] = tokens - 1 if allowed else tokens
+            bucket[1] = now
+
+            if not allowed:
+                self.__suppressed += 1
+
+            if self.__suppressed and now - self.__last_summary >= rule.summary_interval:
+                summary = self.__suppressed, now - self.__last_summary
+                self.__suppressed = 0
+                self.__last_summary = now
+
+        if summary is not None:
+            self.__log_summary(record.pathname, record.lineno, *summary)
+
+        if not allowed:
+            record_suppressed(record)
+
+        return allowed
+
+    def flush_summary(self):
+        """
+        Used to log summary of records suppressed since the previous one
+        right away, regardless of summary interval. Nothing is logged
+        if no records were suppressed.
+        """
+
+        now = time.monotonic()
+
+        with self.__lock:
+            suppressed = self.__suppressed
+            elapsed = now - self.__last_summary
+
+            if not suppressed:
+                return
+
+            self.__suppressed = 0
+            self.__last_summary = now
+
+        self.__log_summary("(unknown file)", 0, suppressed, elapsed)
+
+    def __log_summary(self, pathname: str, lineno: int, suppressed: int, elapsed: float):
+        """
+        Used to log amount of suppressed records
+        bypassing the bucket.
+        """
+
+        summary = self.__logger.makeRecord(
+            self.__logger.name,
+            logging.WARNING,
+            pathname,
+            lineno,
+            "%d records suppressed by sampling in the last %.1f seconds",
+            (suppressed, elapsed),
+            None,
+            extra={SUPPRESSED_ATTRIBUTE: suppressed}
+        )
+
+        self.__logger.handle(summary)
+
+
+def flush_summaries():
+    """
+    Used to log pending summaries of all sampling filters,
+    e.g. before logging shuts down.
+    """
+
+    for log_filter in list(_filters):
+        log_filter.flush_summary()
+
+
+def apply_sampling(logger: logging.Logger, logback: dict):
+    """
+    Used to attach, replace or remove sampling filter of the logger
+    according to logback.
+
+    Existing filter is kept as is when its rule didn't change,
+    so that bucket state survives logback reloads.
+    """
+
+    rule = get_sampling_rule(logger.name, logback)
+
+    for log_filter in logger.filters[:]:
+        if not isinstance(log_filter, SamplingFilter):
+            continue
+
+        if log_filter.rule == rule:
+            return
+
+        log_filter.flush_summary()
+        logger.removeFilter(log_filter)
+
+    if rule is not None:
+        logger.addFilter(SamplingFilter(logger, rule))
@@ -0,0 +1,344 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Optional, Union
+
+from kutil.file import save_file
+
+# Upper bounds (in microseconds) of latency histogram buckets,
+# the last bucket holds everything slower than a second.
+LATENCY_BUCKETS = tuple(2 ** power for power in range(21))
+
+DEFAULT_DUMP_INTERVAL = 60.0
+
+_enabled = False
+_stats: dict[str, "LoggerStats"] = {}
+_stats_lock = threading.Lock()
+_stats_dumper: Optional["_StatsDumper"] = None
+
+
+class LatencyHistogram:
+    """
+    Histogram of latencies with power of two microsecond buckets.
+
+    Memory footprint is fixed regardless of amount of recorded values,
+    percentiles are estimated as upper bound of the bucket they fall into.
+    """
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float):
+        """
+        Used to add latency to the histogram.
+        """
+
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds * 1_000_000)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, percent: float):
+        """
+        Used to estimate percentile in microseconds.
+        Returns None if histogram is empty or percentile falls
+        into the last, unbounded, bucket.
+        """
+
+        if self.count == 0:
+            return None
+
+        threshold = self.count * percent / 100
+        accumulated = 0
+
+        for bucket_index, bucket_count in enumerate(self.counts):
+            accumulated += bucket_count
+
+            if accumulated >= threshold:
+                return LATENCY_BUCKETS[bucket_index] if bucket_index < len(LATENCY_BUCKETS) else None
+
+        return None  # pragma: no cover
+
+    def as_dict(self):
+        """
+        Used to get JSON serializable snapshot of the histogram.
+        """
+
+        return {
+            "count": self.count,
+            "mean_us": self.total * 1_000_000 / self.count if self.count else None,
+            "p50_us": self.percentile(50),
+            "p99_us": self.percentile(99),
+            "buckets": dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ["inf"], self.counts)),
+        }
+
+
+class LoggerStats:
+    """
+    Logging overhead statistics of a single logger.
+
+    emitted - records handled by the root handler, by level name.
+    suppressed - records dropped by sampling or queue overflow, by level name.
+    bytes_written - size of formatted records.
+    format_latency - time spent formatting records.
+    emit_latency - time logging thread spent in the root handler.
+    """
+
+    def __init__(self):
+        self.emitted = Counter()
+        self.suppressed = Counter()
+        self.bytes_written = 0
+        self.format_latency = LatencyHistogram()
+        self.emit_latency = LatencyHistogram()
+        self.lock = threading.Lock()
+
+    def as_dict(self):
+        """
+        Used to get JSON serializable snapshot of the statistics.
+        """
+
+        with self.lock:
+            return {
+                "emitted": dict(self.emitted),
+                "suppressed": dict(self.suppressed),
+                "bytes_written": self.bytes_written,
+                "format_latency": self.format_latency.as_dict(),
+                "emit_latency": self.emit_latency.as_dict(),
+            }
+
+
+def _get_logger_stats(logger_name: str):
+    """
+    Used to get statistics of the logger, creating them on first request.
+    """
+
+    stats = _stats.get(logger_name)
+
+    if stats is None:
+        with _stats_lock:
+            stats = _stats.setdefault(logger_name, LoggerStats())
+
+    return stats
+
+
+def enable_stats():
+    """
+    Used to start collecting statistics.
+    """
+
+    global _enabled
+    _enabled = True
+
+
+def disable_stats():
+    """
+    Used to stop collecting statistics, already collected ones are kept.
+    """
+
+    global _enabled
+    _enabled = False
+
+
+def is_stats_enabled():
+    return _enabled
+
+
+def reset_stats():
+    """
+    Used to drop all collected statistics.
+    """
+
+    with _stats_lock:
+        _stats.clear()
+
+
+def get_stats(logger_name: Optional[str] = None):
+    """
+    Used to get snapshot of collected statistics.
+
+    Returns statistics of provided logger (empty if nothing was collected
+    for it) or mapping of logger name to statistics for all loggers.
+    """
+
+    if logger_name is not None:
+        stats = _stats.get(logger_name)
+        return stats.as_dict() if stats is not None else LoggerStats().as_dict()
+
+    with _stats_lock:
+        items = list(_stats.items())
+
+    return {name: stats.as_dict() for name, stats in items}
+
+
+def record_emitted(record: logging.LogRecord, seconds: float):
+    """
+    Used to account record that was handled by root handler.
+    """
+
+    stats = _get_logger_stats(record.name)
+
+    with stats.lock:
+        stats.emitted[record.levelname] += 1
+        stats.emit_latency.record(seconds)
+
+
+def record_formatted(record: logging.LogRecord, seconds: float, size: int):
+    """
+    Used to account record that was formatted for writing.
+    """
+
+    stats = _get_logger_stats(record.name)
+
+    with stats.lock:
+        stats.bytes_written += size
+        stats.format_latency.record(seconds)
+
+
+def record_suppressed(record: logging.LogRecord):
+    """
+    Used to account record that was dropped before reaching the file.
+    Costs a single flag check when statistics are disabled.
+    """
+
+    if not _enabled:
+        return
+
+    stats = _get_logger_stats(record.name)
+
+    with stats.lock:
+        stats.suppressed[record.levelname] += 1
+
+
+class InstrumentedHandler(logging.Handler):
+    """
+    Handler that delegates to the target handler and
+    measures how long logging thread spends in it.
+    """
+
+    def __init__(self, target: logging.Handler):
+        """
+        Initializes handler with the handler it delegates to.
+        """
+
+        super().__init__()
+        self.target = target
+
+    def handle(self, record: logging.LogRecord):
+        if not _enabled:
+            return self.target.handle(record)
+
+        start = time.perf_counter()
+        result = self.target.handle(record)
+        record_emitted(record, time.perf_counter() - start)
+
+        return result
+
+    def emit(self, record: logging.LogRecord):  # pragma: no cover
+        self.target.emit(record)
+
+    def flush(self):
+        self.target.flush()
+
+    def close(self):
+        self.target.close()
+        super().close()
+
+
+class InstrumentedFormatter(logging.Formatter):
+    """
+    Formatter that delegates to the target formatter and measures
+    formatting time and size of formatted records.
+    """
+
+    def __init__(self, target: logging.Formatter, encoding: str = "utf-8"):
+        """
+        Initializes formatter with formatter it delegates to and
+        encoding used to calculate size of records.
+        """
+
+        super().__init__()
+        self.target = target
+        self.encoding = encoding
+
+    def format(self, record: logging.LogRecord):
+        if not _enabled:
+            return self.target.format(record)
+
+        start = time.perf_counter()
+        text = self.target.format(record)
+        elapsed = time.perf_counter() - start
+
+        # Plus one byte of line terminator.
+        record_formatted(record, elapsed, len(text.encode(self.encoding)) + 1)
+
+        return text
+
+
+class _StatsDumper(threading.Thread):
+    """
+    Daemon thread that periodically passes statistics to the callback.
+    """
+
+    def __init__(self, dump: Callable[[dict], None], interval: float):
+        super().__init__(name="kutil-log-stats", daemon=True)
+
+        self.__dump = dump
+        self.__interval = interval
+        self.__stop_event = threading.Event()
+
+    def run(self):
+        while not self.__stop_event.wait(self.__interval):
+            self.__dump(get_stats())
+
+    def stop(self):
+        """
+        Used to stop the dumper and write statistics one last time.
+        """
+
+        self.__stop_event.set()
+
+        if self.is_alive():
+            self.join()
+            self.__dump(get_stats())
+
+
+def start_stats_dump(dump: Union[Callable[[dict], None], str], interval: float = DEFAULT_DUMP_INTERVAL):
+    """
+    Used to periodically dump statistics.
+
+    Dump target is either a callback receiving statistics of all loggers
+    or path of JSON file that is overwritten on each dump.
+    Any running dump is replaced.
+    """
+
+    global _stats_dumper
+
+    stop_stats_dump()
+
+    if isinstance(dump, str):
+        file_path = dump
+
+        def dump(stats: dict):
+            save_file(file_path, stats, as_json=True)
+
+    _stats_dumper = _StatsDumper(dump, interval)
+    _stats_dumper.start()
+
+
+def stop_stats_dump():
+    """
+    Used to stop periodic dump of statistics if it's running.
+    """
+
+    global _stats_dumper
+
+    dumper = _stats_dumper
+    _stats_dumper = None
+
+    if dumper is not None:
+        dumper.stop()
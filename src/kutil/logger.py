@@ -1,19 +1,50 @@
+import atexit
+import copy
+import json
 import logging
+import multiprocessing
 import os.path
+import queue
 import re
 import sys
+import threading
+from datetime import datetime
 from logging import NullHandler
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
+from typing import Optional
 
 from kutil.file import remove_extension_from_path, read_file
 from kutil.file_type import LOG
+from kutil.log_rotation import SizedTimedRotatingFileHandler
+from kutil.log_stats import (
+    InstrumentedFormatter, InstrumentedHandler, enable_stats, record_suppressed, start_stats_dump, stop_stats_dump
+)
+from kutil.log_sampling import SAMPLING_KEY, apply_sampling, flush_summaries, validate_sampling
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 # Name of running service/EXE
 _log_file_name = remove_extension_from_path(os.path.basename(sys.argv[0]))
 _logback: dict[str, str] = {}
+_logback_path: Optional[str] = None
+_logback_watcher: Optional["_LogbackWatcher"] = None
+_queue_listener: Optional[QueueListener] = None
+_root_handler: Optional[logging.Handler] = None
+
+# Queue that worker processes send records to,
+# set only when aggregating logs of several processes.
+_log_queue: Optional[multiprocessing.Queue] = None
+
+# Loggers created through get_logger, used
+# to reapply levels when logback changes.
+_loggers: dict[str, logging.Logger] = {}
 
 
 OFF_LOG_LEVEL = "OFF"
+ROOT_LOGGER_KEY = "ROOT"
 LogLevels = {
     "INFO": logging.INFO,
     "WARN": logging.WARN,
@@ -23,12 +54,29 @@ LogLevels = {
     OFF_LOG_LEVEL: OFF_LOG_LEVEL
 }
 
+# Policies applied by asynchronous logging
+# when its queue is full.
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop-oldest"
+OVERFLOW_DROP_DEBUG = "drop-debug"
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_WATCH_INTERVAL = 5.0
+
 # Use null handler by default.
 # This would later be overridden when file
 # logger would be initialized.
 logging.getLogger().addHandler(NullHandler())
 
 
+def get_service_name():
+    """
+    Used to get name of running service/EXE,
+    which is also the name of its log file.
+    """
+    return _log_file_name
+
+
 def get_logger(logger_name: str):
     """
     Used to create logger for provided logger name.
@@ -39,35 +87,680 @@ def get_logger(logger_name: str):
     """
 
     logger = logging.getLogger(logger_name)
-    level = _get_log_level(logger_name, _logback or {})
+    _configure_logger(logger, _logback)
+    _loggers[logger_name] = logger
+
+    return logger
+
+
+def _configure_logger(logger: logging.Logger, logback: dict):
+    """
+    Used to apply level and sampling configured in logback to the logger.
+    """
+
+    _apply_log_level(logger, logback)
+    apply_sampling(logger, logback)
+
+
+def _apply_log_level(logger: logging.Logger, logback: dict):
+    """
+    Used to set level configured in logback to the logger.
+    Logger is disabled when level is 'OFF' and enabled back otherwise.
+    """
+
+    level = _get_log_level(logger.name, logback)
 
     if level == OFF_LOG_LEVEL:
         logger.disabled = True
 
     else:
+        logger.disabled = False
         logger.setLevel(level)
 
-    return logger
+
+class _LevelResolver:
+    """
+    Resolves log levels using hierarchy of dotted logger names.
+
+    Logback rules are stored in a trie of name segments, so that the
+    longest configured prefix (e.g. 'myapp.db' for 'myapp.db.pool')
+    is found in O(depth). Resolved names are memoized, the memo lives
+    as long as resolver itself, which is rebuilt when logback changes.
+    """
+
+    __slots__ = ("logback", "__root", "__default", "__memo")
+
+    def __init__(self, logback: dict):
+        """
+        Builds the trie out of logback rules.
+        Rules with unknown level are skipped (see validate_logback),
+        so that they don't break resolution of other loggers.
+        """
+
+        self.logback = logback
+        self.__root = _LevelNode()
+        self.__default = logging.INFO
+        self.__memo = {}
+
+        for logger_name, level in logback.items():
+            if logger_name == SAMPLING_KEY or level not in LogLevels:
+                continue
+
+            if logger_name == ROOT_LOGGER_KEY:
+                self.__default = LogLevels[level]
+                continue
+
+            node = self.__root
+
+            for segment in logger_name.split("."):
+                node = node.children.setdefault(segment, _LevelNode())
+
+            node.level = LogLevels[level]
+
+    def resolve(self, logger_name: str):
+        """
+        Used to get level of the longest configured prefix of logger name
+        or root level if there is no such prefix.
+        """
+
+        level = self.__memo.get(logger_name)
+
+        if level is not None:
+            return level
+
+        level = self.__default
+        node = self.__root
+
+        for segment in logger_name.split("."):
+            node = node.children.get(segment)
+
+            if node is None:
+                break
+
+            if node.level is not None:
+                level = node.level
+
+        self.__memo[logger_name] = level
+        return level
+
+
+class _LevelNode:
+    """
+    Node of level resolver trie.
+    """
+
+    __slots__ = ("children", "level")
+
+    def __init__(self):
+        self.children = {}
+        self.level = None
+
+
+_level_resolver = _LevelResolver({})
+
+
+def validate_logback(logback: dict):
+    """
+    Used to make sure logback has only known levels and valid sampling rules.
+    Raises ValueError listing all rules with unknown levels,
+    KeyError, TypeError or ValueError for invalid sampling rules.
+    """
+
+    if not isinstance(logback, dict):
+        raise ValueError("Logback should be a JSON object.")
+
+    unknown = [
+        f"{logger_name}={level}" for logger_name, level in logback.items()
+        if logger_name != SAMPLING_KEY and (not isinstance(level, str) or level not in LogLevels)
+    ]
+
+    if unknown:
+        raise ValueError(f"Unknown log levels in logback: {', '.join(unknown)}. "
+                         f"Known levels are {', '.join(LogLevels)}.")
+
+    validate_sampling(logback)
 
 
 def _get_log_level(logger_name: str, logback: dict):
     """
     Used to query logback and get configured log level for provided log name.
-    If log level is not configured 'INFO' would be used as default.
+
+    Level of the longest matching dotted prefix is used, so configuring
+    'myapp.db' applies to all of its submodules. If no prefix is configured
+    level of 'ROOT' entry is used and if it's missing too 'INFO' would be
+    used as default.
 
     Maps the string level from the configuration dictionary to standard
     logging constants defined in the LogLevels map.
     """
 
-    level = logback.get(logger_name)
+    global _level_resolver
+
+    resolver = _level_resolver
+
+    # Resolver and its memo are rebuilt only when
+    # different logback is provided.
+    if resolver.logback is not logback:
+        resolver = _level_resolver = _LevelResolver(logback)
+
+    return resolver.resolve(logger_name)
+
+
+def reload_logback():
+    """
+    Used to re-read logback file and apply levels and sampling
+    to every logger that was already created.
+
+    If file is missing or can't be parsed (e.g. it's being written
+    at the moment or has unknown level) current configuration is kept
+    and False is returned.
+    """
+
+    global _logback, _level_resolver
+
+    if _logback_path is None or not os.path.exists(_logback_path):
+        return False
+
+    try:
+        logback = read_file(_logback_path, as_json=True)
+        validate_logback(logback)
+        level_resolver = _LevelResolver(logback)
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+    _logback = logback
+    _level_resolver = level_resolver
+
+    for logger in list(_loggers.values()):
+        _configure_logger(logger, logback)
+
+    return True
+
+
+class _LogbackWatcher(threading.Thread):
+    """
+    Daemon thread that polls modification time of logback file
+    and reloads it when file changes.
+
+    Polling costs a single stat call per interval.
+    """
+
+    def __init__(self, logback_path: str, interval: float):
+        """
+        Initializes watcher with file to watch and polling interval in seconds.
+        """
+
+        super().__init__(name="kutil-logback-watcher", daemon=True)
+
+        self.__logback_path = logback_path
+        self.__interval = interval
+        self.__stop_event = threading.Event()
+        self.__signature = self.__get_signature()
+
+    def run(self):
+        while not self.__stop_event.wait(self.__interval):
+            self.poll()
+
+    def poll(self):
+        """
+        Used to reload logback if file changed since the last successful reload.
+        """
+
+        signature = self.__get_signature()
+
+        if signature is None or signature == self.__signature:
+            return
+
+        if reload_logback():
+            self.__signature = signature
+
+    def stop(self):
+        """
+        Used to stop the watcher and wait for it to finish.
+        """
+
+        self.__stop_event.set()
+
+        if self.is_alive():
+            self.join()
+
+    def __get_signature(self):
+        """
+        Used to get modification time and size of logback file.
+        """
+
+        try:
+            stat = os.stat(self.__logback_path)
+            return stat.st_mtime_ns, stat.st_size
+
+        except OSError:
+            return None
+
+
+def watch_logback(interval: float = DEFAULT_WATCH_INTERVAL):
+    """
+    Used to start watching logback file that was provided to initialize_logging.
+    Any running watcher is replaced.
+    """
+
+    global _logback_watcher
+
+    stop_watching_logback()
+
+    if _logback_path is None:
+        raise RuntimeError("Logging is not initialized.")
+
+    _logback_watcher = _LogbackWatcher(_logback_path, interval)
+    _logback_watcher.start()
+
+
+def stop_watching_logback():
+    """
+    Used to stop logback watcher if it's running.
+    """
+
+    global _logback_watcher
+
+    watcher = _logback_watcher
+    _logback_watcher = None
+
+    if watcher is not None:
+        watcher.stop()
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler that applies overflow policy when bounded queue is full.
+
+    With 'block' caller waits for free slot, with 'drop-oldest' the oldest
+    queued record is discarded to make room for the new one, and with
+    'drop-debug' DEBUG records are discarded while more severe ones wait.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str):
+        """
+        Initializes handler with queue and its overflow policy.
+        """
+
+        if overflow_policy not in (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_DEBUG):
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}'.")
+
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord):
+        """
+        Prepares copy of the record for the queue, leaving formatting
+        to formatter of the listener's handler.
+
+        Message is merged with its arguments (they may be mutable or
+        unpicklable), but traceback isn't folded into it. With in-process
+        queue exception info is kept as is and formatted by the listener,
+        multiprocessing queue gets it formatted into exc_text, as
+        tracebacks can't be pickled.
+        """
+
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+
+        if record.exc_info and not isinstance(self.queue, queue.Queue):
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+
+            record.exc_info = None
+
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """
+        Puts record to the queue according to overflow policy.
+        """
+
+        if self.overflow_policy == OVERFLOW_BLOCK:
+            self.queue.put(record)
+            return
+
+        if self.overflow_policy == OVERFLOW_DROP_DEBUG and record.levelno > logging.DEBUG:
+            self.queue.put(record)
+            return
+
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+
+            except queue.Full:
+                if self.overflow_policy == OVERFLOW_DROP_DEBUG:
+                    self.dropped += 1
+                    record_suppressed(record)
+                    return
+
+            try:
+                record_suppressed(self.queue.get_nowait())
+                self.dropped += 1
+
+            except queue.Empty:
+                pass
+
+
+_exception_formatter = logging.Formatter()
+
+
+class _QueueListener(QueueListener):
+    """
+    Queue listener that waits for free slot when stopping,
+    so that the queue is drained even if it's full at the moment.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class _WorkerQueueListener(_QueueListener):
+    """
+    Queue listener that hands records of worker
+    processes to current handlers of the root logger.
+    """
+
+    def handle(self, record: logging.LogRecord):
+        logging.getLogger().handle(record)
+
+
+class WorkerLogQueue:
+    """
+    Used to collect records of worker processes that can't use queue
+    of get_log_queue, because logging wasn't initialized with aggregate
+    flag or workers are started with another start method.
+
+    Workers pass the queue to initialize_worker_logging. Records are
+    handed to handlers of the root logger of this process by a listener
+    thread, so that this process stays the only writer of the log file,
+    whether it logs synchronously or through a queue of its own.
+
+    Queue is created from mp_context (default context if not provided),
+    so that it can be passed to workers started by it.
+    """
+
+    def __init__(self, mp_context=None, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Initializes the queue and starts listening to it.
+        """
+
+        context = mp_context if mp_context is not None else multiprocessing.get_context()
+
+        self.queue = context.Queue(maxsize=queue_size)
+        self.__listener = _WorkerQueueListener(self.queue)
+        self.__listener.start()
+
+    def close(self):
+        """
+        Used to hand over records still in the queue and stop listening.
+        Should be called once workers exited, records they send
+        afterwards are lost.
+        """
+
+        listener = self.__listener
+
+        if listener is None:
+            return
+
+        self.__listener = None
+        listener.stop()
+
+        self.queue.close()
+        self.queue.join_thread()
+
+
+def shutdown_logging():
+    """
+    Used to stop logback watcher, statistics dump and asynchronous logging.
+
+    Pending summaries of sampling filters are logged first. Then queue
+    handler is detached from the root logger and listener writes all
+    queued records and closes the file handler it owns.
+    """
+
+    global _queue_listener, _log_queue
+
+    stop_watching_logback()
+    flush_summaries()
+    stop_stats_dump()
+    listener = _queue_listener
+    log_queue = _log_queue
+
+    if listener is None:
+        return
+
+    _queue_listener = None
+    _log_queue = None
+    logging.getLogger().removeHandler(_root_handler)
+
+    listener.stop()
+
+    for handler in listener.handlers:
+        handler.close()
+
+    if log_queue is not None:
+        log_queue.close()
+        log_queue.join_thread()
+
+
+def get_log_queue(mp_context=None):
+    """
+    Used to get queue that worker processes should pass to
+    initialize_worker_logging. Returns None unless logging
+    was initialized with aggregate flag.
+
+    With multiprocessing context of the workers provided, None is also
+    returned if the queue can't be passed to them: queue created in fork
+    context (default one on Linux) is usable only by forked workers.
+    Such workers can send records through WorkerLogQueue instead.
+    """
+
+    log_queue = _log_queue
+
+    if log_queue is None or mp_context is None:
+        return log_queue
+
+    # Queue was created in default context, which
+    # can't change once it's been used.
+    if multiprocessing.get_start_method() == "fork" and mp_context.get_start_method() != "fork":
+        return None
+
+    return log_queue
+
+
+def get_logback_path():
+    """
+    Used to get path of logback file loaded by initialize_logging,
+    e.g. to apply the same levels in worker processes.
+    """
+    return _logback_path
+
+
+def initialize_worker_logging(log_queue: Optional[multiprocessing.Queue],
+                              logback_path: Optional[str] = None,
+                              overflow_policy: str = OVERFLOW_BLOCK):
+    """
+    Used to initialize logging in worker process.
+
+    Root logger of the worker sends records to the queue of aggregating
+    process (see get_log_queue and WorkerLogQueue), which is the only one
+    writing to the file. Without queue records of the worker are discarded.
+    Either way handlers inherited from the parent are removed. Logback, if
+    provided, is applied to loggers of the worker the same way as by
+    initialize_logging.
+
+    Should be called at worker start, e.g. as initializer of process pool.
+    """
+
+    global _queue_listener, _log_queue, _logback_watcher, _root_handler
+
+    if log_queue is not None:
+        worker_handler = _BoundedQueueHandler(log_queue, overflow_policy)
+
+    else:
+        worker_handler = NullHandler()
+
+    # Forked worker inherits state that belongs
+    # to threads of the parent process.
+    _queue_listener = None
+    _log_queue = None
+    _logback_watcher = None
+
+    if logback_path is not None:
+        _load_logback(logback_path)
+
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+
+    _root_handler = worker_handler
+    root_logger.addHandler(worker_handler)
+
+
+def _load_logback(logback_path: str):
+    """
+    Used to read logback and apply it to already created loggers.
+    Raises ValueError if logback is invalid (see validate_logback).
+    """
+
+    global _logback, _logback_path
+
+    if not os.path.exists(logback_path):
+        _logback_path = logback_path
+        return
+
+    logback = read_file(logback_path, as_json=True)
+    validate_logback(logback)
+
+    _logback_path = logback_path
+    _logback = logback
+
+    # Loggers created at import time
+    # should follow the configuration too.
+    for logger in list(_loggers.values()):
+        _configure_logger(logger, _logback)
+
+
+def _reset_after_fork():
+    """
+    Used to drop references to threads of the parent process
+    in forked child, so that child never stops them.
+
+    In queue mode nothing drains the inherited queue in the child, so root
+    logger of the child writes to the file handler of the parent's listener
+    directly, as in synchronous mode. In aggregate mode child keeps sending
+    records to the shared queue, drained by the parent. Children that
+    shouldn't write to the file themselves (e.g. pool workers) should call
+    initialize_worker_logging.
+    """
+
+    global _queue_listener, _log_queue, _logback_watcher, _root_handler
+
+    listener = _queue_listener
+
+    _queue_listener = None
+    _log_queue = None
+    _logback_watcher = None
+
+    if listener is None or not isinstance(listener.queue, queue.Queue) or not listener.handlers:
+        return
+
+    file_handler = listener.handlers[0]
+
+    if isinstance(_root_handler, InstrumentedHandler):
+        _root_handler.target = file_handler
+        return
+
+    root_logger = logging.getLogger()
+
+    if _root_handler in root_logger.handlers:
+        root_logger.removeHandler(_root_handler)
+        root_logger.addHandler(file_handler)
+
+    _root_handler = file_handler
+
+
+# Attributes every log record has, anything
+# else was provided through 'extra'.
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", logging.INFO, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
+
+def _dump_json(data: dict) -> str:
+    """
+    Used to serialize log entry to JSON.
+    Uses orjson when it's installed and falls back to standard library.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode("utf-8")
+
+    return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats log records as single-line JSON objects.
+
+    Record is serialized only when handler formats it, so in queue mode
+    serialization happens on the listener thread rather than in the
+    thread that logs. Fields passed through 'extra' are added as they are,
+    values that aren't JSON serializable are converted to strings.
+    """
+
+    def __init__(self, service_name: str):
+        """
+        Initializes formatter with name of the service added to each entry.
+        """
+
+        super().__init__()
+        self.__service_name = service_name
+
+    def format(self, record: logging.LogRecord):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "service": self.__service_name,
+            "name": record.name,
+            "lineno": record.lineno,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
 
-    if level is not None:
-        return LogLevels[level]
+        if record.exc_text:
+            entry["exception"] = record.exc_text
 
-    return logging.INFO
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
 
+        return _dump_json(entry)
 
-def initialize_logging(log_target_directory: str, logback_path: str):
+
+def initialize_logging(log_target_directory: str,
+                       logback_path: str,
+                       use_queue: bool = False,
+                       queue_size: int = DEFAULT_QUEUE_SIZE,
+                       overflow_policy: str = OVERFLOW_BLOCK,
+                       watch_interval: Optional[float] = None,
+                       structured: bool = False,
+                       backup_count: int = 5,
+                       max_bytes: int = 0,
+                       max_total_bytes: int = 0,
+                       compress: bool = False,
+                       aggregate: bool = False,
+                       instrument: bool = False,
+                       stats_dump_interval: Optional[float] = None):
     """
     Used to initialize logging.
     Should be executed only once.
@@ -75,32 +768,112 @@ def initialize_logging(log_target_directory: str, logback_path: str):
     Sets up a TimedRotatingFileHandler with midnight rotation and
     a retention policy of 5 backup files. Configures the root logger
     with a standardized message format including timestamps and line numbers.
+
+    Setting max_bytes, max_total_bytes or compress switches to
+    SizedTimedRotatingFileHandler, which additionally rotates file when it
+    grows over max_bytes, keeps at most max_total_bytes of backups and
+    gzips them in background.
+
+    When use_queue is set, root logger only puts records to a bounded queue
+    and the file handler is owned by a background listener thread, so that
+    formatting, disk writes and rollovers don't block logging threads.
+    Queued records are flushed by shutdown_logging, which is also run at exit.
+
+    When aggregate is set, logging works as in queue mode but the queue is
+    a multiprocessing one, so that worker processes can send their records
+    to it (see initialize_worker_logging). Current process stays the only
+    writer of the file, which avoids races between rollovers of workers.
+    Queue size of zero makes multiprocessing queue unbounded.
+
+    When instrument is set, per logger statistics of logging overhead are
+    collected (see kutil.log_stats.get_stats). With stats_dump_interval they
+    are also periodically written to '<service>.stats.json' next to the log.
+
+    When watch_interval is set, logback file is polled with that interval
+    (in seconds) and levels of existing loggers are updated when it changes.
+
+    When structured is set, each record is written as a JSON object
+    instead of a text line (see JsonFormatter).
     """
 
-    global _logback
+    global _queue_listener, _log_queue, _root_handler
+
+    _load_logback(logback_path)
 
-    if os.path.exists(logback_path):
-        _logback = read_file(logback_path, as_json=True)
+    # Created first, so that invalid overflow policy
+    # doesn't leave logging half-configured.
+    queue_handler = None
+    if aggregate:
+        queue_handler = _BoundedQueueHandler(multiprocessing.Queue(maxsize=queue_size), overflow_policy)
 
-    log_handler = TimedRotatingFileHandler(
+    elif use_queue:
+        queue_handler = _BoundedQueueHandler(queue.Queue(maxsize=queue_size), overflow_policy)
+
+    handler_class = TimedRotatingFileHandler
+    handler_options = {}
+
+    if max_bytes or max_total_bytes or compress:
+        handler_class = SizedTimedRotatingFileHandler
+        handler_options = {
+            "max_bytes": max_bytes,
+            "max_total_bytes": max_total_bytes,
+            "compress": compress
+        }
+
+    log_handler = handler_class(
         os.path.join(log_target_directory, LOG.add_extension(_log_file_name)),
         when="midnight",
         interval=1,
-        backupCount=5,
-        encoding="utf-8"
+        backupCount=backup_count,
+        encoding="utf-8",
+        **handler_options
     )
 
     log_handler.suffix = "%Y-%m-%d.log"
     log_handler.extMatch = re.compile(r"^\d{4}-\d{2}-\d{2}.log$")
-    log_handler.setFormatter(logging.Formatter(
-        f"%(asctime)s - (%(name)s:%(lineno)d) [{_log_file_name}] [%(levelname)s] : %(message)s"
-    ))
+
+    if structured:
+        log_handler.setFormatter(JsonFormatter(_log_file_name))
+
+    else:
+        log_handler.setFormatter(logging.Formatter(
+            f"%(asctime)s - (%(name)s:%(lineno)d) [{_log_file_name}] [%(levelname)s] : %(message)s"
+        ))
 
     # Configure the root logger
     # using new handler.
+    shutdown_logging()
+
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
         handler.close()
 
-    root_logger.addHandler(log_handler)
+    _root_handler = log_handler
+
+    if queue_handler is not None:
+        _queue_listener = _QueueListener(queue_handler.queue, log_handler, respect_handler_level=True)
+        _queue_listener.start()
+        _root_handler = queue_handler
+
+    if instrument:
+        enable_stats()
+        log_handler.setFormatter(InstrumentedFormatter(log_handler.formatter))
+        _root_handler = InstrumentedHandler(_root_handler)
+
+    root_logger.addHandler(_root_handler)
+
+    if aggregate:
+        _log_queue = queue_handler.queue
+
+    if watch_interval is not None:
+        watch_logback(watch_interval)
+
+    if stats_dump_interval is not None:
+        start_stats_dump(os.path.join(log_target_directory, f"{_log_file_name}.stats.json"), stats_dump_interval)
+
+
+atexit.register(shutdown_logging)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
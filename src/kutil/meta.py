@@ -1,3 +1,27 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+# What happens to the instance in a forked child process.
+FORK_KEEP = "keep"
+FORK_RESET = "reset"
+FORK_REINIT = "reinit"
+
+# Where the instance is stored, i.e. who shares it.
+SCOPE_PROCESS = "process"
+SCOPE_THREAD = "thread"
+SCOPE_CONTEXT = "context"
+
+_MISSING = object()
+
+_logger = logging.getLogger(__name__)
+
 
 class SingletonMeta(type):
     """
@@ -5,29 +29,250 @@ class SingletonMeta(type):
 
     Ensures that only one instance of the class exists and provides
     a post-initialization hook.
+
+    Instance creation is synchronized with a per-class lock and
+    double-checked, so concurrent first calls build only one instance.
+    Once created, the instance is returned with a single dict lookup
+    without taking any lock.
+
+    Classes doing heavy work on creation may move it off the first request:
+
+        class Index(metaclass=SingletonMeta, lazy=True):
+            ...
+
+        class Pool(metaclass=SingletonMeta, eager=True):
+            ...
+
+    lazy - calling the class returns a SingletonProxy immediately,
+    the instance is created on first attribute access.
+    eager - the class is created in background by warm_up(),
+    readiness can be awaited with wait_until_ready().
+
+    Classes may also define what happens to the instance in forked child:
+
+    fork_policy=FORK_KEEP - child uses instance inherited from the parent (default).
+    fork_policy=FORK_RESET - child creates its own instance on first call.
+    fork_policy=FORK_REINIT - instance is kept, its post_fork() is called in child
+    to replace threads, sockets etc. Instance is reset if post_fork fails.
+
+    And who shares the instance:
+
+    scope=SCOPE_PROCESS - one instance per process (default).
+    scope=SCOPE_THREAD - one instance per thread.
+    scope=SCOPE_CONTEXT - one instance per contextvars context (e.g. asyncio task).
+    Scoped instances are created without locking, since only
+    the owning thread or context can see them.
+
+    All options are inherited by subclasses.
     """
 
     _instances = {}
+    _initializing = {}
+    _scopes = {}
+    _proxies = {}
+    _warm_ups = {}
+    _eager_classes = []
+    _locks = {}
+    _locks_lock = threading.Lock()
+
+    _singleton_lazy = False
+    _singleton_fork_policy = FORK_KEEP
+    _singleton_scope = SCOPE_PROCESS
+
+    # Set for every class, so that __call__ picks its path
+    # with a single attribute lookup.
+    _singleton_plain = True
+    _singleton_scope_holder = None
+
+    def __new__(mcs,
+                name: str,
+                bases: tuple,
+                namespace: dict,
+                lazy: Optional[bool] = None,
+                eager: bool = False,
+                fork_policy: Optional[str] = None,
+                scope: Optional[str] = None):
+
+        if fork_policy not in (None, FORK_KEEP, FORK_RESET, FORK_REINIT):
+            raise ValueError(f"Unknown fork policy '{fork_policy}'.")
+
+        if scope not in (None, SCOPE_PROCESS, SCOPE_THREAD, SCOPE_CONTEXT):
+            raise ValueError(f"Unknown singleton scope '{scope}'.")
+
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        if lazy is not None:
+            cls._singleton_lazy = lazy
+
+        if fork_policy is not None:
+            cls._singleton_fork_policy = fork_policy
+
+        if scope is not None:
+            cls._singleton_scope = scope
+
+        if cls._singleton_fork_policy == FORK_REINIT and not hasattr(cls, "post_fork"):
+            raise ValueError(f"Class '{name}' with reinit fork policy must define post_fork().")
+
+        if cls._singleton_scope == SCOPE_THREAD:
+            SingletonMeta._scopes[cls] = _ThreadScope()
+
+        elif cls._singleton_scope == SCOPE_CONTEXT:
+            SingletonMeta._scopes[cls] = _ContextScope(name)
+
+        cls._singleton_scope_holder = SingletonMeta._scopes.get(cls)
+        cls._singleton_plain = cls._singleton_scope_holder is None and not cls._singleton_lazy
+
+        if eager:
+            if cls._singleton_scope != SCOPE_PROCESS:
+                raise ValueError(f"Only process scoped class '{name}' can be eager.")
+
+            SingletonMeta._eager_classes.append(cls)
+
+        return cls
+
+    def __init__(cls, name: str, bases: tuple, namespace: dict, **kwargs):
+        super().__init__(name, bases, namespace)
 
     def __call__(cls, *args, **kwargs):
         """
-        Intercepts class instantiation to return the existing instance 
+        Intercepts class instantiation to return the existing instance
         or create a new one.
 
         Args:
             *args: Positional arguments for the class constructor.
             **kwargs: Keyword arguments for the class constructor.
 
+        Returns:
+            object: The single instance of the class, or its proxy
+            if class is lazy and instance doesn't exist yet.
+        """
+
+        # Process scoped, not lazy classes miss the
+        # instance only once, until it's created.
+        if cls._singleton_plain:
+            try:
+                return cls._instances[cls]
+
+            except KeyError:
+                return cls._create_instance(args, kwargs)
+
+        scope = cls._singleton_scope_holder
+
+        if scope is not None:
+            instance = scope.get()
+
+        else:
+            instance = cls._instances.get(cls, _MISSING)
+
+        if instance is not _MISSING:
+            return instance
+
+        if cls._singleton_lazy:
+            proxy = cls._proxies.get(cls)
+            return proxy if proxy is not None else cls._get_proxy(args, kwargs)
+
+        return cls._create_instance(args, kwargs)
+
+    def _create_instance(cls, args: tuple, kwargs: dict):
+        """
+        Creates the instance under the class lock, unless
+        another thread has created it while lock was awaited.
+
+        Instance is published only after post_init has finished, so other
+        threads never see it half initialized. Calls made from post_init
+        itself (same thread, lock is reentrant) get the instance being
+        initialized.
+
+        Args:
+            args: Positional arguments for the class constructor.
+            kwargs: Keyword arguments for the class constructor.
+
         Returns:
             object: The single instance of the class.
         """
 
-        if cls not in cls._instances:
+        scope = cls._singleton_scope_holder
+
+        if scope is not None:
+            return cls.__create_scoped_instance(scope, args, kwargs)
+
+        with SingletonMeta.__get_lock(cls):
+            if cls in cls._instances:
+                return cls._instances[cls]
+
+            if cls in cls._initializing:
+                return cls._initializing[cls]
+
             instance = super().__call__(*args, **kwargs)
+            cls._initializing[cls] = instance
+
+            try:
+                instance.post_init()
+
+            finally:
+                del cls._initializing[cls]
+
             cls._instances[cls] = instance
+            return instance
+
+    def __create_scoped_instance(cls, scope: "_ThreadScope", args: tuple, kwargs: dict):
+        """
+        Creates instance of the current thread or context.
+        Instance is visible to post_init right away, since
+        no one else can see it.
+        """
+
+        instance = scope.get()
+
+        if instance is not _MISSING:
+            return instance
+
+        instance = super().__call__(*args, **kwargs)
+        scope.set(instance)
+
+        try:
             instance.post_init()
 
-        return cls._instances[cls]
+        except BaseException:
+            scope.set(_MISSING)
+            raise
+
+        return instance
+
+    def _get_proxy(cls, args: tuple, kwargs: dict):
+        """
+        Returns proxy of the lazy class, creating it on first request.
+        Only arguments of the first call are used to create the instance.
+
+        Args:
+            args: Positional arguments for the class constructor.
+            kwargs: Keyword arguments for the class constructor.
+
+        Returns:
+            SingletonProxy: Proxy shared by all callers.
+        """
+
+        proxy = cls._proxies.get(cls)
+
+        if proxy is None:
+            with SingletonMeta.__get_lock(cls):
+                proxy = cls._proxies.setdefault(cls, SingletonProxy(cls, args, kwargs))
+
+        return proxy
+
+    @staticmethod
+    def __get_lock(cls):
+        """
+        Returns reentrant lock of the class, creating it on first request.
+        """
+
+        lock = SingletonMeta._locks.get(cls)
+
+        if lock is None:
+            with SingletonMeta._locks_lock:
+                lock = SingletonMeta._locks.setdefault(cls, threading.RLock())
+
+        return lock
 
     def post_init(self):  # pragma: no cover
         """
@@ -35,3 +280,603 @@ class SingletonMeta(type):
         It is called only once, after the first instantiation.
         """
         pass
+
+
+class SingletonProxy:
+    """
+    Stand-in returned by lazy singleton classes.
+
+    Attribute access, assignment and deletion are forwarded to the
+    instance, which is created on the first of them. isinstance checks
+    against the singleton class pass without creating the instance.
+    Special methods (len(), iteration, operators) aren't forwarded,
+    use resolve() to get the instance itself.
+    """
+
+    __slots__ = ("_proxy_class", "_proxy_args", "_proxy_kwargs")
+
+    def __init__(self, cls: SingletonMeta, args: tuple, kwargs: dict):
+        object.__setattr__(self, "_proxy_class", cls)
+        object.__setattr__(self, "_proxy_args", args)
+        object.__setattr__(self, "_proxy_kwargs", kwargs)
+
+    def resolve(self):
+        """
+        Returns the instance, creating it if needed.
+        """
+
+        cls = object.__getattribute__(self, "_proxy_class")
+
+        try:
+            return cls._instances[cls]
+
+        except KeyError:
+            return cls._create_instance(
+                object.__getattribute__(self, "_proxy_args"),
+                object.__getattribute__(self, "_proxy_kwargs")
+            )
+
+    @property
+    def __class__(self):
+        return object.__getattribute__(self, "_proxy_class")
+
+    def __getattr__(self, name: str):
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self.resolve(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(self.resolve(), name)
+
+    def __dir__(self):
+        return dir(self.resolve())
+
+    def __repr__(self):
+        cls = object.__getattribute__(self, "_proxy_class")
+
+        if is_initialized(cls):
+            return repr(self.resolve())
+
+        return f"<lazy {cls.__name__} proxy>"
+
+
+class _ThreadScope:
+    """
+    Storage of instances that belong to threads.
+    """
+
+    def __init__(self):
+        self.__local = threading.local()
+
+    def get(self):
+        return getattr(self.__local, "instance", _MISSING)
+
+    def set(self, instance):
+        self.__local.instance = instance
+
+    def reset(self):
+        """
+        Drops instances of all threads.
+        """
+        self.__local = threading.local()
+
+
+class _ContextScope:
+    """
+    Storage of instances that belong to contextvars contexts.
+    """
+
+    def __init__(self, name: str):
+        self.__name = name
+        self.__variable = ContextVar(name, default=_MISSING)
+
+    def get(self):
+        return self.__variable.get()
+
+    def set(self, instance):
+        self.__variable.set(instance)
+
+    def reset(self):
+        """
+        Drops instances of all contexts.
+        """
+        self.__variable = ContextVar(self.__name, default=_MISSING)
+
+
+def is_initialized(cls: SingletonMeta):
+    """
+    Used to check whether instance of singleton class was already created
+    (for scoped classes, in the current thread or context).
+    """
+
+    scope = SingletonMeta._scopes.get(cls)
+
+    if scope is not None:
+        return scope.get() is not _MISSING
+
+    return cls in cls._instances
+
+
+def reset(*classes: SingletonMeta):
+    """
+    Used to drop instances of provided singleton classes (all classes
+    if none provided), so that next call creates them again.
+
+    Meant mostly for tests. Instances are dropped without any cleanup,
+    lazy proxies stay valid and resolve to new instances.
+    """
+
+    for cls in classes or set(SingletonMeta._instances) | set(SingletonMeta._scopes):
+        SingletonMeta._instances.pop(cls, None)
+        SingletonMeta._warm_ups.pop(cls, None)
+
+        scope = SingletonMeta._scopes.get(cls)
+
+        if scope is not None:
+            scope.reset()
+
+    if not classes:
+        SingletonMeta._warm_ups.clear()
+
+
+def warm_up(*classes: SingletonMeta, max_workers: Optional[int] = None):
+    """
+    Used to create singleton instances in background threads,
+    so that neither startup nor first request waits for them.
+
+    Creates provided classes or, if none provided, all classes declared
+    with eager=True. Classes are called without arguments. Classes that
+    are already created or being warmed up are skipped.
+
+    Returns mapping of class to future resolving with its instance.
+    Classes that failed to initialize are submitted again.
+    """
+
+    classes = classes or tuple(SingletonMeta._eager_classes)
+    futures = {}
+    executor = None
+
+    for cls in classes:
+        if cls in SingletonMeta._scopes:
+            raise ValueError(f"Class '{cls.__name__}' is not process scoped and can't be warmed up.")
+
+    for cls in classes:
+        future = SingletonMeta._warm_ups.get(cls)
+
+        if future is None or (future.done() and future.exception() is not None):
+            if is_initialized(cls):
+                future = Future()
+                future.set_result(cls._instances[cls])
+
+            else:
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kutil-warm-up")
+
+                future = executor.submit(cls._create_instance, (), {})
+
+            SingletonMeta._warm_ups[cls] = future
+
+        futures[cls] = future
+
+    if executor is not None:
+        # Workers exit once submitted classes are created.
+        executor.shutdown(wait=False)
+
+    return futures
+
+
+def wait_until_ready(*classes: SingletonMeta, timeout: Optional[float] = None):
+    """
+    Used to wait until warm up of provided classes (all warmed up classes
+    if none provided) is finished.
+
+    Returns True if all of them are ready, False on timeout.
+    Raises exception of the first class that failed to initialize,
+    KeyError if provided class wasn't warmed up.
+    """
+
+    futures = [SingletonMeta._warm_ups[cls] for cls in classes] if classes else list(SingletonMeta._warm_ups.values())
+    _, not_done = wait(futures, timeout=timeout)
+
+    for future in futures:
+        if future.done() and future.exception() is not None:
+            raise future.exception()
+
+    return not not_done
+
+
+class ObjectPool:
+    """
+    Bounded pool of reusable objects, for objects that are expensive to
+    create but can't be shared between concurrent users (parsers, buffers).
+
+        with pool.acquire() as parser:
+            parser.parse(data)
+
+    factory - creates new object.
+    min_size - amount of objects created right away and kept regardless of idleness.
+    max_size - maximal amount of objects (idle and in use), acquire() waits
+    for an object to be returned once it's reached.
+    idle_timeout - seconds after which idle objects above min_size are disposed,
+    None to keep them forever. Eviction happens on acquire and release.
+    reset - called with the object when it's returned, so that next user
+    gets it clean. Object is disposed if reset fails.
+
+    Pool keeps track of objects in use, returning an object twice or one
+    it didn't hand out raises ValueError.
+    dispose - called with the object when it's evicted or pool is closed.
+    """
+
+    def __init__(self,
+                 factory: Callable[[], object],
+                 min_size: int = 0,
+                 max_size: int = 8,
+                 idle_timeout: Optional[float] = None,
+                 reset: Optional[Callable[[object], None]] = None,
+                 dispose: Optional[Callable[[object], None]] = None):
+
+        if max_size < 1 or not 0 <= min_size <= max_size:
+            raise ValueError(f"Invalid pool size bounds min={min_size}, max={max_size}.")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+
+        self.__factory = factory
+        self.__reset = reset
+        self.__dispose = dispose
+
+        # Idle objects with time they were returned, most recently returned last.
+        self.__idle: deque[tuple[object, float]] = deque()
+        # Objects in use by their id.
+        self.__borrowed: dict[int, object] = {}
+        self.__size = 0
+        self.__closed = False
+        self.__condition = threading.Condition(threading.Lock())
+
+        for _ in range(min_size):
+            self.__size += 1
+            self.__idle.append((self.__create(), time.monotonic()))
+
+    @property
+    def size(self):
+        """
+        Amount of objects owned by the pool, both idle and in use.
+        """
+        return self.__size
+
+    @property
+    def idle(self):
+        """
+        Amount of objects waiting in the pool.
+        """
+        return len(self.__idle)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Used to borrow an object for the duration of with block.
+        See get() for details.
+
+        If with block raises, failure to return the object
+        is only logged, so that the original error propagates.
+        """
+
+        instance = self.get(timeout)
+
+        try:
+            yield instance
+
+        except BaseException:
+            try:
+                self.put(instance)
+
+            except Exception:  # noqa
+                _logger.exception("Failed to return %r to the pool.", instance)
+
+            raise
+
+        self.put(instance)
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        Used to take an object from the pool, it must be returned with put().
+
+        Most recently returned object is reused first. New object is created
+        if there are no idle ones and pool isn't full, otherwise waits until
+        one is returned. Raises TimeoutError if none was returned within
+        timeout and RuntimeError if pool is closed.
+        """
+
+        with self.__condition:
+            expired = self.__pop_expired()
+
+            if not self.__condition.wait_for(self.__can_get, timeout):
+                raise TimeoutError(f"No pooled object became available within {timeout} seconds.")
+
+            if self.__closed:
+                raise RuntimeError("Pool is closed.")
+
+            instance = self.__idle.pop()[0] if self.__idle else None
+
+            if instance is None:
+                self.__size += 1
+
+            else:
+                self.__borrowed[id(instance)] = instance
+
+        self.__dispose_all(expired)
+
+        if instance is not None:
+            return instance
+
+        try:
+            instance = self.__create()
+
+        except BaseException:
+            with self.__condition:
+                self.__size -= 1
+                self.__condition.notify()
+
+            raise
+
+        with self.__condition:
+            self.__borrowed[id(instance)] = instance
+
+        return instance
+
+    def put(self, instance):
+        """
+        Used to return object taken with get(), object is reset before
+        it's available for others. Object is disposed if pool is closed.
+        Raises ValueError if object isn't in use from this pool.
+        """
+
+        with self.__condition:
+            if self.__borrowed.pop(id(instance), _MISSING) is _MISSING:
+                raise ValueError(f"Object {instance!r} isn't in use from this pool.")
+
+        try:
+            if self.__reset is not None:
+                self.__reset(instance)
+
+        except BaseException:
+            self.__discard(instance)
+            raise
+
+        with self.__condition:
+            if self.__closed:
+                self.__size -= 1
+                expired = [instance]
+
+            else:
+                self.__idle.append((instance, time.monotonic()))
+                expired = self.__pop_expired()
+
+            self.__condition.notify()
+
+        self.__dispose_all(expired)
+
+    def evict_idle(self):
+        """
+        Used to dispose objects that stayed idle longer than
+        idle_timeout, keeping at least min_size objects.
+        """
+
+        with self.__condition:
+            expired = self.__pop_expired()
+
+        self.__dispose_all(expired)
+
+    def close(self):
+        """
+        Used to dispose all idle objects, objects in use are
+        disposed when returned. Pool can't be used afterwards.
+        """
+
+        with self.__condition:
+            self.__closed = True
+            idle = [instance for instance, _ in self.__idle]
+            self.__size -= len(idle)
+            self.__idle.clear()
+            self.__condition.notify_all()
+
+        self.__dispose_all(idle)
+
+    def __can_get(self):
+        return self.__closed or self.__idle or self.__size < self.max_size
+
+    def __pop_expired(self):
+        """
+        Removes idle objects that expired, oldest first.
+        Must be called with condition held.
+        """
+
+        if self.idle_timeout is None:
+            return []
+
+        deadline = time.monotonic() - self.idle_timeout
+        expired = []
+
+        while self.__idle and self.__size > self.min_size and self.__idle[0][1] <= deadline:
+            expired.append(self.__idle.popleft()[0])
+            self.__size -= 1
+
+        return expired
+
+    def __create(self):
+        return self.__factory()
+
+    def __discard(self, instance):
+        """
+        Drops object that can't be reused and frees its place in the pool.
+        """
+
+        with self.__condition:
+            self.__size -= 1
+            self.__condition.notify()
+
+        self.__dispose_all([instance])
+
+    def __dispose_all(self, instances: list):
+        if self.__dispose is None:
+            return
+
+        for instance in instances:
+            self.__dispose(instance)
+
+
+class PooledMeta(type):
+    """
+    Metaclass that keeps a bounded pool of class instances.
+
+        class Parser(metaclass=PooledMeta, min_size=2, max_size=16, idle_timeout=300):
+
+            def post_init(self):
+                ...
+
+            def reset(self):
+                ...
+
+        with Parser.acquire() as parser:
+            ...
+
+    Instances are created without arguments and get the same post_init
+    hook as singletons. Optional reset method is called when instance is
+    returned to the pool, optional dispose method when it's evicted.
+    Pool is created on first use, see ObjectPool for sizing details.
+    Pool options are inherited by subclasses, each class has its own pool.
+    """
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    _pool_min_size = 0
+    _pool_max_size = 8
+    _pool_idle_timeout = None
+
+    def __new__(mcs,
+                name: str,
+                bases: tuple,
+                namespace: dict,
+                min_size: Optional[int] = None,
+                max_size: Optional[int] = None,
+                idle_timeout: Optional[float] = None):
+
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        if min_size is not None:
+            cls._pool_min_size = min_size
+
+        if max_size is not None:
+            cls._pool_max_size = max_size
+
+        if idle_timeout is not None:
+            cls._pool_idle_timeout = idle_timeout
+
+        if cls._pool_max_size < 1 or not 0 <= cls._pool_min_size <= cls._pool_max_size:
+            raise ValueError(f"Invalid pool size bounds of class '{name}'.")
+
+        return cls
+
+    def __init__(cls, name: str, bases: tuple, namespace: dict, **kwargs):
+        super().__init__(name, bases, namespace)
+
+    def __call__(cls, *args, **kwargs):
+        """
+        Creates new, not pooled, instance and calls its post_init.
+        """
+
+        instance = super().__call__(*args, **kwargs)
+        instance.post_init()
+
+        return instance
+
+    def pool(cls) -> ObjectPool:
+        """
+        Returns pool of the class, creating it on first request.
+        May be called on startup to create min_size instances upfront.
+        """
+
+        pool = PooledMeta._pools.get(cls)
+
+        if pool is None:
+            with PooledMeta._pools_lock:
+                pool = PooledMeta._pools.get(cls)
+
+                if pool is None:
+                    pool = PooledMeta._pools[cls] = ObjectPool(
+                        cls,
+                        min_size=cls._pool_min_size,
+                        max_size=cls._pool_max_size,
+                        idle_timeout=cls._pool_idle_timeout,
+                        reset=getattr(cls, "reset", None),
+                        dispose=getattr(cls, "dispose", None)
+                    )
+
+        return pool
+
+    def acquire(cls, timeout: Optional[float] = None):
+        """
+        Used to borrow pooled instance for the duration of with block.
+        """
+        return cls.pool().acquire(timeout)
+
+
+def _reset_after_fork():
+    """
+    Used to apply fork policies of singleton classes in forked child.
+
+    Locks are replaced, since threads that held them don't exist in child,
+    and so are warm ups and instances being initialized by those threads.
+    Pools are dropped, since their instances may be in use by parent threads.
+    """
+
+    PooledMeta._pools = {}
+    PooledMeta._pools_lock = threading.Lock()
+
+    SingletonMeta._locks = {}
+    SingletonMeta._locks_lock = threading.Lock()
+    SingletonMeta._initializing.clear()
+    SingletonMeta._warm_ups.clear()
+
+    for cls, instance in list(SingletonMeta._instances.items()):
+        if not _apply_fork_policy(cls, instance):
+            del SingletonMeta._instances[cls]
+
+    for cls, scope in SingletonMeta._scopes.items():
+        if cls._singleton_fork_policy == FORK_RESET:
+            scope.reset()
+            continue
+
+        instance = scope.get()
+
+        if instance is not _MISSING and not _apply_fork_policy(cls, instance):
+            scope.set(_MISSING)
+
+
+def _apply_fork_policy(cls: SingletonMeta, instance):
+    """
+    Used to apply fork policy of the class to its instance.
+    Returns False if instance should be dropped.
+    """
+
+    policy = cls._singleton_fork_policy
+
+    if policy == FORK_KEEP:
+        return True
+
+    if policy == FORK_RESET:
+        return False
+
+    try:
+        instance.post_fork()
+        return True
+
+    except Exception:
+        return False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
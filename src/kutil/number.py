@@ -1,3 +1,9 @@
+from typing import Iterable, Optional
+
+# Characters ASCII string float() accepts may start and end with.
+_FLOAT_STARTS = frozenset("0123456789.+- \t\n\r\v\f")
+_FLOAT_ENDS = frozenset("0123456789. \t\n\r\v\f")
+
 
 def is_float(string: str):
     """
@@ -10,12 +16,109 @@ def is_float(string: str):
         bool: True if the string can be cast to a float, False otherwise.
     """
 
-    if "." not in string:
+    return _parse_float(string) is not None
+
+
+def is_int(string: str):
+    """
+    Checks if a string represents a valid integer number.
+
+    Args:
+        string (str): The string to evaluate.
+
+    Returns:
+        bool: True if the string can be cast to an int, False otherwise.
+    """
+
+    unsigned = string[1:] if string[:1] in ("+", "-") else string
+
+    if unsigned.isdecimal():
+        return True
+
+    # Underscores and surrounding whitespace are rare,
+    # plain ASCII strings without them aren't integers.
+    if string.isascii() and "_" not in string and string == string.strip():
         return False
 
     try:
-        value = float(string)
-        return value is not None
+        int(string)
+        return True
 
     except ValueError:
         return False
+
+
+def parse_floats(strings: Iterable[str], as_numpy: bool = False):
+    """
+    Classifies and converts a sequence of strings in one pass.
+
+    Strings are classified exactly like is_float does and valid ones are
+    converted with a single float() call. Common invalid forms (no dot,
+    words, units) are rejected by looking at the first and last character,
+    without raising and catching an exception.
+
+    Args:
+        strings (Iterable[str]): The strings to convert, e.g. CSV column.
+        as_numpy (bool): Whether to return NumPy arrays instead of lists.
+            Requires NumPy to be installed.
+
+    Returns:
+        tuple: Values (float, NaN for invalid strings) and validity
+        mask (bool), either as lists or as float64 and bool NumPy arrays.
+    """
+
+    starts = _FLOAT_STARTS
+    ends = _FLOAT_ENDS
+    nan = float("nan")
+    values = []
+    mask = []
+
+    for string in strings:
+        if "." in string and ((string[0] in starts and string[-1] in ends) or not string.isascii()):
+            try:
+                values.append(float(string))
+                mask.append(True)
+                continue
+
+            except ValueError:
+                pass
+
+        values.append(nan)
+        mask.append(False)
+
+    if not as_numpy:
+        return values, mask
+
+    try:
+        import numpy
+
+    except ImportError as error:
+        raise ImportError("NumPy is required to get results as arrays.") from error
+
+    return numpy.array(values, dtype=numpy.float64), numpy.array(mask, dtype=numpy.bool_)
+
+
+def _parse_float(string: str) -> Optional[float]:
+    """
+    Used to convert string to float the way is_float classifies it.
+
+    Float strings have a dot and, if ASCII, start with a digit, sign, dot
+    or whitespace and end with a digit, dot or whitespace. Strings that
+    don't are rejected without calling float(). Non-ASCII strings
+    (e.g. other scripts' digits) are always left to float().
+
+    Returns:
+        Optional[float]: Converted value or None if string isn't valid.
+    """
+
+    if "." not in string:
+        return None
+
+    if (string[0] not in _FLOAT_STARTS or string[-1] not in _FLOAT_ENDS) and string.isascii():
+        return None
+
+    try:
+        return float(string)
+
+    except ValueError:
+        return None
@@ -1,56 +1,1281 @@
+import asyncio
+import math
 import os
 import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, NamedTuple, Optional
+
 import psutil
 
-from kutil.logger import get_logger
+from kutil import procfs
+from kutil.logger import (
+    get_logger, get_log_queue, get_logback_path, get_service_name, initialize_worker_logging, WorkerLogQueue
+)
+from kutil.meta import SingletonMeta, FORK_RESET, is_initialized, reset
 
 
 _logger = get_logger(__name__)
 
+# Attributes prefetched by get_running_processes unless told otherwise.
+DEFAULT_PROCESS_ATTRIBUTES = ("name",)
+
+# Attributes held by ProcessTable, available in process.info of its processes.
+PROCESS_TABLE_ATTRIBUTES = ("pid", "name", "exe", "create_time")
+DEFAULT_PROCESS_TABLE_TTL = 1.0
+
+# Kinds of ProcessWatcher events.
+PROCESS_STARTED = "started"
+PROCESS_EXITED = "exited"
+
+# ProcessWatcher polls every min interval while processes change
+# and backs off up to max interval while nothing changes.
+DEFAULT_WATCH_MIN_INTERVAL = 0.25
+DEFAULT_WATCH_MAX_INTERVAL = 5.0
+DEFAULT_WATCH_BACKOFF = 2.0
+
+# Metrics ResourceSampler can collect.
+CPU_PERCENT_METRIC = "cpu_percent"
+RSS_METRIC = "rss"
+NUM_THREADS_METRIC = "num_threads"
+
+DEFAULT_SAMPLER_METRICS = (CPU_PERCENT_METRIC, RSS_METRIC)
+DEFAULT_SAMPLER_CAPACITY = 600
+DEFAULT_SAMPLER_INTERVAL = 1.0
+
+# Chunks submitted to ProcessRunner workers ahead of
+# consumed results, per worker, unless told otherwise.
+DEFAULT_IN_FLIGHT_PER_WORKER = 2
+
+_METRIC_READERS = {
+    CPU_PERCENT_METRIC: lambda process: process.cpu_percent(None),
+    RSS_METRIC: lambda process: process.memory_info().rss,
+    NUM_THREADS_METRIC: lambda process: process.num_threads(),
+}
+
+# Where process attributes are read from. /proc is read
+# directly on Linux, psutil is used everywhere else.
+PROC_BACKEND = "proc"
+PSUTIL_BACKEND = "psutil"
+
+_backend = PROC_BACKEND if procfs.is_available() else PSUTIL_BACKEND
+
+# Directory of instance lock files, when not set
+# XDG_RUNTIME_DIR or temporary directory is used.
+_runtime_directory: Optional[str] = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover
+    msvcrt = None
+
+
+def get_process_backend():
+    return _backend
+
+
+def set_process_backend(backend: str):
+    """
+    Used to choose where process attributes are read from.
+    Raises ValueError if backend is unknown or not available.
+    """
+
+    global _backend
+
+    if backend not in (PROC_BACKEND, PSUTIL_BACKEND):
+        raise ValueError(f"Unknown process backend '{backend}'.")
+
+    if backend == PROC_BACKEND and not procfs.is_available():
+        raise ValueError("Process backend 'proc' is available only on Linux.")
+
+    _backend = backend
+
+
+class ProcessInfo(NamedTuple):
+    """
+    Process table entry.
+
+    name, exe and create_time are None when they couldn't be accessed.
+    """
+
+    pid: int
+    name: Optional[str]
+    exe: Optional[str]
+    create_time: Optional[float]
+
+    def to_process(self, attrs: Iterable[str] = PROCESS_TABLE_ATTRIBUTES) -> psutil.Process:
+        """
+        Used to get psutil process of the entry with provided
+        attributes in its info, same as process_iter sets them.
+        Raises psutil.NoSuchProcess if process is gone or pid was reused.
+        """
+
+        process = psutil.Process(self.pid)
+
+        if self.create_time is not None and process.create_time() != self.create_time:
+            raise psutil.NoSuchProcess(self.pid, self.name)
+
+        process.info = {attr: getattr(self, attr) for attr in attrs}
+        return process
+
+
+class ProcessTable(metaclass=SingletonMeta, fork_policy=FORK_RESET):
+    """
+    Snapshot of system process table shared by kutil.process functions.
+
+    Snapshot is refreshed on access once it's older than ttl seconds.
+    Refresh is incremental: the list of pids and create times of known
+    pids are read, and only pids that appeared since the previous snapshot
+    or were reused by a new process (create time differs) are resolved.
+
+    Table is a singleton, so ttl passed to the constructor only applies
+    when the table is created, later calls return the existing table
+    unchanged. Use ProcessTable.configure to set ttl of the shared table,
+    including the one kutil.process functions use.
+    """
+
+    _configured_ttl = DEFAULT_PROCESS_TABLE_TTL
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Initializes empty table, which is filled on first access.
+        Without ttl, the configured one (see configure) is used.
+        """
+
+        self.ttl = ttl if ttl is not None else self._configured_ttl
+
+        self.__processes: dict[int, ProcessInfo] = {}
+        self.__refreshed_at: Optional[float] = None
+        self.__lock = threading.Lock()
+
+    def post_init(self):
+        pass
+
+    @classmethod
+    def configure(cls, ttl: float):
+        """
+        Used to set ttl of the shared table. Applies to the existing table
+        and to tables created later, e.g. after reset in forked child.
+        """
+
+        if ttl < 0:
+            raise ValueError("Ttl should not be negative.")
+
+        cls._configured_ttl = ttl
+
+        if is_initialized(cls):
+            cls().ttl = ttl
+
+    def get_processes(self) -> dict[int, ProcessInfo]:
+        """
+        Used to get snapshot of the process table by pid,
+        refreshing it if it's stale.
+
+        Returned mapping is never modified, refresh replaces it.
+        """
+
+        refreshed_at = self.__refreshed_at
+
+        if refreshed_at is None or time.monotonic() - refreshed_at >= self.ttl:
+            self.refresh(force=False)
+
+        return self.__processes
+
+    def find(self, names: Iterable[str]) -> dict[str, list[ProcessInfo]]:
+        """
+        Used to get running processes with provided names,
+        mapped by name, only for names that are running.
+        """
+
+        names = set(names)
+        found = {}
+
+        for info in self.get_processes().values():
+            if info.name in names:
+                found.setdefault(info.name, []).append(info)
+
+        return found
+
+    def refresh(self, force: bool = True):
+        """
+        Used to bring the snapshot up to date.
+        Unless forced, snapshot refreshed by another thread
+        while waiting for the lock isn't refreshed again.
+        """
+
+        with self.__lock:
+            refreshed_at = self.__refreshed_at
+
+            if not force and refreshed_at is not None and time.monotonic() - refreshed_at < self.ttl:
+                return
+
+            previous = self.__processes
+            processes = {}
+            use_proc = _backend == PROC_BACKEND
+            boot_time = psutil.boot_time() if use_proc else None
+
+            for pid in procfs.get_pids() if use_proc else psutil.pids():
+                info = previous.get(pid)
+
+                if info is not None and not self.__is_same_process(info, boot_time):
+                    info = None
+
+                if info is None:
+                    info = self.__read_proc(pid, boot_time) if use_proc else self.__resolve(pid)
+
+                if info is not None:
+                    processes[pid] = info
+
+            self.__processes = processes
+            self.__refreshed_at = time.monotonic()
+
+    @staticmethod
+    def __is_same_process(info: ProcessInfo, boot_time: Optional[float]) -> bool:
+        """
+        Checks that pid of the entry wasn't reused by comparing create time,
+        read from /proc when boot_time is provided, with psutil otherwise.
+        Entry is kept if create time isn't accessible.
+        """
+
+        try:
+            if boot_time is not None:
+                create_time = procfs.read_create_time(info.pid, boot_time)
+
+            else:
+                create_time = psutil.Process(info.pid).create_time()
+
+        except (PermissionError, psutil.AccessDenied):
+            return True
+
+        except psutil.NoSuchProcess:
+            return False
+
+        return create_time == info.create_time
+
+    @staticmethod
+    def __resolve(pid: int) -> Optional[ProcessInfo]:
+        """
+        Reads attributes of a new pid with psutil.
+        Returns None if process is already gone.
+        """
+
+        try:
+            info = psutil.Process(pid).as_dict(PROCESS_TABLE_ATTRIBUTES)
+
+        except psutil.NoSuchProcess:
+            return None
+
+        return ProcessInfo(pid, info["name"], info["exe"], info["create_time"])
+
+    @staticmethod
+    def __read_proc(pid: int, boot_time: float) -> Optional[ProcessInfo]:
+        """
+        Reads attributes of a new pid from /proc.
+        Returns None if process is already gone.
+        """
+
+        entry = procfs.read_process(pid, boot_time=boot_time)
+        return ProcessInfo(*entry) if entry is not None else None
+
+
+class ProcessEvent(NamedTuple):
+    """
+    Process with watched name started or exited.
+
+    kind - PROCESS_STARTED or PROCESS_EXITED.
+    info - entry of the process from process table.
+    """
+
+    kind: str
+    info: ProcessInfo
+
+
+class ProcessWatcher:
+    """
+    Used to react to processes with watched names starting or exiting.
+
+    Each poll refreshes the shared ProcessTable and diffs it against the
+    previous snapshot. Every poll lists all pids, checks create times of
+    known ones and takes the difference of pid sets, so its cost still
+    grows with table size. Resolving processes and building events, the
+    expensive part, is only done for pids that appeared or were reused
+    and for the watched processes.
+    Polling interval starts at min_interval and is multiplied by backoff
+    after every poll without events, up to max_interval.
+
+    Events are delivered to subscribed callbacks, either from a daemon
+    thread (start/stop) or while iterating the watcher asynchronously:
+
+        async for event in ProcessWatcher(["worker"]):
+            ...
+
+    First poll takes the baseline, processes already running
+    at that point don't produce events.
+    """
+
+    def __init__(self,
+                 names: Optional[Iterable[str]] = None,
+                 min_interval: float = DEFAULT_WATCH_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_WATCH_MAX_INTERVAL,
+                 backoff: float = DEFAULT_WATCH_BACKOFF):
+        """
+        Initializes watcher of processes with provided names,
+        all processes are watched if names aren't provided.
+        """
+
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Intervals should be positive and max_interval not less than min_interval.")
+
+        if backoff < 1:
+            raise ValueError("Backoff should be at least 1.")
+
+        self.names = None if names is None else frozenset(names)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+
+        self.__interval = min_interval
+        self.__callbacks: list[Callable[[ProcessEvent], None]] = []
+        self.__snapshot: Optional[dict[int, ProcessInfo]] = None
+        self.__watched: dict[int, ProcessInfo] = {}
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.__wakeup: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+
+    @property
+    def interval(self):
+        """
+        Current polling interval in seconds.
+        """
+        return self.__interval
+
+    def subscribe(self, callback: Callable[[ProcessEvent], None]):
+        """
+        Used to add callback called with every event.
+        """
+        self.__callbacks.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ProcessEvent], None]):
+        """
+        Used to remove previously added callback.
+        """
+        self.__callbacks.remove(callback)
+
+    def poll(self) -> list[ProcessEvent]:
+        """
+        Used to take a snapshot of the process table,
+        notify callbacks and adjust polling interval.
+        Returns events since the previous poll.
+        """
+
+        with self.__lock:
+            table = ProcessTable()
+            table.refresh()
+
+            events = self.__diff(table.get_processes())
+
+            if events:
+                self.__interval = self.min_interval
+
+            else:
+                self.__interval = min(self.__interval * self.backoff, self.max_interval)
+
+        for event in events:
+            for callback in list(self.__callbacks):
+                try:
+                    callback(event)
+
+                except Exception:  # noqa
+                    _logger.exception("Process watcher callback failed for %s.", event)
+
+        return events
+
+    def start(self):
+        """
+        Used to start polling in a daemon thread.
+        Baseline is taken before returning.
+        """
+
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+
+        if self.__snapshot is None:
+            self.poll()
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run, name="kutil-process-watcher", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Used to stop polling, both thread and asynchronous
+        iteration, and wait for the thread to finish.
+        """
+
+        self.__stop_event.set()
+        wakeup = self.__wakeup
+
+        if wakeup is not None:
+            loop, event = wakeup
+
+            try:
+                loop.call_soon_threadsafe(event.set)
+
+            except RuntimeError:
+                # Event loop is already closed.
+                pass
+
+        thread = self.__thread
+
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join()
+
+    def __aiter__(self) -> AsyncIterator[ProcessEvent]:
+        return self.events()
+
+    async def events(self) -> AsyncIterator[ProcessEvent]:
+        """
+        Used to iterate events asynchronously until watcher is stopped.
+        Polls run in the default executor, so event loop isn't blocked.
+        Wait between polls is interrupted by stop(), from any thread.
+        """
+
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        self.__wakeup = (loop, wakeup)
+        self.__stop_event.clear()
+
+        try:
+            if self.__snapshot is None:
+                await loop.run_in_executor(None, self.poll)
+
+            while not self.__stop_event.is_set():
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.__interval)
+
+                except asyncio.TimeoutError:
+                    pass
+
+                if self.__stop_event.is_set():
+                    return
+
+                for event in await loop.run_in_executor(None, self.poll):
+                    yield event
+
+        finally:
+            if self.__wakeup is not None and self.__wakeup[1] is wakeup:
+                self.__wakeup = None
+
+    def __run(self):
+        while not self.__stop_event.wait(self.__interval):
+            try:
+                self.poll()
+
+            except Exception:  # noqa
+                _logger.exception("Process watcher poll failed.")
+
+    def __diff(self, snapshot: dict[int, ProcessInfo]) -> list[ProcessEvent]:
+        """
+        Used to find watched processes that exited or started
+        since the previous snapshot.
+        """
+
+        previous = self.__snapshot
+        self.__snapshot = snapshot
+        names = self.names
+
+        if previous is None:
+            self.__watched = {
+                pid: info for pid, info in snapshot.items() if names is None or info.name in names
+            }
+            return []
+
+        events = []
+        watched = self.__watched
+        started = snapshot.keys() - previous.keys()
+
+        for pid, info in list(watched.items()):
+            current = snapshot.get(pid)
+
+            if current is not info:
+                del watched[pid]
+                events.append(ProcessEvent(PROCESS_EXITED, info))
+
+                # Pid was reused by a new process.
+                if current is not None:
+                    started.add(pid)
+
+        for pid in sorted(started):
+            info = snapshot[pid]
+
+            if names is None or info.name in names:
+                watched[pid] = info
+                events.append(ProcessEvent(PROCESS_STARTED, info))
+
+        return events
+
+
+class ResourceStats(NamedTuple):
+    """
+    Aggregates of a metric over a window of samples.
+    """
+
+    count: int
+    mean: float
+    p95: float
+    max: float
+
+
+class _ProcessSeries:
+    """
+    Time series of a single process, a ring buffer of sample
+    times and one of values per metric, all preallocated.
+    """
+
+    __slots__ = ("process", "times", "values", "size", "position", "cpu_time", "cpu_moment")
+
+    def __init__(self, process: psutil.Process, capacity: int, metrics: tuple[str, ...]):
+        self.process: Optional[psutil.Process] = process
+        # CPU time at previous read from /proc, CPU percent is relative to it.
+        self.cpu_time: Optional[float] = None
+        self.cpu_moment: Optional[float] = None
+        self.times = array("d", bytes(8 * capacity))
+        self.values = {metric: array("d", bytes(8 * capacity)) for metric in metrics}
+        self.size = 0
+        self.position = 0
+
+    def append(self, moment: float, values: dict[str, float]):
+        position = self.position
+        self.times[position] = moment
+
+        for metric, value in values.items():
+            self.values[metric][position] = value
+
+        self.position = (position + 1) % len(self.times)
+        self.size = min(self.size + 1, len(self.times))
+
+    def get_samples(self, metric: str, since: Optional[float] = None) -> list[tuple[float, float]]:
+        """
+        Returns (time, value) samples from the oldest one,
+        only those taken at or after since if provided.
+        """
+
+        capacity = len(self.times)
+        start = (self.position - self.size) % capacity
+        indexes = [(start + offset) % capacity for offset in range(self.size)]
+        times = self.times
+        values = self.values[metric]
+
+        return [(times[index], values[index]) for index in indexes if since is None or times[index] >= since]
+
+
+class ResourceSampler:
+    """
+    Used to sample resource usage of monitored processes.
+
+    Every tick reads all metrics of a process at once: with proc backend
+    from its stat and statm files, otherwise within a single psutil
+    oneshot() context, instead of a psutil call (and file read) per
+    metric. Values are the same psutil reports. Samples are kept in fixed-size
+    ring buffers (capacity samples per process), so memory doesn't grow
+    over long runs. Processes that exit keep their samples until removed.
+
+    Usage:
+        sampler = ResourceSampler()
+        sampler.add(*get_running_processes(["worker"]).get("worker", []))
+        sampler.start()
+        ...
+        sampler.get_stats(pid, RSS_METRIC, window=60).p95
+    """
+
+    def __init__(self,
+                 metrics: Iterable[str] = DEFAULT_SAMPLER_METRICS,
+                 capacity: int = DEFAULT_SAMPLER_CAPACITY):
+        """
+        Initializes sampler of provided metrics keeping
+        up to capacity samples per process.
+        """
+
+        metrics = tuple(metrics)
+        unknown = set(metrics) - set(_METRIC_READERS)
+
+        if unknown:
+            raise ValueError(f"Unknown metrics {sorted(unknown)}.")
+
+        if capacity < 1:
+            raise ValueError("Capacity should be at least 1.")
+
+        self.metrics = metrics
+        self.capacity = capacity
+
+        self.__readers = [(metric, _METRIC_READERS[metric]) for metric in metrics]
+        self.__series: dict[int, _ProcessSeries] = {}
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def pids(self) -> list[int]:
+        """
+        Pids of sampled processes, including exited ones.
+        """
+        return list(self.__series)
+
+    def add(self, *processes):
+        """
+        Used to start sampling processes, either psutil processes
+        (e.g. from get_running_processes) or pids.
+        Processes that are already gone are ignored.
+        """
+
+        for process in processes:
+            if (process.pid if isinstance(process, psutil.Process) else process) in self.__series:
+                continue
+
+            try:
+                if not isinstance(process, psutil.Process):
+                    process = psutil.Process(process)
+
+                # First CPU percent call only sets the baseline.
+                process.cpu_percent(None)
+
+            except psutil.NoSuchProcess:
+                continue
+
+            except psutil.AccessDenied:
+                pass
+
+            with self.__lock:
+                series = self.__series.setdefault(process.pid, _ProcessSeries(process, self.capacity, self.metrics))
+
+                if _backend == PROC_BACKEND:
+                    try:
+                        self.__read_proc(series, time.monotonic(), psutil.boot_time())
 
-def get_running_processes(processes: list[str]) -> list[psutil.Process]:
+                    except psutil.NoSuchProcess:
+                        # Process is gone or its pid was already reused.
+                        if self.__series.get(process.pid) is series:
+                            del self.__series[process.pid]
+
+                    except psutil.Error:
+                        pass
+
+    def remove(self, pid: int):
+        """
+        Used to stop sampling process and drop its samples.
+        """
+
+        with self.__lock:
+            self.__series.pop(pid, None)
+
+    def sample(self) -> float:
+        """
+        Used to take one sample of every running process.
+        Returns monotonic time of the sample.
+        """
+
+        moment = time.monotonic()
+        readers = self.__readers
+        use_proc = _backend == PROC_BACKEND
+        boot_time = psutil.boot_time() if use_proc else None
+
+        with self.__lock:
+            for series in self.__series.values():
+                process = series.process
+
+                if process is None:
+                    continue
+
+                try:
+                    if use_proc:
+                        values = self.__read_proc(series, moment, boot_time)
+
+                    else:
+                        with process.oneshot():
+                            values = {metric: reader(process) for metric, reader in readers}
+
+                except psutil.NoSuchProcess:
+                    series.process = None
+                    continue
+
+                except psutil.AccessDenied:
+                    continue
+
+                series.append(moment, values)
+
+        return moment
+
+    def start(self, interval: float = DEFAULT_SAMPLER_INTERVAL):
+        """
+        Used to start sampling every interval seconds in a daemon thread.
+        """
+
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run, args=(interval,),
+                                         name="kutil-resource-sampler", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Used to stop sampling thread and wait for it to finish.
+        """
+
+        self.__stop_event.set()
+        thread = self.__thread
+
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join()
+
+    def is_running(self, pid: int):
+        """
+        Whether process is still sampled, False once it exited.
+        """
+
+        series = self.__series.get(pid)
+        return series is not None and series.process is not None
+
+    def get_samples(self, pid: int, metric: str, window: Optional[float] = None) -> list[tuple[float, float]]:
+        """
+        Used to get (monotonic time, value) samples of the process
+        from the oldest one, only of the last window seconds if provided.
+        """
+
+        if metric not in self.metrics:
+            raise ValueError(f"Metric '{metric}' isn't sampled.")
+
+        since = None if window is None else time.monotonic() - window
+
+        with self.__lock:
+            series = self.__series.get(pid)
+            return [] if series is None else series.get_samples(metric, since)
+
+    def get_stats(self, pid: int, metric: str, window: Optional[float] = None) -> Optional[ResourceStats]:
+        """
+        Used to get mean, 95th percentile and max of the metric
+        over samples of the last window seconds (all samples if not provided).
+        Returns None if there are no samples.
+        """
+
+        values = sorted(value for _, value in self.get_samples(pid, metric, window))
+
+        if not values:
+            return None
+
+        count = len(values)
+        p95 = values[max(math.ceil(0.95 * count) - 1, 0)]
+
+        return ResourceStats(count, math.fsum(values) / count, p95, values[-1])
+
+    def __read_proc(self, series: _ProcessSeries, moment: float, boot_time: float) -> dict[str, float]:
+        """
+        Used to read metrics of the process from /proc.
+        CPU percent is computed the way psutil does it, relative
+        to the previous read (0.0 on the first one).
+
+        Raises psutil.NoSuchProcess if process is gone or its pid was
+        reused by a new process (create time differs), as psutil does.
+        """
+
+        process = series.process
+        pid = process.pid
+
+        try:
+            usage = procfs.read_usage(pid, boot_time)
+
+        except PermissionError:
+            raise psutil.AccessDenied(pid)
+
+        if usage is None:
+            raise psutil.NoSuchProcess(pid)
+
+        cpu_time, rss, num_threads, create_time = usage
+
+        if create_time != process.create_time():
+            raise psutil.NoSuchProcess(pid)
+        previous_time, previous_moment = series.cpu_time, series.cpu_moment
+        series.cpu_time, series.cpu_moment = cpu_time, moment
+
+        cpu_percent = 0.0
+
+        if previous_moment is not None and moment > previous_moment:
+            cpu_percent = round((cpu_time - previous_time) / (moment - previous_moment) * 100, 1)
+
+        values = {CPU_PERCENT_METRIC: cpu_percent, RSS_METRIC: rss, NUM_THREADS_METRIC: num_threads}
+        return {metric: values[metric] for metric in self.metrics}
+
+    def __run(self, interval: float):
+        while not self.__stop_event.wait(interval):
+            try:
+                self.sample()
+
+            except Exception:  # noqa
+                _logger.exception("Resource sampler failed.")
+
+
+def initialize_worker(log_queue=None,
+                      logback_path: Optional[str] = None,
+                      reset_singletons: bool = True,
+                      warm_ups: Iterable[Callable[[], Any]] = ()):
+    """
+    Used to initialize worker process of a process pool.
+
+    Sends records of the worker to log_queue of the parent (see
+    kutil.logger.get_log_queue and WorkerLogQueue) with levels of
+    logback_path applied, or discards them without log_queue, drops
+    singletons inherited from the parent (forked workers start with
+    a copy of them) and calls warm-up hooks, e.g. singleton classes
+    or functions loading data every task needs.
+    Hooks have to be picklable (module level functions or classes).
+    """
+
+    # Log handlers inherited by forked worker write to the file
+    # of the parent, or to a queue nothing drains in the worker.
+    initialize_worker_logging(log_queue, logback_path)
+
+    if reset_singletons:
+        reset()
+
+    for warm_up in warm_ups:
+        warm_up()
+
+
+def _run_chunk(function: Callable[[Any], Any], chunk: list) -> list:
+    return [function(item) for item in chunk]
+
+
+class ProcessRunner:
+    """
+    Pool of worker processes for CPU-bound work.
+
+    Workers are initialized with initialize_worker: their records go to
+    the parent, which writes them with its own handlers, inherited
+    singletons are dropped and warm-up hooks run once per worker. Queue
+    of the parent is used when it aggregates logs (initialize_logging
+    with aggregate flag) and it can be passed to the workers, otherwise
+    runner collects records through its own WorkerLogQueue.
+
+    Usage:
+        with ProcessRunner(warm_ups=[Model]) as runner:
+            for result in runner.map(predict, rows, chunk_size=100):
+                ...
+    """
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 warm_ups: Iterable[Callable[[], Any]] = (),
+                 reset_singletons: bool = True,
+                 mp_context=None):
+        """
+        Initializes pool of max_workers processes (number of CPUs by default).
+        Workers are started on the first submitted task.
+        """
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        log_queue = get_log_queue(mp_context)
+        self.__worker_log_queue: Optional[WorkerLogQueue] = None
+
+        if log_queue is None:
+            self.__worker_log_queue = WorkerLogQueue(mp_context)
+            log_queue = self.__worker_log_queue.queue
+
+        try:
+            self.__executor = ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=mp_context,
+                initializer=initialize_worker,
+                initargs=(log_queue, get_logback_path(), reset_singletons, tuple(warm_ups))
+            )
+
+        except BaseException:
+            if self.__worker_log_queue is not None:
+                self.__worker_log_queue.close()
+
+            raise
+
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """
+        Used to run a single task in a worker.
+        """
+        return self.__executor.submit(function, *args, **kwargs)
+
+    def map(self,
+            function: Callable[[Any], Any],
+            iterable: Iterable,
+            chunk_size: int = 1,
+            max_in_flight: Optional[int] = None,
+            ordered: bool = True) -> Iterator:
+        """
+        Used to apply function to every item in worker processes.
+
+        Items are sent to workers in chunks of chunk_size, at most
+        max_in_flight chunks (twice the workers by default) are submitted
+        ahead of results consumed, so iterable is read lazily and may be
+        endless. Results are yielded as soon as their chunk is done, in
+        the order of items, or in the order chunks finish if not ordered.
+        Closing the iterator cancels chunks that haven't started.
+        """
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size should be at least 1.")
+
+        if max_in_flight is None:
+            max_in_flight = DEFAULT_IN_FLIGHT_PER_WORKER * self.max_workers
+
+        if max_in_flight < 1:
+            raise ValueError("Max in flight should be at least 1.")
+
+        return self.__stream(function, iter(iterable), chunk_size, max_in_flight, ordered)
+
+    def shutdown(self, wait_for_tasks: bool = True, cancel_futures: bool = False):
+        """
+        Used to stop worker processes.
+        Log queue of the runner is closed once they exit,
+        in background unless waiting for tasks.
+        """
+
+        self.__executor.shutdown(wait=wait_for_tasks, cancel_futures=cancel_futures)
+
+        if self.__worker_log_queue is None:
+            return
+
+        if wait_for_tasks:
+            self.__close_log_queue()
+
+        else:
+            threading.Thread(target=self.__close_log_queue, name="kutil-runner-log-queue", daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(cancel_futures=exc_type is not None)
+
+    def __close_log_queue(self):
+        """
+        Waits for workers to exit, then closes log queue of the runner.
+        """
+
+        worker_log_queue = self.__worker_log_queue
+
+        if worker_log_queue is None:
+            return
+
+        self.__executor.shutdown(wait=True)
+        self.__worker_log_queue = None
+        worker_log_queue.close()
+
+    def __stream(self, function: Callable[[Any], Any], iterator: Iterator, chunk_size: int,
+                 max_in_flight: int, ordered: bool) -> Iterator:
+        """
+        Keeps up to max_in_flight chunks submitted and yields their results.
+        """
+
+        pending: deque[Future] = deque()
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < max_in_flight:
+                    chunk = list(islice(iterator, chunk_size))
+
+                    if not chunk:
+                        exhausted = True
+                        break
+
+                    pending.append(self.__executor.submit(_run_chunk, function, chunk))
+
+                if not pending:
+                    return
+
+                if ordered:
+                    future = pending.popleft()
+
+                else:
+                    future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                    pending.remove(future)
+
+                yield from future.result()
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def parallel_map(function: Callable[[Any], Any],
+                 iterable: Iterable,
+                 chunk_size: int = 1,
+                 max_workers: Optional[int] = None,
+                 max_in_flight: Optional[int] = None,
+                 ordered: bool = True,
+                 warm_ups: Iterable[Callable[[], Any]] = ()) -> Iterator:
+    """
+    Used to apply function to every item in a temporary ProcessRunner,
+    see ProcessRunner.map. Workers are stopped once results are consumed.
+    """
+
+    with ProcessRunner(max_workers, warm_ups) as runner:
+        yield from runner.map(function, iterable, chunk_size, max_in_flight, ordered)
+
+
+def get_running_processes(processes: Iterable[str],
+                          attrs: Iterable[str] = DEFAULT_PROCESS_ATTRIBUTES,
+                          cached: bool = False) -> dict[str, list[psutil.Process]]:
     """
     Used to check if any of the provided processes
     are currently running.
 
-    Will return list of those that are actually running.
+    Will return mapping of process name to all running
+    processes with that name, only for names that are running.
 
-    Iterates through the system process list and matches names against the
-    provided list. To optimize performance, the scan terminates early once
-    all requested processes have been identified.
+    Scans the system process list once, matching names prefetched by
+    process_iter against a set of requested names. Additional attributes
+    to prefetch can be provided, they are available in process.info of
+    returned processes without further system calls. Processes that can't
+    be accessed or disappear during the scan are skipped.
+
+    When cached, shared ProcessTable snapshot is used instead of scanning,
+    attrs are then limited to PROCESS_TABLE_ATTRIBUTES. Same attributes
+    are read directly from /proc when proc backend is used.
     """
 
-    running_processes = []
+    names = set(processes)
+    running_processes = {}
+    attrs = list(attrs)
 
-    for process in psutil.process_iter(['name']):
-        # No need to continue scanning processes if we already
-        # found all that were requested.
-        if len(running_processes) == len(processes):
-            break
+    if "name" not in attrs:
+        attrs.append("name")
 
-        try:
-            if process.name() in processes:
-                running_processes.append(process)
+    table_attrs = set(attrs) <= set(PROCESS_TABLE_ATTRIBUTES)
 
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
+    if cached:
+        if not table_attrs:
+            raise ValueError(f"Attributes {sorted(set(attrs) - set(PROCESS_TABLE_ATTRIBUTES))} "
+                             f"aren't held by process table.")
+
+        infos = [info for found in ProcessTable().find(names).values() for info in found]
+        return _to_processes(infos, attrs)
+
+    if not names:
+        return running_processes
+
+    if _backend == PROC_BACKEND and table_attrs:
+        return _to_processes([ProcessInfo(*entry) for entry in procfs.iter_processes(names)], attrs)
+
+    for process in psutil.process_iter(attrs):
+        name = process.info["name"]
+
+        if name in names:
+            running_processes.setdefault(name, []).append(process)
 
     return running_processes
 
 
-def is_process_already_running(process_name: str):
+def get_runtime_directory():
+    """
+    Used to get directory instance lock files are created in.
+    """
+    return _runtime_directory or os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+
+
+def set_runtime_directory(directory: Optional[str]):
+    """
+    Used to set directory instance lock files are created in,
+    None restores the default one.
+    """
+
+    global _runtime_directory
+    _runtime_directory = directory
+
+
+class InstanceLock:
+    """
+    Lock file guarding a single running instance of a service.
+
+    Lock is an OS level lock (flock, msvcrt.locking on Windows) of
+    <runtime directory>/<name>.lock, so checking takes constant time,
+    two instances starting at the same moment can't both acquire it and
+    it's released by the OS when the process dies. File holds pid of
+    the owner. Locks of the same name exclude each other even within a
+    single process.
+
+    Usage:
+        with InstanceLock("my-service"):
+            run()
+    """
+
+    def __init__(self, name: Optional[str] = None, directory: Optional[str] = None):
+        """
+        Initializes lock of the name (service name by default) in
+        the directory (runtime directory by default).
+        """
+
+        self.name = name or get_service_name()
+        self.path = os.path.join(directory or get_runtime_directory(), f"{self.name}.lock")
+
+        self.__descriptor: Optional[int] = None
+        self.__lock = threading.Lock()
+
+    @property
+    def locked(self):
+        """
+        Whether this lock is acquired.
+        """
+        return self.__descriptor is not None
+
+    def acquire(self):
+        """
+        Used to acquire lock without waiting.
+        Returns False if another instance holds it.
+        """
+
+        with self.__lock:
+            if self.__descriptor is not None:
+                return True
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+            try:
+                _lock_file(descriptor)
+
+            except OSError:
+                os.close(descriptor)
+                return False
+
+            os.ftruncate(descriptor, 0)
+            os.write(descriptor, f"{os.getpid()}\n".encode())
+
+            self.__descriptor = descriptor
+            return True
+
+    def release(self):
+        """
+        Used to release lock if it's acquired.
+
+        Lock file isn't deleted, as another instance may
+        be already waiting on it, only the pid is cleared.
+        """
+
+        with self.__lock:
+            descriptor = self.__descriptor
+
+            if descriptor is None:
+                return
+
+            self.__descriptor = None
+
+            try:
+                os.ftruncate(descriptor, 0)
+                _unlock_file(descriptor)
+
+            finally:
+                os.close(descriptor)
+
+    def get_owner_pid(self) -> Optional[int]:
+        """
+        Used to get pid of the instance holding the lock.
+        Returns None if it's unknown or lock isn't held.
+        """
+
+        try:
+            with open(self.path, "r") as file:
+                return int(file.read().strip())
+
+        except (OSError, ValueError):
+            return None
+
+    def __enter__(self):
+        """
+        Acquires lock, raises RuntimeError if another instance holds it.
+        """
+
+        if not self.acquire():
+            raise RuntimeError(f"Another instance of '{self.name}' is already running "
+                               f"(pid {self.get_owner_pid()}, lock {self.path}).")
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+def _lock_file(descriptor: int):
+    """
+    Used to lock file without waiting, raises OSError if it's locked.
+    """
+
+    if fcntl is not None:
+        fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    elif msvcrt is not None:  # pragma: no cover
+        os.lseek(descriptor, 0, os.SEEK_SET)
+        msvcrt.locking(descriptor, msvcrt.LK_NBLCK, 1)
+
+    else:  # pragma: no cover
+        raise RuntimeError("File locking isn't supported on this platform.")
+
+
+def _unlock_file(descriptor: int):
+
+    if fcntl is not None:
+        fcntl.flock(descriptor, fcntl.LOCK_UN)
+
+    elif msvcrt is not None:  # pragma: no cover
+        os.lseek(descriptor, 0, os.SEEK_SET)
+        msvcrt.locking(descriptor, msvcrt.LK_UNLCK, 1)
+
+
+def is_process_already_running(process_name: str, cached: bool = False):
     """
     Used to check if process with provided name already running.
     Will not consider current process if name matches.
 
+    Scans the process table, so it's slow and racy when two instances
+    start together. Use InstanceLock to guard a single instance,
+    this is meant as a diagnostic (e.g. for instances without lock).
+
     Verifies if another instance of the specified process name is active by
     comparing process IDs and executable paths. This ensures that only
     instances launched from the same executable are flagged as duplicates.
+
+    When cached, shared ProcessTable snapshot is used instead of scanning.
+    With proc backend, executable is read only for processes with the name.
     """
 
     current_pid = os.getpid()
     _logger.debug("Current PID=%d, Exe=%s", current_pid, sys.executable)
 
+    if cached or _backend == PROC_BACKEND:
+        if cached:
+            infos = ProcessTable().find([process_name]).get(process_name, [])
+
+        else:
+            infos = [ProcessInfo(*entry) for entry in procfs.iter_processes([process_name])]
+
+        for info in infos:
+            process_exe = os.path.realpath(info.exe) if info.exe else None
+            _logger.debug("PID=%d, Name=%s, Exe=%s", info.pid, info.name, process_exe)
+
+            if info.pid != current_pid and process_exe == sys.executable:
+                return True
+
+        return False
+
     for process in psutil.process_iter(['name', 'pid', 'exe']):
 
         try:
@@ -71,3 +1296,21 @@ def is_process_already_running(process_name: str):
             continue
 
     return False
+
+
+def _to_processes(infos: list[ProcessInfo], attrs: list[str]) -> dict[str, list[psutil.Process]]:
+    """
+    Used to group psutil processes of the entries by name.
+    Entries which processes are gone are skipped.
+    """
+
+    processes = {}
+
+    for info in infos:
+        try:
+            processes.setdefault(info.name, []).append(info.to_process(attrs))
+
+        except psutil.NoSuchProcess:
+            continue
+
+    return processes
@@ -0,0 +1,245 @@
+import os
+import sys
+from typing import Iterable, Iterator, Optional
+
+import psutil
+
+PROC_PATH = "/proc"
+
+# Kernel truncates process names (comm) to 15 characters.
+_TRUNCATED_NAME_LENGTH = 15
+_DELETED_SUFFIX = " (deleted)"
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_READ_SIZE = 4096
+
+# Returned instead of a value when process is gone.
+_GONE = object()
+
+# (pid, name, exe, create_time)
+ProcessEntry = tuple[int, Optional[str], Optional[str], Optional[float]]
+
+# (cpu seconds (user + system), rss bytes, number of threads, create_time)
+ProcessUsage = tuple[float, int, int, float]
+
+
+def is_available():
+    """
+    Used to check if processes can be read directly from /proc.
+    """
+
+    return sys.platform.startswith("linux") and os.path.isdir(PROC_PATH)
+
+
+def get_pids() -> list[int]:
+    """
+    Used to get sorted pids of running processes.
+    """
+
+    with os.scandir(PROC_PATH) as entries:
+        return sorted(int(entry.name) for entry in entries if entry.name.isdigit())
+
+
+def iter_processes(names: Optional[Iterable[str]] = None) -> Iterator[ProcessEntry]:
+    """
+    Used to read (pid, name, exe, create_time) of running processes,
+    optionally only of the ones with provided names.
+
+    Values match the ones psutil reports (None where psutil would raise
+    AccessDenied or ZombieProcess), processes that disappear are skipped.
+    Each process costs reading its stat file, exe link is read only for
+    processes with matching names.
+    """
+
+    names = None if names is None else set(names)
+    boot_time = psutil.boot_time()
+
+    for pid in get_pids():
+        process = read_process(pid, names, boot_time)
+
+        if process is not None:
+            yield process
+
+
+def read_process(pid: int, names: Optional[set[str]] = None, boot_time: Optional[float] = None) -> Optional[ProcessEntry]:
+    """
+    Used to read (pid, name, exe, create_time) of the process.
+
+    Name and create time come from /proc/<pid>/stat, names truncated by
+    kernel are completed from cmdline the way psutil does it. Returns None
+    if process is gone or its name isn't one of provided names.
+    """
+
+    try:
+        stat = _read_file(f"{PROC_PATH}/{pid}/stat")
+
+    except PermissionError:
+        return None if names is not None else (pid, None, None, None)
+
+    if stat is None:
+        return None
+
+    name_end = stat.rfind(b")")
+    name = os.fsdecode(stat[stat.find(b"(") + 1:name_end])
+    fields = stat[name_end + 2:].split()
+
+    if len(name) >= _TRUNCATED_NAME_LENGTH and (names is None or any(value.startswith(name) for value in names)):
+        name = _complete_name(pid, name)
+
+        if name is _GONE:
+            return None
+
+    if names is not None and name not in names:
+        return None
+
+    exe = _read_exe(pid, is_zombie=fields[0] == b"Z")
+
+    if exe is _GONE:
+        return None
+
+    if boot_time is None:
+        boot_time = psutil.boot_time()
+
+    return pid, name, exe, float(fields[19]) / _CLOCK_TICKS + boot_time
+
+
+def read_create_time(pid: int, boot_time: Optional[float] = None) -> Optional[float]:
+    """
+    Used to read create time of the process, same as read_process
+    reports it, from the stat file only. Can be compared with a
+    previously read value to tell whether pid was reused.
+
+    Returns None if process is gone, raises PermissionError if it's not accessible.
+    """
+
+    stat = _read_file(f"{PROC_PATH}/{pid}/stat")
+
+    if stat is None:
+        return None
+
+    if boot_time is None:
+        boot_time = psutil.boot_time()
+
+    fields = stat[stat.rfind(b")") + 2:].split()
+    return float(fields[19]) / _CLOCK_TICKS + boot_time
+
+
+def read_usage(pid: int, boot_time: Optional[float] = None) -> Optional[ProcessUsage]:
+    """
+    Used to read (cpu seconds, rss bytes, number of threads, create time)
+    of the process. Values are the ones psutil reports as cpu_times()
+    user + system, memory_info().rss, num_threads() and create_time(),
+    read from stat and statm files instead of the files psutil reads.
+    Create time tells whether pid was reused since the previous read.
+
+    Returns None if process is gone, raises PermissionError if it's not accessible.
+    """
+
+    stat = _read_file(f"{PROC_PATH}/{pid}/stat")
+    statm = _read_file(f"{PROC_PATH}/{pid}/statm") if stat is not None else None
+
+    if statm is None:
+        return None
+
+    if boot_time is None:
+        boot_time = psutil.boot_time()
+
+    fields = stat[stat.rfind(b")") + 2:].split()
+    cpu_ticks = int(fields[11]) + int(fields[12])
+
+    return (
+        cpu_ticks / _CLOCK_TICKS,
+        int(statm.split()[1]) * _PAGE_SIZE,
+        int(fields[17]),
+        float(fields[19]) / _CLOCK_TICKS + boot_time
+    )
+
+
+def _read_file(path: str, whole: bool = False) -> Optional[bytes]:
+    """
+    Used to read /proc file of the process. Returns None if process is gone.
+
+    Small files (stat) are read with a single read call,
+    whole files are read until the end.
+    """
+
+    try:
+        descriptor = os.open(path, os.O_RDONLY)
+
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+
+    try:
+        data = os.read(descriptor, _READ_SIZE)
+
+        while whole and data:
+            chunk = os.read(descriptor, _READ_SIZE)
+
+            if not chunk:
+                break
+
+            data += chunk
+
+        return data
+
+    except ProcessLookupError:
+        return None
+
+    finally:
+        os.close(descriptor)
+
+
+def _complete_name(pid: int, name: str):
+    """
+    Used to replace truncated name with the first cmdline
+    argument if it starts with the name, same as psutil.
+    """
+
+    try:
+        data = _read_file(f"{PROC_PATH}/{pid}/cmdline", whole=True)
+
+    except PermissionError:
+        return name
+
+    if data is None:
+        return _GONE
+
+    cmdline = os.fsdecode(data)
+
+    if not cmdline:
+        return name
+
+    separator = "\x00" if cmdline.endswith("\x00") else " "
+    arguments = cmdline.removesuffix(separator).split(separator)
+
+    if separator == "\x00" and len(arguments) == 1 and " " in cmdline:
+        arguments = cmdline.removesuffix(separator).split(" ")
+
+    extended_name = os.path.basename(arguments[0])
+    return extended_name if extended_name.startswith(name) else name
+
+
+def _read_exe(pid: int, is_zombie: bool):
+    """
+    Used to read executable path of the process the way psutil does it.
+    """
+
+    try:
+        exe = os.readlink(f"{PROC_PATH}/{pid}/exe")
+
+    except PermissionError:
+        return None
+
+    except (FileNotFoundError, ProcessLookupError):
+        if not os.path.lexists(f"{PROC_PATH}/{pid}"):
+            return _GONE
+
+        # Kernel threads have no executable.
+        return None if is_zombie else ""
+
+    exe = exe.split("\x00")[0]
+
+    if exe.endswith(_DELETED_SUFFIX) and not os.path.exists(exe):
+        exe = exe[:-len(_DELETED_SUFFIX)]
+
+    return exe
@@ -1,10 +1,69 @@
+import hashlib
 import importlib
+import importlib.machinery
 import inspect
+import json
+import os
 import pkgutil
-from typing import Callable
+import threading
+from typing import Callable, Optional
 
+# Discovery cache entries by '<package>:<class>', each holding
+# signature of package files and modules that had matching members.
+_member_cache: dict[str, dict] = {}
+_member_cache_loaded = False
+_member_cache_path: Optional[str] = None
+_member_cache_lock = threading.Lock()
 
-def get_members(package: str, clazz: type):
+_MODULE_SUFFIXES = tuple(importlib.machinery.all_suffixes())
+
+
+def get_member_cache_path():
+    """
+    Used to get path of the file discovery cache is persisted to.
+    Defaults to 'kutil/members.json' in user cache directory.
+    """
+
+    if _member_cache_path is not None:
+        return _member_cache_path
+
+    cache_directory = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_directory, "kutil", "members.json")
+
+
+def set_member_cache_path(cache_path: Optional[str]):
+    """
+    Used to set path of the file discovery cache is persisted to,
+    None restores the default one. Drops cache loaded from previous file.
+    """
+
+    global _member_cache_path, _member_cache_loaded
+
+    with _member_cache_lock:
+        _member_cache_path = cache_path
+        _member_cache_loaded = False
+        _member_cache.clear()
+
+
+def clear_member_cache():
+    """
+    Used to drop discovery cache, both in memory and on disk.
+    """
+
+    global _member_cache_loaded
+
+    with _member_cache_lock:
+        _member_cache.clear()
+        _member_cache_loaded = True
+
+        try:
+            os.remove(get_member_cache_path())
+
+        except FileNotFoundError:
+            pass
+
+
+def get_members(package: str, clazz: type, cached: bool = False):
     """
     Used to get tuple of class name, class that
     correspond to provided type and located in
@@ -13,6 +72,12 @@ def get_members(package: str, clazz: type):
     Iterates through all modules within the specified package path, imports
     them dynamically, and yields classes that are subclasses of the
     provided type (excluding the type itself).
+
+    When cached, modules that had matching members are remembered (in
+    memory and in the file of get_member_cache_path) along with path,
+    modification time and size of every package file. While package
+    files are unchanged, only these modules are imported, without
+    walking the package.
     """
 
     spec = importlib.util.find_spec(package)  # noqa
@@ -20,18 +85,138 @@ def get_members(package: str, clazz: type):
     if not spec or not spec.submodule_search_locations:
         return
 
-    for _, module_name, is_package in pkgutil.walk_packages(
-        spec.submodule_search_locations,
-        prefix=f"{package}."
-    ):
+    locations = list(spec.submodule_search_locations)
+
+    if not cached:
+        for _, members in _scan_modules(package, locations, clazz):
+            yield from members
+
+        return
+
+    cache_key = f"{package}:{clazz.__module__}.{clazz.__qualname__}"
+    signature = _get_package_signature(locations, clazz)
+    entry = _get_cache_entry(cache_key) if signature is not None else None
+
+    if entry is not None and entry.get("signature") == signature:
+        for module_name in entry["modules"]:
+            yield from _get_module_members(importlib.import_module(module_name), clazz)
+
+        return
+
+    modules = []
+
+    for module_name, members in _scan_modules(package, locations, clazz):
+        if members:
+            modules.append(module_name)
+            yield from members
+
+    if signature is not None:
+        _set_cache_entry(cache_key, {"signature": signature, "modules": modules})
+
+
+def _scan_modules(package: str, locations: list[str], clazz: type):
+    """
+    Used to walk the package, importing every module.
+    Yields module name and its matching members.
+    """
+
+    for _, module_name, is_package in pkgutil.walk_packages(locations, prefix=f"{package}."):
         if is_package:
             continue
 
         module = importlib.import_module(module_name)
+        yield module_name, list(_get_module_members(module, clazz))
+
+
+def _get_module_members(module, clazz: type):
+
+    for member_name, member in inspect.getmembers(module, inspect.isclass):
+        if issubclass(member, clazz) and member is not clazz:
+            yield member_name, member
+
+
+def _get_package_signature(locations: list[str], clazz: type) -> Optional[str]:
+    """
+    Used to get hash of path, modification time and size of every module
+    file of the package and of the file defining the class.
+    Files are only listed and stat-ed, nothing is imported.
+
+    Returns None if package isn't a plain directory (e.g. zip archive).
+    """
+
+    files = []
+
+    try:
+        class_file = inspect.getfile(clazz)
+
+    except TypeError:
+        class_file = None
+
+    if class_file is not None and os.path.isfile(class_file):
+        files.append(class_file)
+
+    for location in locations:
+        if not os.path.isdir(location):
+            return None
+
+        for directory, directories, file_names in os.walk(location):
+            directories[:] = [name for name in directories if name != "__pycache__"]
+            files.extend(os.path.join(directory, name) for name in file_names if name.endswith(_MODULE_SUFFIXES))
+
+    digest = hashlib.sha1()
+
+    for file_path in sorted(files):
+        stat = os.stat(file_path)
+        digest.update(f"{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode("utf-8", "surrogateescape"))
+
+    return digest.hexdigest()
+
+
+def _get_cache_entry(cache_key: str) -> Optional[dict]:
+    """
+    Used to get cache entry, loading persisted cache on first access.
+    """
+
+    global _member_cache_loaded
+
+    with _member_cache_lock:
+        if not _member_cache_loaded:
+            _member_cache_loaded = True
+
+            try:
+                with open(get_member_cache_path(), "r", encoding="utf-8") as file:
+                    persisted = json.load(file)
+
+                if isinstance(persisted, dict):
+                    _member_cache.update(persisted)
+
+            except (OSError, ValueError):
+                pass
+
+        return _member_cache.get(cache_key)
+
+
+def _set_cache_entry(cache_key: str, entry: dict):
+    """
+    Used to store cache entry and persist the cache.
+    File is replaced atomically, failure to write it is ignored.
+    """
+
+    with _member_cache_lock:
+        _member_cache[cache_key] = entry
+        cache_path = get_member_cache_path()
+        temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump(_member_cache, file)
+
+            os.replace(temporary_path, cache_path)
 
-        for member_name, member in inspect.getmembers(module, inspect.isclass):
-            if issubclass(member, clazz) and member is not clazz:
-                yield member_name, member
+        except OSError:
+            pass
 
 
 def get_methods(target, name_filter: Callable[[str], bool]):
@@ -0,0 +1,116 @@
+import pytest
+
+
+class TestColumnType:
+
+    @pytest.mark.parametrize("values, expected", [
+        (["true", "False", "TRUE"], "bool"),
+        (["1", "-2", "30"], "int"),
+        (["1", "2.5", "-3."], "float"),
+        (["1.5e3", "2"], "float"),
+        (["2024-01-15T10:30:00.000Z", "2024-02-29T00:00:00.5Z"], "date"),
+        (["2024-02-30T10:30:00.000Z"], "string"),
+        (["1", "two"], "string"),
+        (["true", "1"], "string"),
+        ([], "string"),
+        (["", ""], "string"),
+    ])
+    def test_infer_column_type(self, values, expected):
+
+        from kutil.column_type import infer_column_type
+
+        assert infer_column_type(values).name == expected
+
+    def test_converters(self, mocker):
+
+        from datetime import datetime, timezone
+
+        from kutil.column_type import infer_column_type
+
+        mocker.patch("kutil.date.get_localzone", return_value="UTC")
+
+        assert infer_column_type(["1", "2"]).converter("42") == 42
+        assert infer_column_type(["1", "2.5"]).converter("2") == 2.0
+        assert infer_column_type(["false"]).converter("True") is True
+        assert infer_column_type(["a"]).converter("a") == "a"
+
+        date_type = infer_column_type(["2024-01-15T10:30:00.000Z"])
+        assert date_type.converter("2024-01-15T10:30:00.000Z") == datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+
+        nullable = infer_column_type(["1", "", "NULL", "3"], null_values={"", "NULL"})
+
+        assert nullable.name == "int"
+        assert nullable.nullable is True
+        assert [nullable.converter(value) for value in ("", "NULL", "7", None)] == [None, None, 7, None]
+
+    def test_early_exit(self):
+        """
+        Tests that stream is consumed only until type is known
+        to be string or sample is exhausted.
+        """
+
+        from kutil.column_type import infer_column_type
+
+        values = iter(["1", "x", "2", "3"])
+
+        assert infer_column_type(values).name == "string"
+        assert list(values) == ["2", "3"]
+
+        values = iter(["1", "2", "x"])
+
+        assert infer_column_type(values, sample_size=2).name == "int"
+        assert list(values) == ["x"]
+
+    def test_inferrer_narrows_candidates(self, mocker):
+        """
+        Tests that values are checked only against types still possible.
+        """
+
+        import kutil.column_type as module
+
+        is_bool = mocker.Mock(side_effect=module._is_bool)
+        mocker.patch.object(module, "_CANDIDATES", ((module.BOOL_TYPE, is_bool, module._to_bool),) + module._CANDIDATES[1:])
+
+        inferrer = module.ColumnTypeInferrer()
+
+        assert inferrer.update("1") is True
+        assert inferrer.update("2") is True
+        assert inferrer.done is False
+
+        assert is_bool.call_count == 1
+        assert inferrer.get_column_type().name == "int"
+
+        assert inferrer.update("text") is False
+        assert inferrer.done is True
+        assert inferrer.update("3") is False
+
+    def test_infer_column_types(self):
+
+        from kutil.column_type import infer_column_types
+
+        rows = [
+            ["1", "1.5", "true", "a"],
+            ["2", "", "false"],
+            ["3", "2", "true", "b"],
+        ]
+
+        types = infer_column_types(rows)
+
+        assert [column_type.name for column_type in types] == ["int", "float", "bool", "string"]
+        # Last column is known to be string after the first row,
+        # so missing cell of the second row isn't looked at.
+        assert [column_type.nullable for column_type in types] == [False, True, False, False]
+
+        assert infer_column_types([]) == []
+        assert [column_type.name for column_type in infer_column_types(rows, sample_size=1)] == [
+            "int", "float", "bool", "string"
+        ]
+
+    def test_infer_column_types_stops_early(self):
+
+        from kutil.column_type import infer_column_types
+
+        rows = iter([["a", "b"], ["c", "d"], ["1", "2"]])
+
+        assert [column_type.name for column_type in infer_column_types(rows)] == ["string", "string"]
+        assert list(rows) == [["c", "d"], ["1", "2"]]
@@ -1,3 +1,4 @@
+import pytest
 
 
 class TestFileExtension:
@@ -16,3 +17,133 @@ class TestFileExtension:
         assert cfg_extension.remove_extension("test.cfg") == "test"
         assert cfg_extension.add_extension("test.cfg") == "test.cfg"
         assert cfg_extension.add_extension("test") == "test.cfg"
+
+    def test_file_type_is_interned(self):
+
+        import copy
+        import pickle
+
+        from kutil.file_type import FileType, JSON
+
+        assert FileType("json", "application/json") is JSON
+        assert FileType("json", "text/json") is not JSON
+        assert copy.deepcopy(JSON) is JSON
+        assert pickle.loads(pickle.dumps(JSON)) is JSON
+        assert {JSON: 1}[FileType("json", "application/json")] == 1
+
+        with pytest.raises(AttributeError):
+            JSON.custom = "value"
+
+
+class TestFileTypeRegistry:
+
+    def test_lookup_indexes(self):
+
+        from kutil.file_type import FILE_TYPES, JSON, YML, YAML
+
+        assert FILE_TYPES.from_stem("json") is JSON
+        assert FILE_TYPES.from_stem("JSON") is JSON
+        assert FILE_TYPES.from_extension(".yaml") is YAML
+        assert FILE_TYPES.from_extension(".YML") is YML
+        assert FILE_TYPES.from_mime_type("application/x-yaml") is YML
+        assert FILE_TYPES.all_from_mime_type("application/x-yaml") == (YML, YAML)
+
+        assert FILE_TYPES.from_stem("exe") is None
+        assert FILE_TYPES.from_extension(".exe") is None
+        assert FILE_TYPES.from_mime_type("application/exe") is None
+        assert FILE_TYPES.all_from_mime_type("application/exe") == ()
+
+    @pytest.mark.parametrize("path, expected", [
+        ("/path/to/file.json", "json"),
+        ("C:\\path\\to\\archive.ZIP", "zip"),
+        ("service.log", "log"),
+        ("/path/to.json/file", None),
+        ("/path/to/file", None),
+        ("/path/to/file.exe", None),
+    ])
+    def test_from_path(self, path, expected):
+
+        from kutil.file_type import FILE_TYPES, from_path
+
+        expected_type = FILE_TYPES.from_stem(expected) if expected else None
+
+        assert from_path(path) is expected_type
+        assert FILE_TYPES.from_path(path) is expected_type
+
+    def test_register_overrides_stem(self):
+
+        from kutil.file_type import FileType, FileTypeRegistry
+
+        plain_cfg = FileType("cfg", "text/plain")
+        app_cfg = FileType("cfg", "application/cfg")
+
+        registry = FileTypeRegistry(plain_cfg)
+        registry.register(app_cfg)
+
+        assert len(registry) == 1
+        assert list(registry) == [app_cfg]
+        assert app_cfg in registry
+        assert plain_cfg not in registry
+        assert registry.from_path("app.cfg") is app_cfg
+        assert registry.from_mime_type("text/plain") is None
+
+
+class TestFileTypeDetection:
+
+    @pytest.mark.parametrize("header, expected", [
+        (b"PK\x03\x04\x14\x00\x00\x00", "zip"),
+        (b"PK\x05\x06" + b"\x00" * 18, "zip"),
+        (b"\xff\xd8\xff\xe0\x00\x10JFIF", "jpg"),
+        (b"<svg xmlns='http://www.w3.org/2000/svg'/>", "svg"),
+        (b"\xef\xbb\xbf  <?xml version='1.0'?>\n<svg/>", "svg"),
+        (b"<!-- comment -->\n<svg/>", "svg"),
+        (b"<?xml version='1.0'?>\n<project/>", None),
+        (b'\n  {"key": "value"}', "json"),
+        (b"{}", "json"),
+        (b"[1, 2, 3]", "json"),
+        (b"[ true ]", "json"),
+        (b"[", "json"),
+        (b"[section]\nkey=value", None),
+        (b"{key: value}", None),
+        (b"plain text", None),
+        (b"", None),
+    ])
+    def test_detect_file_type_from_bytes(self, header, expected):
+
+        from kutil.file_type import FILE_TYPES, detect_file_type_from_bytes
+
+        expected_type = FILE_TYPES.from_stem(expected) if expected else None
+
+        assert detect_file_type_from_bytes(header) is expected_type
+
+    def test_detect_file_type_reads_only_header(self, tmp_path, module_patch):
+
+        from kutil.file_type import detect_file_type, JPG
+
+        file_path = tmp_path / "upload.json"
+        file_path.write_bytes(b"\xff\xd8\xff" + b"\x00" * 10_000)
+
+        detect_mock = module_patch("detect_file_type_from_bytes", return_value=JPG)
+
+        assert detect_file_type(str(file_path), header_size=16) is JPG
+        detect_mock.assert_called_once_with(b"\xff\xd8\xff" + b"\x00" * 13)
+
+    def test_detect_file_types(self, tmp_path):
+
+        from kutil.file_type import detect_file_types, JSON, ZIP
+
+        json_path = tmp_path / "data.bin"
+        json_path.write_bytes(b'{"key": 1}')
+
+        zip_path = tmp_path / "archive.dat"
+        zip_path.write_bytes(b"PK\x03\x04rest")
+
+        missing_path = str(tmp_path / "missing.txt")
+
+        result = detect_file_types(iter([str(json_path), str(zip_path), missing_path]), max_workers=2)
+
+        assert result == {
+            str(json_path): JSON,
+            str(zip_path): ZIP,
+            missing_path: None,
+        }
@@ -0,0 +1,213 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+def _text_record(timestamp: datetime, name: str, level: str, message: str):
+    return (f"{timestamp.strftime('%Y-%m-%d %H:%M:%S')},{timestamp.microsecond // 1000:03d} - "
+            f"({name}:10) [svc] [{level}] : {message}\n")
+
+
+class TestLogQuery:
+
+    @pytest.fixture
+    def _log_directory(self, tmp_path):
+        """
+        Creates current log file and backups of three days,
+        one record per minute between 10:00 and 11:00.
+        """
+
+        def write_day(file_name: str, day: int, compressed: bool = False):
+            content = ""
+
+            for minute in range(60):
+                timestamp = datetime(2024, 1, day, 10, minute)
+                level = "ERROR" if minute % 10 == 0 else "INFO"
+                name = "com.app.db" if minute % 2 == 0 else "com.app.api"
+                content += _text_record(timestamp, name, level, f"Day {day} minute {minute}")
+
+                if minute == 30:
+                    content += "Traceback (most recent call last):\n  ValueError: boom\n"
+
+            if compressed:
+                with gzip.open(tmp_path / file_name, "wt", encoding="utf-8") as file:
+                    file.write(content)
+
+            else:
+                (tmp_path / file_name).write_text(content, encoding="utf-8")
+
+        write_day("svc.log.2024-01-13.log", 13)
+        write_day("svc.log.2024-01-14.log.gz", 14, compressed=True)
+        write_day("svc.log.2024-01-15.log", 15)
+        write_day("svc.log", 16)
+        (tmp_path / "other.log.2024-01-15.log").write_text("unrelated")
+
+        return tmp_path
+
+    def test_select_log_files(self, _log_directory):
+
+        from datetime import date
+        from kutil.log_query import select_log_files
+
+        def select(start: date, end: date):
+            return [os.path.basename(file_path) for file_path in
+                    select_log_files(str(_log_directory), start, end, "svc")]
+
+        assert select(date(2024, 1, 14), date(2024, 1, 14)) == ["svc.log.2024-01-14.log.gz"]
+        assert select(date(2024, 1, 14), date(2024, 1, 15)) == [
+            "svc.log.2024-01-14.log.gz", "svc.log.2024-01-15.log", "svc.log"
+        ]
+        assert select(date(2024, 1, 16), date(2024, 1, 20)) == ["svc.log"]
+        assert select(date(2024, 1, 1), date(2024, 1, 12)) == ["svc.log.2024-01-13.log"]
+        assert select(date(2024, 2, 1), date(2024, 2, 2)) == ["svc.log"]
+
+    def test_query_logs_range(self, _log_directory):
+        """
+        Tests that only records within range are returned
+        and continuation lines are attached to their record.
+        """
+
+        from kutil.log_query import query_logs
+
+        entries = list(query_logs(
+            str(_log_directory),
+            datetime(2024, 1, 14, 10, 29),
+            datetime(2024, 1, 15, 10, 1),
+            service_name="svc"
+        ))
+
+        messages = [entry.message.split("\n")[0] for entry in entries]
+
+        assert messages[0] == "Day 14 minute 29"
+        assert messages[-1] == "Day 15 minute 1"
+        assert len(entries) == 31 + 2
+
+        traceback_entry = entries[1]
+
+        assert traceback_entry.name == "com.app.db"
+        assert traceback_entry.level == "ERROR"
+        assert traceback_entry.timestamp == datetime(2024, 1, 14, 10, 30)
+        assert traceback_entry.message.endswith("ValueError: boom")
+        assert traceback_entry.raw.startswith("2024-01-14 10:30:00,000 - (com.app.db:10)")
+
+    def test_query_logs_filters(self, _log_directory):
+
+        from kutil.log_query import query_logs
+
+        entries = list(query_logs(
+            str(_log_directory),
+            datetime(2024, 1, 16, 10, 0),
+            datetime(2024, 1, 16, 10, 59),
+            logger_name="com.app.db",
+            level="ERROR",
+            service_name="svc"
+        ))
+
+        assert [entry.message.split("\n")[0] for entry in entries] == [
+            f"Day 16 minute {minute}" for minute in (0, 10, 20, 30, 40, 50)
+        ]
+
+        assert list(query_logs(
+            str(_log_directory),
+            datetime(2024, 1, 16, 10, 0),
+            datetime(2024, 1, 16, 10, 59),
+            logger_name="com.app.d",
+            service_name="svc"
+        )) == []
+
+        with pytest.raises(ValueError):
+            list(query_logs(str(_log_directory), datetime(2024, 1, 16), datetime(2024, 1, 17), level="LOUD"))
+
+    @pytest.mark.parametrize("start_minute", [0, 1, 17, 30, 31, 59])
+    def test_find_start_offset(self, _log_directory, start_minute):
+        """
+        Tests that binary search lands exactly on the first record of the range.
+        """
+
+        from kutil.log_query import _find_start_offset
+
+        file_path = _log_directory / "svc.log"
+        content = file_path.read_bytes()
+
+        with open(file_path, "rb") as file:
+            offset = _find_start_offset(file, len(content), datetime(2024, 1, 16, 10, start_minute, 0, 500))
+
+        expected_minute = start_minute + 1
+        expected = f"2024-01-16 10:{expected_minute:02d}".encode() if expected_minute < 60 else None
+
+        if expected is None:
+            assert offset == len(content)
+
+        else:
+            assert content[offset:].startswith(expected)
+
+    def test_query_structured_logs(self, tmp_path):
+
+        from kutil.log_query import query_logs
+
+        moment = datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc)
+        lines = []
+
+        for minute in range(5):
+            lines.append(json.dumps({
+                "timestamp": (moment + timedelta(minutes=minute)).isoformat(timespec="milliseconds"),
+                "level": "WARNING",
+                "service": "svc",
+                "name": "com.app",
+                "lineno": 1,
+                "message": f"Minute {minute}",
+            }))
+
+        (tmp_path / "svc.log").write_text("\n".join(lines) + "\n")
+
+        entries = list(query_logs(
+            str(tmp_path),
+            moment + timedelta(minutes=1),
+            moment + timedelta(minutes=3),
+            level="WARN",
+            service_name="svc"
+        ))
+
+        assert [entry.message for entry in entries] == ["Minute 1", "Minute 2", "Minute 3"]
+        assert entries[0].name == "com.app"
+        assert entries[0].timestamp == (moment + timedelta(minutes=1)).astimezone().replace(tzinfo=None)
+
+    def test_unparsable_records(self, tmp_path):
+
+        from kutil.log_query import query_logs
+
+        (tmp_path / "svc.log").write_text(
+            "garbage before first record\n"
+            "2024-01-15 10:00:00,000 free form record\n"
+            '{"timestamp": "2024-01-15T10:01:00", broken json\n'
+            '{"timestamp": "not a date"}\n'
+        )
+
+        entries = list(query_logs(str(tmp_path), datetime(2024, 1, 15), datetime(2024, 1, 16), service_name="svc"))
+
+        assert [(entry.name, entry.message) for entry in entries] == [
+            ("", "2024-01-15 10:00:00,000 free form record"),
+            ("", '{"timestamp": "2024-01-15T10:01:00", broken json\n{"timestamp": "not a date"}'),
+        ]
+
+    def test_select_indexed_backups(self, tmp_path):
+        """
+        Tests that backups created by size based rollover
+        are selected together with the rest of their date.
+        """
+
+        from datetime import date
+        from kutil.log_query import select_log_files
+
+        for file_name in ("svc.log.2024-01-14.log.gz", "svc.log.2024-01-15.log.gz",
+                          "svc.log.2024-01-15.log.1.gz", "svc.log.2024-01-15.log.2", "svc.log"):
+            (tmp_path / file_name).write_text("")
+
+        selected = [os.path.basename(file_path) for file_path in
+                    select_log_files(str(tmp_path), date(2024, 1, 15), date(2024, 1, 15), "svc")]
+
+        assert selected == ["svc.log.2024-01-15.log.gz", "svc.log.2024-01-15.log.1.gz",
+                            "svc.log.2024-01-15.log.2", "svc.log"]
@@ -0,0 +1,165 @@
+import gzip
+import logging
+import os
+import re
+
+import pytest
+
+
+class TestLogRotation:
+
+    @pytest.fixture
+    def _create_handler(self, tmp_path):
+        """
+        Provides factory of handlers configured same way as initialize_logging does.
+        """
+
+        handlers = []
+
+        def create(**kwargs):
+            from kutil.log_rotation import SizedTimedRotatingFileHandler
+
+            handler = SizedTimedRotatingFileHandler(
+                str(tmp_path / "app.log"),
+                when="midnight",
+                interval=1,
+                encoding="utf-8",
+                **kwargs
+            )
+
+            handler.suffix = "%Y-%m-%d.log"
+            handler.extMatch = re.compile(r"^\d{4}-\d{2}-\d{2}.log$")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            handlers.append(handler)
+
+            return handler
+
+        yield create
+
+        for handler in handlers:
+            handler.close()
+
+    @staticmethod
+    def _message(index: int):
+        return str(index).rjust(20, "-")
+
+    def _emit(self, handler, count: int):
+        for index in range(count):
+            handler.handle(logging.LogRecord("app", logging.INFO, __file__, 1, self._message(index), None, None))
+
+    def test_size_rotation(self, tmp_path, _create_handler):
+        """
+        Tests that file is rotated once it reaches max_bytes and backups
+        of the same day receive growing index.
+        """
+
+        handler = _create_handler(max_bytes=40, backupCount=0)
+
+        self._emit(handler, 6)
+        handler.close()
+
+        backups = [os.path.basename(path) for path in handler.get_backups()]
+        date_suffix = backups[0][len("app.log."):]
+
+        assert backups == [f"app.log.{date_suffix}", f"app.log.{date_suffix}.1"]
+        assert re.match(r"^\d{4}-\d{2}-\d{2}.log$", date_suffix)
+
+        with open(handler.get_backups()[1], encoding="utf-8") as file:
+            assert file.read().split() == [self._message(2), self._message(3)]
+
+        with open(tmp_path / "app.log", encoding="utf-8") as file:
+            assert file.read().split() == [self._message(4), self._message(5)]
+
+    def test_compression(self, _create_handler):
+
+        handler = _create_handler(max_bytes=40, compress=True, backupCount=0)
+
+        self._emit(handler, 4)
+        handler.close()
+
+        backups = handler.get_backups()
+
+        assert len(backups) == 1
+        assert backups[0].endswith(".log.gz")
+
+        with gzip.open(backups[0], "rt", encoding="utf-8") as file:
+            assert file.read().split() == [self._message(0), self._message(1)]
+
+    def test_compressed_backup_is_not_overwritten(self, _create_handler):
+
+        handler = _create_handler(max_bytes=40, compress=True, backupCount=0)
+
+        self._emit(handler, 6)
+        handler.close()
+
+        backups = [os.path.basename(path) for path in handler.get_backups()]
+
+        assert len(backups) == 2
+        assert backups[0].endswith(".log.gz")
+        assert backups[1].endswith(".log.1.gz")
+
+    @pytest.mark.parametrize("options, expected_backups", [
+        ({"backupCount": 2}, 2),
+        ({"backupCount": 0, "max_total_bytes": 100}, 2),
+        ({"backupCount": 1, "max_total_bytes": 100}, 1),
+        ({"backupCount": 0}, 4),
+    ])
+    def test_retention(self, _create_handler, options, expected_backups):
+
+        handler = _create_handler(max_bytes=40, **options)
+
+        self._emit(handler, 10)
+        handler.close()
+
+        backups = handler.get_backups()
+
+        assert len(backups) == expected_backups
+        # Newest backups are kept.
+        assert backups[-1].endswith(".log.3")
+
+    def test_index_follows_highest_backup(self, tmp_path, _create_handler):
+        """
+        Tests that index doesn't fill gaps left by deleted backups.
+        """
+
+        handler = _create_handler()
+        default_name = f"{handler.baseFilename}.2024-01-01.log"
+
+        (tmp_path / "app.log.2024-01-01.log.2.gz").write_text("backup")
+        (tmp_path / "app.log.2023-12-31.log.7").write_text("backup")
+
+        assert handler.rotation_filename(default_name) == f"{default_name}.3"
+        assert handler.rotation_filename(f"{handler.baseFilename}.2024-01-02.log") == \
+               f"{handler.baseFilename}.2024-01-02.log"
+
+    def test_ignores_unrelated_files(self, tmp_path, _create_handler):
+
+        (tmp_path / "other.log.2024-01-01.log").write_text("other")
+        (tmp_path / "app.log.notes.txt").write_text("notes")
+        (tmp_path / "app.log.2024-01-01.log.2").write_text("backup")
+        (tmp_path / "app.log.2024-01-01.log").write_text("backup")
+        (tmp_path / "app.log.2023-12-31.log.gz").write_text("backup")
+
+        handler = _create_handler()
+
+        assert [os.path.basename(path) for path in handler.get_backups()] == [
+            "app.log.2023-12-31.log.gz",
+            "app.log.2024-01-01.log",
+            "app.log.2024-01-01.log.2",
+        ]
+
+    def test_compress_file(self, tmp_path):
+
+        from kutil.log_rotation import compress_file
+
+        file_path = tmp_path / "app.log"
+        file_path.write_bytes(b"content")
+
+        target_path = compress_file(str(file_path))
+
+        assert target_path == str(file_path) + ".gz"
+        assert not file_path.exists()
+        assert os.listdir(tmp_path) == ["app.log.gz"]
+
+        with gzip.open(target_path, "rb") as file:
+            assert file.read() == b"content"
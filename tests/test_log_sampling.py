@@ -0,0 +1,195 @@
+import logging
+
+import pytest
+
+
+class _ListHandler(logging.Handler):
+    """
+    Handler that collects records it receives.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestLogSampling:
+
+    @pytest.fixture
+    def _monotonic_mock(self, module_patch):
+        return module_patch("time.monotonic", return_value=0.0)
+
+    @pytest.fixture
+    def _logger(self):
+        """
+        Provides isolated logger with collecting handler.
+        """
+
+        logger = logging.getLogger("tests.log_sampling")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+
+        handler = _ListHandler()
+        logger.addHandler(handler)
+
+        yield logger, handler
+
+        logger.removeHandler(handler)
+        logger.filters.clear()
+
+    def test_sampling_rule_from_config(self):
+
+        from kutil.log_sampling import SamplingRule, DEFAULT_SUMMARY_INTERVAL
+
+        assert SamplingRule.from_config({"rate": 5}) == SamplingRule(5.0, 5.0, False, DEFAULT_SUMMARY_INTERVAL)
+        assert SamplingRule.from_config({
+            "rate": 0.5,
+            "burst": 10,
+            "per_call_site": True,
+            "summary_interval": 30
+        }) == SamplingRule(0.5, 10.0, True, 30.0)
+
+    @pytest.mark.parametrize("config, error", [
+        ({}, KeyError),
+        ({"rate": 0}, ValueError),
+        ({"rate": 10, "burst": 0.5}, ValueError),
+        ({"rate": "fast"}, ValueError),
+    ])
+    def test_sampling_rule_invalid(self, config, error):
+
+        from kutil.log_sampling import SamplingRule, validate_sampling
+
+        with pytest.raises(error):
+            SamplingRule.from_config(config)
+
+        with pytest.raises(error):
+            validate_sampling({"SAMPLING": {"com.app": config}})
+
+    def test_get_sampling_rule(self):
+
+        from kutil.log_sampling import get_sampling_rule, SamplingRule
+
+        logback = {
+            "com.app": "DEBUG",
+            "SAMPLING": {
+                "com.app": {"rate": 10},
+                "com.app.db": {"rate": 1},
+            }
+        }
+
+        assert get_sampling_rule("com.app", logback).rate == 10
+        assert get_sampling_rule("com.app.api", logback).rate == 10
+        assert get_sampling_rule("com.app.db.pool", logback) == SamplingRule.from_config({"rate": 1})
+        assert get_sampling_rule("com.other", logback) is None
+        assert get_sampling_rule("com.app", {"com.app": "DEBUG"}) is None
+
+    def test_token_bucket(self, _logger, _monotonic_mock):
+        """
+        Tests that burst is let through, the rest is suppressed until
+        bucket refills and summary is logged once interval passes.
+        """
+
+        from kutil.log_sampling import SamplingFilter, SamplingRule, SUPPRESSED_ATTRIBUTE
+
+        logger, handler = _logger
+        logger.addFilter(SamplingFilter(logger, SamplingRule(rate=1, burst=2, summary_interval=10)))
+
+        for index in range(5):
+            logger.debug("Message %d", index)
+
+        assert [record.getMessage() for record in handler.records] == ["Message 0", "Message 1"]
+
+        _monotonic_mock.return_value = 1.0
+        logger.debug("Message 5")
+        logger.debug("Message 6")
+
+        assert handler.records[-1].getMessage() == "Message 5"
+        assert len(handler.records) == 3
+
+        _monotonic_mock.return_value = 10.0
+        logger.debug("Message 7")
+
+        summary, message = handler.records[-2:]
+
+        assert summary.levelno == logging.WARNING
+        assert getattr(summary, SUPPRESSED_ATTRIBUTE) == 4
+        assert summary.getMessage() == "4 records suppressed by sampling in the last 10.0 seconds"
+        assert message.getMessage() == "Message 7"
+
+    def test_flush_summary(self, _logger, _monotonic_mock):
+        """
+        Tests that records suppressed before logger goes quiet are only
+        summarized when filters are flushed, and only once.
+        """
+
+        from kutil.log_sampling import SamplingFilter, SamplingRule, SUPPRESSED_ATTRIBUTE, flush_summaries
+
+        logger, handler = _logger
+        logger.addFilter(SamplingFilter(logger, SamplingRule(rate=1, burst=1, summary_interval=10)))
+
+        for index in range(4):
+            logger.info("Message %d", index)
+
+        # Interval passed, but no further record reached the filter.
+        _monotonic_mock.return_value = 30.0
+
+        assert len(handler.records) == 1
+
+        flush_summaries()
+
+        summary = handler.records[-1]
+
+        assert getattr(summary, SUPPRESSED_ATTRIBUTE) == 3
+        assert summary.getMessage() == "3 records suppressed by sampling in the last 30.0 seconds"
+
+        flush_summaries()
+
+        assert len(handler.records) == 2
+
+    def test_token_bucket_per_call_site(self, _logger, _monotonic_mock):
+
+        from kutil.log_sampling import SamplingFilter, SamplingRule
+
+        logger, handler = _logger
+        logger.addFilter(SamplingFilter(logger, SamplingRule(rate=1, burst=1, per_call_site=True)))
+
+        for _ in range(3):
+            logger.info("First call site")
+            logger.info("Second call site")
+
+        assert [record.getMessage() for record in handler.records] == ["First call site", "Second call site"]
+
+    def test_apply_sampling(self, _logger):
+        """
+        Tests that filter is kept while rule is the same,
+        replaced when it changes and removed when it's gone.
+        """
+
+        from kutil.log_sampling import apply_sampling, SamplingFilter
+
+        logger, handler = _logger
+        other_filter = logging.Filter()
+        logger.addFilter(other_filter)
+
+        apply_sampling(logger, {"SAMPLING": {"tests": {"rate": 10, "burst": 1}}})
+        sampling_filter = logger.filters[-1]
+        assert isinstance(sampling_filter, SamplingFilter)
+
+        apply_sampling(logger, {"SAMPLING": {"tests.log_sampling": {"rate": 10, "burst": 1}}})
+        assert logger.filters[-1] is sampling_filter
+
+        logger.info("First")
+        logger.info("Suppressed")
+
+        apply_sampling(logger, {"SAMPLING": {"tests": {"rate": 20}}})
+        assert logger.filters[-1] is not sampling_filter
+
+        # Replaced filter logs its pending summary.
+        assert handler.records[-1].getMessage().startswith("1 records suppressed")
+        assert logger.filters[-1].rule.rate == 20
+
+        apply_sampling(logger, {})
+        assert logger.filters == [other_filter]
@@ -0,0 +1,158 @@
+import json
+import logging
+
+import pytest
+
+
+class TestLogStats:
+
+    @pytest.fixture(autouse=True)
+    def _stats_module(self):
+        """
+        Enables statistics and makes sure each test starts with empty ones.
+        """
+
+        import kutil.log_stats as module
+
+        module.reset_stats()
+        module.enable_stats()
+
+        yield module
+
+        module.stop_stats_dump()
+        module.disable_stats()
+        module.reset_stats()
+
+    @staticmethod
+    def _make_record(name: str, level: int = logging.INFO, message: str = "message"):
+        return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+    def test_latency_histogram(self):
+
+        from kutil.log_stats import LatencyHistogram
+
+        histogram = LatencyHistogram()
+
+        assert histogram.percentile(50) is None
+        assert histogram.as_dict()["mean_us"] is None
+
+        for _ in range(98):
+            histogram.record(0.000003)
+
+        histogram.record(0.0005)
+        histogram.record(5)
+
+        assert histogram.count == 100
+        assert histogram.percentile(50) == 4
+        assert histogram.percentile(99) == 512
+        assert histogram.percentile(100) is None
+
+        snapshot = histogram.as_dict()
+
+        assert snapshot["buckets"]["4"] == 98
+        assert snapshot["buckets"]["512"] == 1
+        assert snapshot["buckets"]["inf"] == 1
+
+    def test_instrumented_handler_and_formatter(self, mocker):
+        """
+        Tests that emitted records, bytes and latencies are accounted per logger.
+        """
+
+        from kutil.log_stats import InstrumentedHandler, InstrumentedFormatter, get_stats
+
+        target = mocker.MagicMock()
+        handler = InstrumentedHandler(target)
+        formatter = InstrumentedFormatter(logging.Formatter("%(message)s"))
+
+        for record in (
+            self._make_record("com.app.api", logging.INFO, "ąb"),
+            self._make_record("com.app.api", logging.ERROR, "error"),
+            self._make_record("com.app.db", logging.INFO, "db"),
+        ):
+            handler.handle(record)
+            formatter.format(record)
+
+        assert target.handle.call_count == 3
+
+        api_stats = get_stats("com.app.api")
+
+        assert api_stats["emitted"] == {"INFO": 1, "ERROR": 1}
+        assert api_stats["bytes_written"] == (3 + 1) + (5 + 1)
+        assert api_stats["emit_latency"]["count"] == 2
+        assert api_stats["format_latency"]["count"] == 2
+
+        assert set(get_stats()) == {"com.app.api", "com.app.db"}
+        assert get_stats("com.app.missing")["emitted"] == {}
+
+        handler.flush()
+        handler.close()
+        target.flush.assert_called_once()
+        target.close.assert_called_once()
+
+    def test_disabled_stats(self, mocker, _stats_module):
+
+        from kutil.log_stats import InstrumentedHandler, InstrumentedFormatter, record_suppressed, get_stats
+
+        _stats_module.disable_stats()
+        assert _stats_module.is_stats_enabled() is False
+
+        record = self._make_record("com.app")
+
+        InstrumentedHandler(mocker.MagicMock()).handle(record)
+        assert InstrumentedFormatter(logging.Formatter("%(message)s")).format(record) == "message"
+        record_suppressed(record)
+
+        assert get_stats() == {}
+
+    def test_suppressed_by_sampling(self):
+
+        from kutil.log_sampling import SamplingFilter, SamplingRule
+        from kutil.log_stats import get_stats
+
+        logger = logging.getLogger("tests.log_stats.sampled")
+        sampling_filter = SamplingFilter(logger, SamplingRule(rate=0.001, burst=1))
+
+        results = [sampling_filter.filter(self._make_record(logger.name, logging.DEBUG)) for _ in range(3)]
+
+        assert results == [True, False, False]
+        assert get_stats(logger.name)["suppressed"] == {"DEBUG": 2}
+
+    def test_stats_dump_to_file(self, tmp_path):
+
+        from kutil.log_stats import start_stats_dump, stop_stats_dump, record_emitted
+
+        dump_path = tmp_path / "stats.json"
+
+        record_emitted(self._make_record("com.app"), 0.001)
+        start_stats_dump(str(dump_path), interval=60)
+        stop_stats_dump()
+
+        with open(dump_path, encoding="utf-8") as file:
+            assert json.load(file)["com.app"]["emitted"] == {"INFO": 1}
+
+    def test_stats_dump_callback(self):
+        """
+        Tests that callback is called periodically and
+        one last time when dump is stopped.
+        """
+
+        import threading
+
+        from kutil.log_stats import start_stats_dump, stop_stats_dump
+
+        dumps = []
+        dumped_twice = threading.Event()
+
+        def dump(stats):
+            dumps.append(stats)
+
+            if len(dumps) == 2:
+                dumped_twice.set()
+
+        start_stats_dump(dump, interval=0.01)
+
+        assert dumped_twice.wait(5)
+        stop_stats_dump()
+
+        assert len(dumps) >= 3
+        assert dumps[-1] == {}
@@ -1,10 +1,40 @@
 import logging
+import os
+import sys
 from unittest.mock import call
 
 import pytest
 from pytest_mock import MockerFixture
 
 
+def _log_from_worker(log_queue, worker_index: int):
+    """
+    Target of worker processes in aggregation tests.
+    """
+
+    import kutil.logger as module
+
+    module.initialize_worker_logging(log_queue)
+
+    for index in range(50):
+        logging.getLogger(f"com.app.worker{worker_index}").warning("Record %d", index)
+
+    module.shutdown_logging()
+
+
+def _log_from_forked_child():
+    """
+    Target of forked child in queue mode tests, logs
+    without initializing logging of its own.
+    """
+
+    for index in range(50):
+        logging.getLogger("com.app.child").warning("Record %d", index)
+
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
 class TestLogger:
 
     @pytest.fixture(scope="module", autouse=True)
@@ -41,6 +71,11 @@ class TestLogger:
         # Reset module globals
         module._logback = {}
         module._initialized = False
+        module._queue_listener = None
+        module._logback_path = None
+        module._logback_watcher = None
+        module._loggers = {}
+        module._log_queue = None
 
         # Clear handlers from the root logger for consistent testing of initialize_logging
         root_logger = logging.getLogger()
@@ -49,6 +84,8 @@ class TestLogger:
 
         yield module
 
+        module.shutdown_logging()
+
     @pytest.mark.parametrize("log_name, configured_level, expected_level", [
         ("com.app.worker", "DEBUG", logging.DEBUG),
         ("com.app.api", "WARN", logging.WARN),
@@ -67,6 +104,69 @@ class TestLogger:
         assert level == expected_level
 
 
+    @pytest.mark.parametrize("log_name, expected_level", [
+        ("myapp", logging.WARN),
+        ("myapp.api", logging.WARN),
+        ("myapp.db", logging.DEBUG),
+        ("myapp.db.pool", logging.DEBUG),
+        ("myapp.db.pool.worker", logging.DEBUG),
+        ("myapp.db.migrations", "OFF"),
+        ("myapp.dbx", logging.WARN),
+        ("other", logging.ERROR),
+    ])
+    def test_get_log_level_hierarchical(self, _logger_module, log_name, expected_level):
+        """
+        Tests that the longest configured dotted prefix wins and
+        'ROOT' entry is used when there is no matching prefix.
+        """
+
+        logback = {
+            "ROOT": "ERROR",
+            "myapp": "WARN",
+            "myapp.db": "DEBUG",
+            "myapp.db.migrations": "OFF",
+        }
+
+        assert _logger_module._get_log_level(log_name, logback) == expected_level
+
+    def test_get_log_level_memo_invalidated(self, _logger_module):
+        """
+        Tests that resolved levels are cached per logback and
+        recalculated when a different logback is used.
+        """
+
+        logback = {"myapp": "DEBUG"}
+
+        assert _logger_module._get_log_level("myapp.api", logback) == logging.DEBUG
+
+        resolver = _logger_module._level_resolver
+        assert _logger_module._get_log_level("myapp.api", logback) == logging.DEBUG
+        assert _logger_module._level_resolver is resolver
+
+        assert _logger_module._get_log_level("myapp.api", {"myapp": "ERROR"}) == logging.ERROR
+        assert _logger_module._level_resolver is not resolver
+
+    def test_get_log_level_unknown_level(self, _logger_module):
+        """
+        Tests that rule with unknown level doesn't break
+        resolution of other loggers and is skipped itself.
+        """
+
+        logback = {"ROOT": "WARN", "myapp": "DEBUG", "myapp.db": "TRACE", "other.module": "TRACE"}
+
+        assert _logger_module._get_log_level("unrelated", logback) == logging.WARN
+        assert _logger_module._get_log_level("myapp.db.pool", logback) == logging.DEBUG
+
+    def test_initialize_logging_invalid_logback(self, tmp_path, _logger_module):
+
+        logback_path = tmp_path / "logback.json"
+        logback_path.write_text('{"com.app": "DEBUG", "some.other.module": "TRACE"}')
+
+        with pytest.raises(ValueError, match="some.other.module=TRACE"):
+            _logger_module.initialize_logging(str(tmp_path), str(logback_path))
+
+        assert _logger_module.get_logger("unrelated").level == logging.INFO
+
     def test_get_log_level_default(self, _logger_module):
         """
         Tests falling back to the default level (logging.INFO).
@@ -168,3 +268,617 @@ class TestLogger:
         _logging_mock.getLogger.assert_called_with("test_logger_off")
         get_logger_mock.setLevel.assert_not_called()
         assert get_logger_mock.disabled is True
+
+    def test_initialize_logging_with_queue(self, tmp_path, _logger_module):
+        """
+        Tests that in queue mode root logger only enqueues records and
+        listener writes them to the file, flushing everything on shutdown.
+        """
+
+        from logging.handlers import QueueHandler
+
+        _logger_module.initialize_logging(str(tmp_path), "missing_logback.json", use_queue=True, queue_size=5)
+
+        root_logger = logging.getLogger()
+        assert len(root_logger.handlers) == 1
+        assert isinstance(root_logger.handlers[0], QueueHandler)
+        assert _logger_module._queue_listener is not None
+
+        for index in range(20):
+            logging.getLogger("com.app.queue").warning("Message %d", index)
+
+        _logger_module.shutdown_logging()
+
+        assert root_logger.handlers == []
+        assert _logger_module._queue_listener is None
+
+        with open(tmp_path / "my_service.log", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+
+        assert len(lines) == 20
+        assert "(com.app.queue:" in lines[-1]
+        assert lines[-1].endswith("[my_service] [WARNING] : Message 19")
+
+    def test_initialize_logging_invalid_overflow_policy(self, _logger_module, _file_handler_mock):
+
+        with pytest.raises(ValueError):
+            _logger_module.initialize_logging("target", "path", use_queue=True, overflow_policy="unknown")
+
+        _file_handler_mock.assert_not_called()
+
+    def test_shutdown_logging_without_queue(self, _logger_module, _logging_mock):
+
+        _logger_module.shutdown_logging()
+        _logging_mock.getLogger.assert_not_called()
+
+    @staticmethod
+    def _make_record(level: int, message: str):
+        return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+    def test_overflow_drop_oldest(self, _logger_module):
+
+        import queue
+
+        log_queue = queue.Queue(maxsize=2)
+        handler = _logger_module._BoundedQueueHandler(log_queue, _logger_module.OVERFLOW_DROP_OLDEST)
+
+        for message in ("first", "second", "third"):
+            handler.handle(self._make_record(logging.INFO, message))
+
+        assert handler.dropped == 1
+        assert [log_queue.get_nowait().msg for _ in range(2)] == ["second", "third"]
+
+    def test_overflow_drop_debug(self, _logger_module, mocker):
+
+        import queue
+
+        log_queue = queue.Queue(maxsize=1)
+        handler = _logger_module._BoundedQueueHandler(log_queue, _logger_module.OVERFLOW_DROP_DEBUG)
+
+        handler.handle(self._make_record(logging.DEBUG, "first"))
+        handler.handle(self._make_record(logging.DEBUG, "second"))
+
+        assert handler.dropped == 1
+        assert log_queue.get_nowait().msg == "first"
+
+        put_mock = mocker.patch.object(log_queue, "put")
+        handler.handle(self._make_record(logging.ERROR, "error"))
+
+        put_mock.assert_called_once()
+
+    def test_overflow_block(self, _logger_module, mocker):
+
+        import queue
+
+        log_queue = queue.Queue(maxsize=1)
+        handler = _logger_module._BoundedQueueHandler(log_queue, _logger_module.OVERFLOW_BLOCK)
+        put_mock = mocker.patch.object(log_queue, "put")
+
+        handler.handle(self._make_record(logging.DEBUG, "debug"))
+
+        put_mock.assert_called_once()
+        assert handler.dropped == 0
+
+    def test_reload_logback_reapplies_levels(self, tmp_path, _logger_module):
+        """
+        Tests that reloading logback updates levels of already created loggers,
+        including disabling them and enabling them back.
+        """
+
+        logback_path = tmp_path / "logback.json"
+        logback_path.write_text('{"com.app.reload": "INFO"}')
+
+        _logger_module.initialize_logging(str(tmp_path), str(logback_path))
+        logger = _logger_module.get_logger("com.app.reload")
+
+        assert logger.level == logging.INFO
+        assert logger.disabled is False
+
+        logback_path.write_text('{"com.app.reload": "OFF"}')
+        assert _logger_module.reload_logback() is True
+        assert logger.disabled is True
+
+        logback_path.write_text('{"com.app.reload": "DEBUG"}')
+        assert _logger_module.reload_logback() is True
+        assert logger.disabled is False
+        assert logger.level == logging.DEBUG
+
+        # Partially written file should keep current configuration.
+        logback_path.write_text('{"com.app.reload": ')
+        assert _logger_module.reload_logback() is False
+        assert logger.level == logging.DEBUG
+
+        # Unknown level should keep current configuration.
+        logback_path.write_text('{"com.app.reload": "VERBOSE"}')
+        assert _logger_module.reload_logback() is False
+        assert logger.level == logging.DEBUG
+
+        logback_path.unlink()
+        assert _logger_module.reload_logback() is False
+
+    def test_initialize_logging_applies_to_existing_loggers(self, tmp_path, _logger_module):
+
+        logback_path = tmp_path / "logback.json"
+        logback_path.write_text('{"com.app": "DEBUG"}')
+
+        logger = _logger_module.get_logger("com.app.early")
+        assert logger.level == logging.INFO
+
+        _logger_module.initialize_logging(str(tmp_path), str(logback_path))
+        assert logger.level == logging.DEBUG
+
+    def test_reload_logback_applies_sampling(self, tmp_path, _logger_module):
+
+        from kutil.log_sampling import SamplingFilter
+
+        logback_path = tmp_path / "logback.json"
+        logback_path.write_text('{"com.app": "DEBUG"}')
+
+        _logger_module.initialize_logging(str(tmp_path), str(logback_path))
+        logger = _logger_module.get_logger("com.app.sampled")
+
+        assert logger.filters == []
+
+        logback_path.write_text('{"com.app": "DEBUG", "SAMPLING": {"com.app": {"rate": 100}}}')
+        assert _logger_module.reload_logback() is True
+        assert logger.level == logging.DEBUG
+        assert isinstance(logger.filters[0], SamplingFilter)
+
+        logback_path.write_text('{"com.app": "DEBUG", "SAMPLING": {"com.app": {"rate": -1}}}')
+        assert _logger_module.reload_logback() is False
+
+        logback_path.write_text('{"com.app": "DEBUG"}')
+        assert _logger_module.reload_logback() is True
+        assert logger.filters == []
+
+    @pytest.mark.parametrize("use_queue", [False, True])
+    def test_shutdown_flushes_sampling_summary(self, tmp_path, _logger_module, use_queue):
+        """
+        Tests that records suppressed before the logger went
+        quiet are summarized when logging shuts down.
+        """
+
+        logback_path = tmp_path / "logback.json"
+        logback_path.write_text('{"com.app": "DEBUG", "SAMPLING": {"com.app": {"rate": 0.01, "burst": 2}}}')
+
+        _logger_module.initialize_logging(str(tmp_path), str(logback_path), use_queue=use_queue)
+        logger = _logger_module.get_logger("com.app.quiet")
+
+        try:
+            for index in range(10):
+                logger.warning("Record %d", index)
+
+            _logger_module.shutdown_logging()
+
+        finally:
+            logger.filters.clear()
+
+        with open(tmp_path / "my_service.log", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+
+        assert len(lines) == 3
+        assert "8 records suppressed by sampling" in lines[-1]
+
+    def test_reload_logback_not_initialized(self, _logger_module, read_file_mock):
+
+        assert _logger_module.reload_logback() is False
+        read_file_mock.assert_not_called()
+
+    def test_logback_watcher_poll(self, tmp_path, _logger_module, mocker):
+        """
+        Tests that watcher reloads logback only when file signature changes
+        and retries until reload succeeds.
+        """
+
+        import os
+
+        logback_path = tmp_path / "logback.json"
+        logback_path.write_text("{}")
+
+        _logger_module._logback_path = str(logback_path)
+        reload_mock = mocker.patch.object(_logger_module, "reload_logback", return_value=False)
+
+        watcher = _logger_module._LogbackWatcher(str(logback_path), 60)
+
+        watcher.poll()
+        reload_mock.assert_not_called()
+
+        logback_path.write_text('{"com.app": "DEBUG"}')
+        os.utime(logback_path, ns=(0, 1_000_000_000))
+
+        watcher.poll()
+        watcher.poll()
+        assert reload_mock.call_count == 2
+
+        reload_mock.return_value = True
+        watcher.poll()
+        watcher.poll()
+        assert reload_mock.call_count == 3
+
+        logback_path.unlink()
+        watcher.poll()
+        assert reload_mock.call_count == 3
+
+    def test_initialize_logging_starts_watcher(self, tmp_path, _logger_module):
+
+        logback_path = tmp_path / "logback.json"
+        logback_path.write_text("{}")
+
+        _logger_module.initialize_logging(str(tmp_path), str(logback_path), watch_interval=60)
+
+        watcher = _logger_module._logback_watcher
+        assert watcher is not None
+        assert watcher.is_alive()
+
+        _logger_module.shutdown_logging()
+
+        assert _logger_module._logback_watcher is None
+        assert not watcher.is_alive()
+
+    def test_watch_logback_not_initialized(self, _logger_module):
+
+        with pytest.raises(RuntimeError):
+            _logger_module.watch_logback()
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_formatter(self, _logger_module, module_patch, use_orjson):
+        """
+        Tests that JSON formatter writes standard fields, 'extra'
+        fields and exception, with and without orjson installed.
+        """
+
+        import json
+
+        if not use_orjson:
+            module_patch("orjson", None)
+
+        formatter = _logger_module.JsonFormatter("my_service")
+
+        try:
+            raise ValueError("boom")
+
+        except ValueError:
+            exc_info = sys.exc_info()
+
+        record = logging.LogRecord("com.app.json", logging.ERROR, __file__, 42, "Failed %s", ("job",), exc_info)
+        record.request_id = "abc"
+        record.payload = {1, 2}
+
+        entry = json.loads(formatter.format(record))
+
+        assert entry["level"] == "ERROR"
+        assert entry["service"] == "my_service"
+        assert entry["name"] == "com.app.json"
+        assert entry["lineno"] == 42
+        assert entry["message"] == "Failed job"
+        assert entry["request_id"] == "abc"
+        assert entry["payload"] == str({1, 2})
+        assert "ValueError: boom" in entry["exception"]
+        assert "T" in entry["timestamp"]
+        assert "args" not in entry
+
+    def test_initialize_logging_structured(self, tmp_path, _logger_module):
+
+        import json
+
+        _logger_module.initialize_logging(str(tmp_path), "missing_logback.json", use_queue=True, structured=True)
+
+        logging.getLogger("com.app.structured").warning("Hello %s", "world", extra={"user": "alice"})
+        _logger_module.shutdown_logging()
+
+        with open(tmp_path / "my_service.log", encoding="utf-8") as file:
+            entry = json.loads(file.readline())
+
+        assert entry["message"] == "Hello world"
+        assert entry["user"] == "alice"
+        assert entry["level"] == "WARNING"
+
+    @pytest.mark.parametrize("structured", [True, False])
+    def test_queue_exception(self, tmp_path, _logger_module, structured):
+        """
+        Tests that exception is written the same way in queue mode
+        as in synchronous one, separately from the message.
+        """
+
+        import json
+
+        contents = []
+
+        for use_queue in (False, True):
+            directory = tmp_path / ("queue" if use_queue else "sync")
+            directory.mkdir()
+
+            _logger_module.initialize_logging(str(directory), "missing_logback.json",
+                                              use_queue=use_queue, structured=structured)
+
+            try:
+                raise ValueError("broken")
+
+            except ValueError:
+                logging.getLogger("com.app.errors").exception("boom %d", 1)
+
+            _logger_module.shutdown_logging()
+            contents.append((directory / "my_service.log").read_text(encoding="utf-8"))
+
+        sync_content, queue_content = contents
+
+        if structured:
+            sync_entry, queue_entry = json.loads(sync_content), json.loads(queue_content)
+
+            assert queue_entry["message"] == "boom 1"
+            assert queue_entry["exception"].endswith("ValueError: broken")
+            assert queue_entry["exception"] == sync_entry["exception"]
+
+        else:
+            assert queue_content.count("ValueError: broken") == 1
+            assert queue_content.split(" - ", 1)[1] == sync_content.split(" - ", 1)[1]
+
+    def test_queue_handler_prepare(self, _logger_module):
+        """
+        Tests that records put to multiprocessing queue
+        carry formatted traceback instead of exception info.
+        """
+
+        import multiprocessing
+        import queue
+        import sys
+
+        try:
+            raise ValueError("broken")
+
+        except ValueError:
+            exc_info = sys.exc_info()
+
+        record = logging.LogRecord("com.app", logging.ERROR, "", 1, "boom %s %s", ([1], "x"), exc_info)
+
+        local_record = _logger_module._BoundedQueueHandler(queue.Queue(), "block").prepare(record)
+
+        assert local_record.msg == "boom [1] x"
+        assert local_record.args is None
+        assert local_record.exc_info is exc_info
+        assert record.args == ([1], "x")
+
+        shared_queue = multiprocessing.Queue()
+        shared_record = _logger_module._BoundedQueueHandler(shared_queue, "block").prepare(record)
+        shared_queue.close()
+
+        assert shared_record.exc_info is None
+        assert shared_record.exc_text.endswith("ValueError: broken")
+        assert shared_record.msg == "boom [1] x"
+        assert record.exc_info is exc_info
+
+    def test_initialize_logging_sized_rotation(self, tmp_path, _logger_module):
+
+        from kutil.log_rotation import SizedTimedRotatingFileHandler
+
+        _logger_module.initialize_logging(str(tmp_path), "missing_logback.json",
+                                          max_bytes=1024, max_total_bytes=4096, compress=True, backup_count=10)
+
+        handler = logging.getLogger().handlers[0]
+
+        assert isinstance(handler, SizedTimedRotatingFileHandler)
+        assert handler.max_bytes == 1024
+        assert handler.max_total_bytes == 4096
+        assert handler.compress is True
+        assert handler.backupCount == 10
+        assert handler.suffix == "%Y-%m-%d.log"
+
+        handler.close()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork start method.")
+    def test_initialize_logging_aggregate(self, tmp_path, _logger_module):
+        """
+        Tests that records of worker processes are written
+        to the file by aggregating process.
+        """
+
+        import multiprocessing
+
+        _logger_module.initialize_logging(str(tmp_path), "missing_logback.json", aggregate=True, queue_size=0)
+
+        log_queue = _logger_module.get_log_queue()
+        assert log_queue is not None
+
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_log_from_worker, args=(log_queue, index)) for index in range(3)]
+
+        for worker in workers:
+            worker.start()
+
+        logging.getLogger("com.app.parent").warning("Parent record")
+
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+
+        _logger_module.shutdown_logging()
+        assert _logger_module.get_log_queue() is None
+
+        with open(tmp_path / "my_service.log", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+
+        assert len(lines) == 151
+        assert sum("Parent record" in line for line in lines) == 1
+
+        for index in range(3):
+            assert sum(f"(com.app.worker{index}:" in line for line in lines) == 50
+
+    def test_initialize_worker_logging(self, tmp_path, _logger_module, mocker):
+
+        import queue
+        from logging.handlers import QueueHandler
+
+        logback_path = tmp_path / "logback.json"
+        logback_path.write_text('{"com.app": "DEBUG"}')
+
+        logger = _logger_module.get_logger("com.app.worker")
+        inherited_handler = mocker.MagicMock()
+        logging.getLogger().addHandler(inherited_handler)
+
+        _logger_module._queue_listener = mocker.MagicMock()
+        log_queue = queue.Queue()
+
+        _logger_module.initialize_worker_logging(log_queue, str(logback_path))
+
+        root_handlers = logging.getLogger().handlers
+
+        assert len(root_handlers) == 1
+        assert isinstance(root_handlers[0], QueueHandler)
+        assert root_handlers[0].queue is log_queue
+        inherited_handler.close.assert_called_once()
+
+        assert logger.level == logging.DEBUG
+        assert _logger_module._queue_listener is None
+        assert _logger_module._logback_path == str(logback_path)
+        assert _logger_module.get_logback_path() == str(logback_path)
+
+    def test_initialize_worker_logging_without_queue(self, _logger_module, mocker):
+
+        inherited_handler = mocker.MagicMock()
+        logging.getLogger().addHandler(inherited_handler)
+
+        _logger_module.initialize_worker_logging(None)
+
+        root_handlers = logging.getLogger().handlers
+
+        assert len(root_handlers) == 1
+        assert isinstance(root_handlers[0], logging.NullHandler)
+        inherited_handler.close.assert_called_once()
+
+    def test_get_log_queue_context(self, _logger_module, module_patch, mocker):
+        """
+        Tests that aggregation queue created in fork
+        context isn't returned for other start methods.
+        """
+
+        import multiprocessing
+
+        log_queue = mocker.MagicMock()
+        _logger_module._log_queue = log_queue
+        start_method = module_patch("multiprocessing.get_start_method", return_value="fork")
+
+        assert _logger_module.get_log_queue() is log_queue
+        assert _logger_module.get_log_queue(multiprocessing.get_context("fork")) is log_queue
+        assert _logger_module.get_log_queue(multiprocessing.get_context("spawn")) is None
+
+        start_method.return_value = "spawn"
+
+        assert _logger_module.get_log_queue(multiprocessing.get_context("fork")) is log_queue
+        assert _logger_module.get_log_queue(multiprocessing.get_context("spawn")) is log_queue
+
+    def test_worker_log_queue(self, _logger_module, mocker):
+        """
+        Tests that records sent to worker log queue
+        are handed to handlers of the root logger.
+        """
+
+        handler = mocker.MagicMock(level=logging.NOTSET)
+        logging.getLogger().addHandler(handler)
+
+        worker_log_queue = _logger_module.WorkerLogQueue(queue_size=5)
+        queue_handler = _logger_module._BoundedQueueHandler(worker_log_queue.queue, _logger_module.OVERFLOW_BLOCK)
+        worker_logger = logging.getLogger("com.app.worker")
+
+        for index in range(20):
+            queue_handler.handle(worker_logger.makeRecord(worker_logger.name, logging.WARN, "", 0,
+                                                          "Record %d", (index,), None))
+
+        worker_log_queue.close()
+        worker_log_queue.close()
+
+        assert [record.getMessage() for (record,), _ in handler.handle.call_args_list] == [
+            f"Record {index}" for index in range(20)
+        ]
+
+    def test_reset_after_fork(self, _logger_module, mocker):
+
+        _logger_module._queue_listener = mocker.MagicMock()
+        _logger_module._log_queue = mocker.MagicMock()
+        _logger_module._logback_watcher = mocker.MagicMock()
+
+        _logger_module._reset_after_fork()
+
+        assert _logger_module._queue_listener is None
+        assert _logger_module._log_queue is None
+        assert _logger_module._logback_watcher is None
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork start method.")
+    @pytest.mark.parametrize("instrument", [False, True])
+    def test_fork_in_queue_mode(self, tmp_path, _logger_module, instrument):
+        """
+        Tests that forked child doesn't use inherited queue nobody drains
+        (it would block once the queue is full) and its records are written.
+        """
+
+        import multiprocessing
+
+        _logger_module.initialize_logging(str(tmp_path), "missing_logback.json",
+                                          use_queue=True, queue_size=5, instrument=instrument)
+
+        context = multiprocessing.get_context("fork")
+        worker = context.Process(target=_log_from_forked_child)
+        worker.start()
+        worker.join(20)
+
+        assert worker.exitcode == 0
+
+        logging.getLogger("com.app.parent").warning("Parent record")
+        _logger_module.shutdown_logging()
+
+        with open(tmp_path / "my_service.log", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+
+        assert sum("(com.app.child:" in line for line in lines) == 50
+        assert sum("Parent record" in line for line in lines) == 1
+
+    def test_initialize_logging_instrumented(self, tmp_path, _logger_module):
+        """
+        Tests that instrumented logging collects statistics
+        and dumps them next to the log on shutdown.
+        """
+
+        import json
+        import kutil.log_stats as log_stats
+
+        log_stats.reset_stats()
+
+        try:
+            _logger_module.initialize_logging(str(tmp_path), "missing_logback.json",
+                                              use_queue=True, instrument=True, stats_dump_interval=60)
+
+            logging.getLogger("com.app.instrumented").warning("Message")
+            _logger_module.shutdown_logging()
+
+            stats = log_stats.get_stats("com.app.instrumented")
+
+            assert logging.getLogger().handlers == []
+            assert stats["emitted"] == {"WARNING": 1}
+            assert stats["bytes_written"] > len("Message")
+            assert stats["format_latency"]["count"] == 1
+
+            with open(tmp_path / "my_service.stats.json", encoding="utf-8") as file:
+                assert json.load(file)["com.app.instrumented"]["emitted"] == {"WARNING": 1}
+
+        finally:
+            log_stats.disable_stats()
+            log_stats.reset_stats()
+
+    def test_overflow_accounts_suppressed(self, _logger_module):
+
+        import queue
+        import kutil.log_stats as log_stats
+
+        log_stats.reset_stats()
+        log_stats.enable_stats()
+
+        try:
+            handler = _logger_module._BoundedQueueHandler(queue.Queue(maxsize=1), _logger_module.OVERFLOW_DROP_OLDEST)
+
+            handler.handle(self._make_record(logging.INFO, "first"))
+            handler.handle(self._make_record(logging.WARNING, "second"))
+
+            assert log_stats.get_stats("test")["suppressed"] == {"INFO": 1}
+
+        finally:
+            log_stats.disable_stats()
+            log_stats.reset_stats()
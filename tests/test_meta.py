@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from unittest.mock import MagicMock
 
@@ -17,9 +19,16 @@ class TestSingletonMeta:
 
         from kutil.meta import SingletonMeta
 
-        SingletonMeta._instances.clear()
+        from kutil.meta import reset
+
+        def clear():
+            reset()
+            SingletonMeta._proxies.clear()
+            SingletonMeta._eager_classes.clear()
+
+        clear()
         yield
-        SingletonMeta._instances.clear()
+        clear()
 
     def test_singleton_identity(self):
         """
@@ -96,3 +105,728 @@ class TestSingletonMeta:
         assert user1.name == "Alice"
         assert user2.name == "Alice"
         assert user1 is user2
+
+    def test_concurrent_first_access(self):
+        """
+        Tests that concurrent first calls build a single
+        instance and run post_init once.
+        """
+
+        import threading
+        import time
+
+        from kutil.meta import SingletonMeta
+
+        thread_count = 32
+        calls = {"init": 0, "post_init": 0}
+        barrier = threading.Barrier(thread_count)
+
+        class Registry(metaclass=SingletonMeta):
+            def __init__(self):
+                calls["init"] += 1
+                time.sleep(0.01)
+
+            def post_init(self):
+                calls["post_init"] += 1
+                time.sleep(0.01)
+                self.ready = True
+
+        instances = []
+
+        def access():
+            barrier.wait()
+            instance = Registry()
+            instances.append((instance, instance.ready))
+
+        threads = [threading.Thread(target=access) for _ in range(thread_count)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert calls == {"init": 1, "post_init": 1}
+        assert len({id(instance) for instance, _ in instances}) == 1
+        assert all(ready for _, ready in instances)
+
+    def test_reentrant_access_from_post_init(self):
+        """
+        Tests that instance being initialized is returned
+        when class is accessed from its own post_init.
+        """
+
+        from kutil.meta import SingletonMeta
+
+        class Manager(metaclass=SingletonMeta):
+            def post_init(self):
+                self.same = Manager() is self
+
+        manager = Manager()
+
+        assert manager.same is True
+        assert Manager() is manager
+
+    def test_failed_post_init_is_not_published(self):
+        """
+        Tests that instance isn't registered when post_init fails,
+        so the next call tries to create it again.
+        """
+
+        from kutil.meta import SingletonMeta
+
+        attempts = []
+
+        class Flaky(metaclass=SingletonMeta):
+            def post_init(self):
+                attempts.append(self)
+
+                if len(attempts) == 1:
+                    raise RuntimeError("Not ready.")
+
+        with pytest.raises(RuntimeError):
+            Flaky()
+
+        instance = Flaky()
+
+        assert len(attempts) == 2
+        assert Flaky() is instance is attempts[1]
+
+    def test_lazy_proxy(self):
+        """
+        Tests that lazy class returns proxy right away
+        and is created on first attribute access.
+        """
+
+        from kutil.meta import SingletonMeta, SingletonProxy, is_initialized
+
+        created = []
+
+        class Index(metaclass=SingletonMeta, lazy=True):
+            def __init__(self, path):
+                created.append(path)
+                self.path = path
+
+            def post_init(self):
+                self.loaded = True
+
+            def lookup(self, key):
+                return f"{self.path}:{key}"
+
+        proxy = Index("index.db")
+
+        assert type(proxy) is SingletonProxy
+        assert isinstance(proxy, Index)
+        assert Index("other.db") is proxy
+        assert repr(proxy) == "<lazy Index proxy>"
+        assert created == []
+        assert is_initialized(Index) is False
+
+        assert proxy.lookup("key") == "index.db:key"
+        assert created == ["index.db"]
+        assert is_initialized(Index) is True
+
+        instance = Index()
+
+        assert type(instance) is Index
+        assert proxy.resolve() is instance
+        assert instance.loaded is True
+
+        proxy.extra = 1
+        assert instance.extra == 1
+        del proxy.extra
+        assert not hasattr(instance, "extra")
+        assert "lookup" in dir(proxy)
+        assert repr(proxy) == repr(instance)
+
+    def test_lazy_is_inherited(self):
+
+        from kutil.meta import SingletonMeta, SingletonProxy
+
+        class Base(metaclass=SingletonMeta, lazy=True):
+            def post_init(self): pass
+
+        class Child(Base):
+            pass
+
+        class Eager(Base, lazy=False):
+            pass
+
+        assert type(Child()) is SingletonProxy
+        assert type(Eager()) is Eager
+
+    def test_call_paths(self):
+        """
+        Tests that only process scoped, not lazy classes take
+        the plain path and that each scoped class has own storage.
+        """
+
+        from kutil.meta import SingletonMeta, SingletonProxy, SCOPE_THREAD
+
+        class Plain(metaclass=SingletonMeta):
+            def post_init(self): pass
+
+        class Lazy(metaclass=SingletonMeta, lazy=True):
+            def post_init(self): pass
+
+        class Resolved(Lazy, lazy=False):
+            pass
+
+        class Session(metaclass=SingletonMeta, scope=SCOPE_THREAD):
+            def post_init(self): pass
+
+        class ChildSession(Session):
+            pass
+
+        assert Plain._singleton_plain is True
+        assert Resolved._singleton_plain is True
+        assert Lazy._singleton_plain is False
+        assert Session._singleton_plain is False
+        assert Plain._singleton_scope_holder is None
+        assert ChildSession._singleton_scope_holder is SingletonMeta._scopes[ChildSession]
+        assert ChildSession._singleton_scope_holder is not Session._singleton_scope_holder
+
+        proxy = Lazy()
+
+        assert type(proxy) is SingletonProxy
+        assert Lazy() is proxy
+
+        instance = proxy.resolve()
+
+        assert Lazy() is instance
+        assert Session() is Session()
+        assert ChildSession() is not Session()
+
+    def test_warm_up(self):
+        """
+        Tests that eager classes are created in background
+        and readiness can be awaited.
+        """
+
+        import threading
+
+        from kutil.meta import SingletonMeta, is_initialized, warm_up, wait_until_ready
+
+        release = threading.Event()
+        threads = []
+
+        class Pool(metaclass=SingletonMeta, eager=True):
+            def post_init(self):
+                threads.append(threading.current_thread().name)
+                release.wait(5)
+
+        class Cache(metaclass=SingletonMeta, eager=True):
+            def post_init(self): pass
+
+        class Unrelated(metaclass=SingletonMeta):
+            def post_init(self): pass
+
+        futures = warm_up()
+
+        assert set(futures) == {Pool, Cache}
+        assert wait_until_ready(Pool, timeout=0.01) is False
+
+        release.set()
+
+        assert wait_until_ready(timeout=5) is True
+        assert futures[Pool].result() is Pool()
+        assert threads[0].startswith("kutil-warm-up")
+        assert is_initialized(Unrelated) is False
+
+        # Already warmed up classes aren't created again.
+        assert warm_up(Pool)[Pool] is futures[Pool]
+
+    def test_warm_up_failure(self):
+
+        from kutil.meta import SingletonMeta, is_initialized, warm_up, wait_until_ready
+
+        attempts = []
+
+        class Broken(metaclass=SingletonMeta):
+            def post_init(self):
+                attempts.append(self)
+
+                if len(attempts) == 1:
+                    raise RuntimeError("Pool unavailable.")
+
+        warm_up(Broken)
+
+        with pytest.raises(RuntimeError):
+            wait_until_ready(Broken, timeout=5)
+
+        assert is_initialized(Broken) is False
+
+        instance = Broken()
+
+        assert warm_up(Broken)[Broken].result() is instance
+        assert wait_until_ready(Broken) is True
+
+    def test_invalid_options(self):
+
+        from kutil.meta import SingletonMeta, SCOPE_THREAD, FORK_REINIT
+
+        with pytest.raises(ValueError):
+            class UnknownPolicy(metaclass=SingletonMeta, fork_policy="restart"):
+                pass
+
+        with pytest.raises(ValueError):
+            class UnknownScope(metaclass=SingletonMeta, scope="request"):
+                pass
+
+        with pytest.raises(ValueError):
+            class NoPostFork(metaclass=SingletonMeta, fork_policy=FORK_REINIT):
+                pass
+
+        with pytest.raises(ValueError):
+            class EagerThread(metaclass=SingletonMeta, scope=SCOPE_THREAD, eager=True):
+                pass
+
+    def test_reset(self):
+
+        from kutil.meta import SingletonMeta, reset, is_initialized
+
+        class First(metaclass=SingletonMeta):
+            def post_init(self): pass
+
+        class Second(metaclass=SingletonMeta):
+            def post_init(self): pass
+
+        first = First()
+        second = Second()
+
+        reset(First)
+
+        assert is_initialized(First) is False
+        assert First() is not first
+        assert Second() is second
+
+        reset()
+
+        assert is_initialized(Second) is False
+
+    def test_reset_after_fork(self):
+        """
+        Tests that fork policies are applied and locks are replaced.
+        """
+
+        from kutil.meta import SingletonMeta, FORK_RESET, FORK_REINIT, _reset_after_fork
+
+        class Kept(metaclass=SingletonMeta):
+            def post_init(self): pass
+
+        class Dropped(metaclass=SingletonMeta, fork_policy=FORK_RESET):
+            def post_init(self): pass
+
+        class Reinitialized(metaclass=SingletonMeta, fork_policy=FORK_REINIT):
+            def post_init(self):
+                self.forks = 0
+
+            def post_fork(self):
+                self.forks += 1
+
+        class Broken(Reinitialized):
+            def post_fork(self):
+                raise OSError("Socket is gone.")
+
+        kept, dropped, reinitialized, broken = Kept(), Dropped(), Reinitialized(), Broken()
+        locks = SingletonMeta._locks
+
+        _reset_after_fork()
+
+        assert SingletonMeta._locks is not locks
+        assert Kept() is kept
+        assert Dropped() is not dropped
+        assert Reinitialized() is reinitialized
+        assert reinitialized.forks == 1
+        assert Broken() is not broken
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork.")
+    def test_fork(self):
+
+        from kutil.meta import SingletonMeta, FORK_RESET
+
+        class Connection(metaclass=SingletonMeta, fork_policy=FORK_RESET):
+            def post_init(self):
+                self.pid = os.getpid()
+
+        parent_connection = Connection()
+        pid = os.fork()
+
+        if pid == 0:  # pragma: no cover
+            connection = Connection()
+            os._exit(0 if connection is not parent_connection and connection.pid == os.getpid() else 1)
+
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert Connection() is parent_connection
+
+    def test_thread_scope(self):
+        """
+        Tests that each thread gets its own instance,
+        also through a lazy proxy.
+        """
+
+        import threading
+
+        from kutil.meta import SingletonMeta, SCOPE_THREAD, is_initialized, reset
+
+        class Session(metaclass=SingletonMeta, scope=SCOPE_THREAD):
+            def post_init(self):
+                self.owner = threading.current_thread().name
+                self.same = Session() is self
+
+        class LazySession(Session, lazy=True):
+            pass
+
+        main_session = Session()
+        proxy = LazySession()
+        results = {}
+
+        def use():
+            name = threading.current_thread().name
+            results[name] = (Session(), Session(), proxy.owner)
+
+        threads = [threading.Thread(target=use, name=f"worker-{index}") for index in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert main_session.same is True
+        assert Session() is main_session
+        assert proxy.owner == threading.current_thread().name
+
+        for name, (first, second, proxy_owner) in results.items():
+            assert first is second
+            assert first is not main_session
+            assert first.owner == proxy_owner == name
+
+        reset(Session)
+
+        assert is_initialized(Session) is False
+        assert Session() is not main_session
+
+    def test_context_scope(self):
+
+        import asyncio
+
+        from kutil.meta import SingletonMeta, SCOPE_CONTEXT, is_initialized
+
+        class RequestState(metaclass=SingletonMeta, scope=SCOPE_CONTEXT):
+            def post_init(self):
+                self.items = []
+
+        async def handle(item):
+            state = RequestState()
+            state.items.append(item)
+            await asyncio.sleep(0)
+
+            return RequestState() is state, list(RequestState().items)
+
+        async def main():
+            return await asyncio.gather(*(handle(item) for item in range(3)))
+
+        results = asyncio.run(main())
+
+        assert results == [(True, [0]), (True, [1]), (True, [2])]
+        assert is_initialized(RequestState) is False
+
+    def test_scoped_post_init_failure(self):
+
+        from kutil.meta import SingletonMeta, SCOPE_THREAD, is_initialized
+
+        class Failing(metaclass=SingletonMeta, scope=SCOPE_THREAD):
+            def post_init(self):
+                raise RuntimeError("Failed.")
+
+        with pytest.raises(RuntimeError):
+            Failing()
+
+        assert is_initialized(Failing) is False
+
+    def test_reset_scoped_after_fork(self):
+
+        import threading
+
+        from kutil.meta import SingletonMeta, SCOPE_THREAD, FORK_RESET, FORK_REINIT, _reset_after_fork
+
+        class Dropped(metaclass=SingletonMeta, scope=SCOPE_THREAD, fork_policy=FORK_RESET):
+            def post_init(self): pass
+
+        class Reinitialized(metaclass=SingletonMeta, scope=SCOPE_THREAD, fork_policy=FORK_REINIT):
+            def post_init(self): pass
+
+            def post_fork(self):
+                self.thread = threading.current_thread().name
+
+        class Broken(metaclass=SingletonMeta, scope=SCOPE_THREAD, fork_policy=FORK_REINIT):
+            def post_init(self): pass
+
+            def post_fork(self):
+                raise OSError("Socket is gone.")
+
+        dropped, reinitialized, broken = Dropped(), Reinitialized(), Broken()
+
+        _reset_after_fork()
+
+        assert Dropped() is not dropped
+        assert Reinitialized() is reinitialized
+        assert reinitialized.thread == threading.current_thread().name
+        assert Broken() is not broken
+
+    def test_scoped_class_warm_up(self):
+
+        from kutil.meta import SingletonMeta, SCOPE_CONTEXT, warm_up
+
+        class Scoped(metaclass=SingletonMeta, scope=SCOPE_CONTEXT):
+            def post_init(self): pass
+
+        with pytest.raises(ValueError):
+            warm_up(Scoped)
+
+
+class TestObjectPool:
+
+    def test_reuse_and_reset(self):
+
+        from kutil.meta import ObjectPool
+
+        created = []
+        pool = ObjectPool(lambda: created.append(object()) or {"items": [], "id": len(created)},
+                          max_size=2, reset=lambda instance: instance["items"].clear())
+
+        with pool.acquire() as first:
+            first["items"].append(1)
+
+        with pool.acquire() as second:
+            assert second is first
+            assert second["items"] == []
+
+            with pool.acquire() as third:
+                assert third is not first
+
+        assert len(created) == 2
+        assert (pool.size, pool.idle) == (2, 2)
+
+    def test_bounds(self):
+        """
+        Tests that acquire waits for returned object once
+        pool is full and times out if none is returned.
+        """
+
+        import threading
+
+        from kutil.meta import ObjectPool
+
+        with pytest.raises(ValueError):
+            ObjectPool(object, min_size=3, max_size=2)
+
+        with pytest.raises(ValueError):
+            ObjectPool(object, max_size=0)
+
+        pool = ObjectPool(object, min_size=1, max_size=1)
+        assert (pool.size, pool.idle) == (1, 1)
+
+        instance = pool.get()
+
+        with pytest.raises(TimeoutError):
+            pool.get(timeout=0.01)
+
+        threading.Timer(0.05, pool.put, args=(instance,)).start()
+
+        assert pool.get(timeout=5) is instance
+
+    def test_idle_eviction(self, mocker):
+
+        from kutil.meta import ObjectPool
+
+        now = mocker.patch("kutil.meta.time.monotonic", return_value=100.0)
+        disposed = []
+
+        pool = ObjectPool(object, min_size=1, max_size=4, idle_timeout=10, dispose=disposed.append)
+        instances = [pool.get() for _ in range(3)]
+
+        for instance in instances:
+            pool.put(instance)
+
+        assert (pool.size, pool.idle) == (3, 3)
+
+        now.return_value = 105.0
+        pool.evict_idle()
+        assert pool.size == 3
+
+        now.return_value = 120.0
+        pool.evict_idle()
+
+        # Oldest idle objects are evicted first, min_size is kept.
+        assert (pool.size, pool.idle) == (1, 1)
+        assert len(disposed) == 2
+        assert pool.get() is instances[-1]
+
+    def test_failures(self):
+        """
+        Tests that failed creation or reset frees the place in the pool.
+        """
+
+        from kutil.meta import ObjectPool
+
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+
+            if len(attempts) == 1:
+                raise OSError("Can't allocate.")
+
+            return {}
+
+        def reset(instance):
+            if instance.get("broken"):
+                raise ValueError("Can't reset.")
+
+        disposed = []
+        pool = ObjectPool(factory, max_size=1, reset=reset, dispose=disposed.append)
+
+        with pytest.raises(OSError):
+            pool.get()
+
+        assert pool.size == 0
+
+        with pytest.raises(ValueError):
+            with pool.acquire() as instance:
+                instance["broken"] = True
+
+        assert pool.size == 0
+        assert disposed == [{"broken": True}]
+        assert pool.get(timeout=0) == {}
+
+    def test_reset_failure_keeps_error(self, caplog):
+        """
+        Tests that failed reset doesn't replace error raised in with block.
+        """
+
+        from kutil.meta import ObjectPool
+
+        def reset(instance):
+            raise ValueError("Can't reset.")
+
+        pool = ObjectPool(dict, max_size=1, reset=reset)
+
+        with pytest.raises(KeyError):
+            with pool.acquire() as instance:
+                raise KeyError("body")
+
+        assert "Failed to return" in caplog.text
+        assert "Can't reset." in caplog.text
+        assert pool.size == 0
+
+        # Without error in with block, reset failure propagates.
+        with pytest.raises(ValueError):
+            with pool.acquire():
+                pass
+
+    def test_invalid_put(self):
+        """
+        Tests that returning object twice or one the pool
+        didn't hand out is rejected.
+        """
+
+        from kutil.meta import ObjectPool
+
+        pool = ObjectPool(list, max_size=2)
+        other_pool = ObjectPool(list, max_size=2)
+        instance = pool.get()
+        pool.put(instance)
+
+        with pytest.raises(ValueError):
+            pool.put(instance)
+
+        with pytest.raises(ValueError):
+            pool.put([])
+
+        with pytest.raises(ValueError):
+            other_pool.put(pool.get())
+
+        assert (pool.size, pool.idle) == (1, 0)
+        assert (other_pool.size, other_pool.idle) == (0, 0)
+
+    def test_close(self):
+
+        from kutil.meta import ObjectPool
+
+        disposed = []
+        pool = ObjectPool(list, min_size=2, dispose=disposed.append)
+        instance = pool.get()
+
+        pool.close()
+
+        assert len(disposed) == 1
+
+        pool.put(instance)
+
+        assert len(disposed) == 2
+        assert pool.size == 0
+
+        with pytest.raises(RuntimeError):
+            pool.get()
+
+
+class TestPooledMeta:
+
+    @pytest.fixture(autouse=True)
+    def _setup(self):
+
+        from kutil.meta import PooledMeta
+
+        PooledMeta._pools.clear()
+        yield
+        PooledMeta._pools.clear()
+
+    def test_pooled_class(self):
+
+        from kutil.meta import PooledMeta
+
+        class Parser(metaclass=PooledMeta, min_size=1, max_size=2, idle_timeout=60):
+            def post_init(self):
+                self.buffer = []
+
+            def reset(self):
+                self.buffer.clear()
+
+        class StrictParser(Parser, max_size=1):
+            pass
+
+        pool = Parser.pool()
+
+        assert pool is Parser.pool()
+        assert (pool.min_size, pool.max_size, pool.idle_timeout) == (1, 2, 60)
+        assert (StrictParser.pool().min_size, StrictParser.pool().max_size) == (1, 1)
+
+        with Parser.acquire() as parser:
+            assert isinstance(parser, Parser)
+            parser.buffer.append("data")
+
+        with Parser.acquire() as same_parser:
+            assert same_parser is parser
+            assert same_parser.buffer == []
+
+        assert Parser() is not parser
+
+        with pytest.raises(ValueError):
+            class Invalid(metaclass=PooledMeta, min_size=2, max_size=1):
+                pass
+
+    def test_pools_dropped_after_fork(self):
+
+        from kutil.meta import PooledMeta, _reset_after_fork
+
+        class Buffer(metaclass=PooledMeta):
+            def post_init(self): pass
+
+        pool = Buffer.pool()
+        _reset_after_fork()
+
+        assert Buffer.pool() is not pool
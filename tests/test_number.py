@@ -1,3 +1,22 @@
+import math
+
+import pytest
+
+
+def _reference_is_float(string: str):
+    """
+    Original exception based implementation of is_float.
+    """
+
+    if "." not in string:
+        return False
+
+    try:
+        float(string)
+        return True
+
+    except ValueError:
+        return False
 
 
 class TestNumberUtil:
@@ -11,3 +30,77 @@ class TestNumberUtil:
         assert is_float("123") is False
         assert is_float("123.0") is True
         assert is_float("123.") is True
+
+    @pytest.mark.parametrize("string", [
+        "1_0.5", "1_.5", "1._5", "1.5_0", "1.5e1_0", "1.5e_1", "_1.5", "1.5_", "1__0.5", "1.e5", ".e5",
+        "+.5", "-.5e-3", "1.5E+3", "+-1.5", "1.5e", ".", "-.", " 1.5 ", "\t1.5\n", "1 .5", "1.5e999",
+        "\x1c1.5", "١.٥", " 1.5\xa0", "1.5 ", "².5", "nan.", "inf.", "1,5", "1.2.3", "",
+    ])
+    def test_is_float_edge_cases(self, string):
+
+        from kutil.number import is_float
+
+        assert is_float(string) is _reference_is_float(string)
+
+    def test_is_float_random(self):
+        """
+        Tests that scanner agrees with float() on random strings
+        built of characters float() cares about.
+        """
+
+        import random
+
+        from kutil.number import is_float
+
+        generator = random.Random(41)
+        alphabet = "0123456789._+-eE \t\x1c١a"
+
+        for _ in range(20_000):
+            string = "".join(generator.choice(alphabet) for _ in range(generator.randint(1, 8)))
+            assert is_float(string) is _reference_is_float(string), repr(string)
+
+    def test_parse_floats(self):
+
+        from kutil.number import parse_floats
+
+        values, mask = parse_floats(["1.5", "abc", "123", " -2.5e1 ", "١.٥", "1.2.3"])
+
+        assert mask == [True, False, False, True, True, False]
+        assert [value for value, valid in zip(values, mask) if valid] == [1.5, -25.0, 1.5]
+        assert all(math.isnan(value) for value, valid in zip(values, mask) if not valid)
+
+        assert parse_floats(iter([])) == ([], [])
+
+    def test_parse_floats_numpy(self):
+
+        numpy = pytest.importorskip("numpy")
+
+        from kutil.number import parse_floats
+
+        values, mask = parse_floats(["1.5", "x", "2."], as_numpy=True)
+
+        assert values.dtype == numpy.float64
+        assert mask.tolist() == [True, False, True]
+        assert values[mask].tolist() == [1.5, 2.0]
+
+    def test_parse_floats_without_numpy(self, mocker):
+
+        import sys
+
+        from kutil.number import parse_floats
+
+        mocker.patch.dict(sys.modules, {"numpy": None})
+
+        with pytest.raises(ImportError):
+            parse_floats(["1.5"], as_numpy=True)
+
+    @pytest.mark.parametrize("string, expected", [
+        ("123", True), ("-5", True), ("+0", True), (" 12 ", True), ("1_000", True), ("١٢", True),
+        ("12.0", False), ("", False), ("+", False), ("--1", False), ("1 2", False), ("_1", False),
+        ("12_", False), ("²", False), ("abc", False),
+    ])
+    def test_is_int(self, string, expected):
+
+        from kutil.number import is_int
+
+        assert is_int(string) is expected
@@ -8,6 +8,174 @@ import pytest
 CURRENT_REAL_EXE = os.path.realpath(sys.executable)
 
 
+def _square(value: int):
+    """
+    Task of process runner tests.
+    """
+    return value * value
+
+
+def _get_warm_up_pid():
+    """
+    Task of process runner tests, returns pid
+    warm-up hook of the worker was called in.
+    """
+    return _WarmUp.pid
+
+
+def _log_records(count: int):
+    """
+    Task of process runner tests, logs provided amount of records.
+    """
+
+    import logging
+
+    for index in range(count):
+        logging.getLogger("com.app.worker").warning("Record %d", index)
+
+    return count
+
+
+def _get_root_handlers():
+    """
+    Task of process runner tests, returns base
+    classes of handlers of the root logger.
+    """
+
+    import logging
+    from logging.handlers import QueueHandler
+
+    return [
+        "QueueHandler" if isinstance(handler, QueueHandler) else type(handler).__name__
+        for handler in logging.getLogger().handlers
+    ]
+
+
+class _WarmUp:
+    """
+    Warm-up hook of process runner tests.
+    """
+
+    pid = None
+
+    def __init__(self):
+        _WarmUp.pid = os.getpid()
+
+
+@pytest.fixture(autouse=True)
+def _psutil_backend():
+    """
+    Tests in this module mock psutil, so psutil backend is used
+    even where /proc is available. Proc backend is tested in test_procfs.
+    """
+
+    from kutil.process import get_process_backend, set_process_backend, PSUTIL_BACKEND
+
+    backend = get_process_backend()
+    set_process_backend(PSUTIL_BACKEND)
+    yield
+    set_process_backend(backend)
+
+
+@pytest.fixture
+def _logging(monkeypatch):
+    """
+    Restores global state of kutil.logger and
+    handlers of the root logger after the test.
+    """
+
+    import logging
+    import kutil.logger as module
+
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+
+    monkeypatch.setattr(module, "_log_file_name", "my_service")
+    monkeypatch.setattr(module, "_logback", {})
+    monkeypatch.setattr(module, "_logback_path", None)
+    monkeypatch.setattr(module, "_loggers", {})
+
+    yield module
+
+    module.shutdown_logging()
+
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+
+    for handler in handlers:
+        root_logger.addHandler(handler)
+
+
+@pytest.fixture
+def _process_table():
+    """
+    Resets shared ProcessTable around the test.
+    """
+
+    from kutil.meta import reset
+    from kutil.process import ProcessTable
+
+    ttl = ProcessTable._configured_ttl
+    reset(ProcessTable)
+    yield
+    reset(ProcessTable)
+    ProcessTable._configured_ttl = ttl
+
+
+@pytest.fixture
+def _system(_process_table, module_patch):
+    """
+    Simulated system process table, pid to (name, exe).
+    Returns the table and mock of psutil.Process.
+    """
+
+    table = {}
+    process_class = psutil.Process
+
+    def create_process(pid):
+        if pid not in table:
+            raise psutil.NoSuchProcess(pid)
+
+        name, exe = table[pid]
+        process = mock.Mock(spec=process_class)
+        process.pid = pid
+
+        if exe == "denied":
+            process.as_dict.return_value = {"pid": pid, "name": name, "exe": None, "create_time": None}
+            process.create_time.side_effect = psutil.AccessDenied(pid)
+
+        else:
+            process.as_dict.return_value = {"pid": pid, "name": name, "exe": exe, "create_time": float(pid)}
+            process.create_time.return_value = float(pid)
+
+        return process
+
+    module_patch("psutil.pids", side_effect=lambda: list(table))
+    process_mock = module_patch("psutil.Process", side_effect=create_process)
+
+    return table, process_mock
+
+
+def _reused(create_process, table: dict, reused_pid: int, create_time: float):
+    """
+    Wraps process factory of _system, so that
+    the pid reports a different create time.
+    """
+
+    def reused_process(pid):
+        process = create_process(pid)
+
+        if pid == reused_pid:
+            name, exe = table[pid]
+            process.as_dict.return_value = {"pid": pid, "name": name, "exe": exe, "create_time": create_time}
+            process.create_time.return_value = create_time
+
+        return process
+
+    return reused_process
+
+
 class TestProcess:
 
     @staticmethod
@@ -20,6 +188,7 @@ class TestProcess:
         mock_proc.pid = pid
         mock_proc.name.return_value = name
         mock_proc.exe.return_value = str(exe_path)
+        mock_proc.info = {"name": name, "pid": pid, "exe": str(exe_path)}
 
         return mock_proc
 
@@ -69,14 +238,14 @@ class TestProcess:
 
         running = get_running_processes(requested_names)
 
-        # Use standard pytest 'assert' for verification
-        assert len(running) == 2
-        found_names = sorted([p.name() for p in running])
-        assert found_names == sorted(requested_names)
+        assert running == {"chrome.exe": [mock_proc_1], "spotify.exe": [mock_proc_2]}
 
-        # Assertions on the mock object remain the same
         _process_iter.assert_called_once_with(['name'])
 
+        # Names are taken from prefetched info, not queried again.
+        mock_proc_1.name.assert_not_called()
+        mock_proc_2.name.assert_not_called()
+
 
     def test_only_some_processes_found(self, _process_iter):
         """
@@ -98,70 +267,50 @@ class TestProcess:
 
         running = get_running_processes(requested_names)
 
-        assert len(running) == 1
-        assert running[0].name() == "vlc.exe"
+        assert running == {"vlc.exe": [mock_proc_vlc]}
 
 
-    def test_stop_early_optimization(self, _process_iter):
+    def test_duplicate_instances_found(self, _process_iter):
         """
-        Tests the optimization where the loop breaks once all requested processes are found.
-        This is verified by ensuring subsequent mock processes are not accessed.
+        Tests that scan doesn't stop once as many processes as names
+        were requested are found, so every instance is returned.
         """
 
         from kutil.process import get_running_processes
 
-        requested_names = ["a.exe", "b.exe"]
-
-        mock_proc_a = self.create_mock_process("a.exe")
-        mock_proc_b = self.create_mock_process("b.exe")
-        mock_proc_c = self.create_mock_process("c.exe")  # Should not be checked
-
-        # a.exe and b.exe are found first, followed by c.exe
-        all_mock_processes = [mock_proc_a, mock_proc_b, mock_proc_c]
-        _process_iter.return_value = all_mock_processes
+        worker_1 = self.create_mock_process("worker.exe", pid=1)
+        worker_2 = self.create_mock_process("worker.exe", pid=2)
+        server = self.create_mock_process("server.exe", pid=3)
 
-        # We need to reset the call counts on the process that follows the break point
-        mock_proc_c.name.reset_mock()
+        _process_iter.return_value = [worker_1, worker_2, self.create_mock_process("other.exe"), server]
 
-        get_running_processes(requested_names)
+        running = get_running_processes(("worker.exe", "server.exe"))
 
-        # Assert that name() was called on the found processes
-        mock_proc_a.name.assert_called_once()
-        mock_proc_b.name.assert_called_once()
+        assert running == {"worker.exe": [worker_1, worker_2], "server.exe": [server]}
 
-        # Assert that name() was NOT called on the subsequent process (c.exe)
-        # because the loop should have broken after finding the second process.
-        mock_proc_c.name.assert_not_called()
 
-
-    def test_handle_no_such_process(self, _process_iter):
+    def test_prefetch_attributes(self, _process_iter):
         """
-        Tests that NoSuchProcess exception is caught and the process is safely ignored.
+        Tests that additional attributes are prefetched along with name.
         """
 
         from kutil.process import get_running_processes
 
-        requested_names = ["good.exe", "bad.exe"]
-        mock_proc_good = self.create_mock_process("good.exe", pid=101)
-
-        # Mock a process that raises NoSuchProcess when .name() is called
-        mock_proc_error = mock.Mock(spec=psutil.Process)
-        mock_proc_error.name.side_effect = psutil.NoSuchProcess(1000, "proc disappeared")
+        _process_iter.return_value = [self.create_mock_process("app.exe", pid=10, exe_path="/opt/app.exe")]
 
-        _process_iter.return_value = [
-            mock_proc_error,  # This one raises an exception and should be ignored
-            mock_proc_good  # This one should be found successfully
-        ]
+        running = get_running_processes({"app.exe"}, attrs=["exe", "create_time"])
 
-        running = get_running_processes(requested_names)
+        _process_iter.assert_called_once_with(["exe", "create_time", "name"])
+        assert running["app.exe"][0].info["exe"] == "/opt/app.exe"
 
-        assert len(running) == 1
-        assert running[0].name() == "good.exe"
+        get_running_processes({"app.exe"}, attrs=("name", "pid"))
+        _process_iter.assert_called_with(["name", "pid"])
 
 
-    def test_handle_access_denied(self, _process_iter):
+    def test_inaccessible_process(self, _process_iter):
         """
-        Tests that AccessDenied exception is caught and the process is safely ignored.
+        Tests that process which name couldn't be prefetched
+        (psutil sets it to None on AccessDenied) is ignored.
         """
 
         from kutil.process import get_running_processes
@@ -169,20 +318,14 @@ class TestProcess:
         requested_names = ["safe.exe", "denied.exe"]
 
         mock_proc_safe = self.create_mock_process("safe.exe", pid=201)
+        mock_proc_denied = self.create_mock_process("denied.exe", pid=202)
+        mock_proc_denied.info["name"] = None
 
-        # Mock a process that raises AccessDenied when .name() is called
-        mock_proc_error = mock.Mock(spec=psutil.Process)
-        mock_proc_error.name.side_effect = psutil.AccessDenied(2000, "permission denied")
-
-        _process_iter.return_value = [
-            mock_proc_error,  # This one raises an exception and should be ignored
-            mock_proc_safe  # This one should be found successfully
-        ]
+        _process_iter.return_value = [mock_proc_denied, mock_proc_safe]
 
         running = get_running_processes(requested_names)
 
-        assert len(running) == 1
-        assert running[0].name() == "safe.exe"
+        assert running == {"safe.exe": [mock_proc_safe]}
 
 
     def test_empty_input_list(self, _process_iter):
@@ -192,21 +335,11 @@ class TestProcess:
 
         from kutil.process import get_running_processes
 
-        # Configure the iterator with a large list to ensure it doesn't get fully consumed
-        _process_iter.return_value = [
-            self.create_mock_process("a.exe"),
-            self.create_mock_process("b.exe")
-        ]
-
         running = get_running_processes([])
 
-        # When processes=[] (length 0), the loop should break immediately because
-        # len(running_processes) (0) == len(processes) (0).
-        assert running == []
-
-        # The iterator is still technically called, but the inner logic (process.name())
-        # should not be called if the optimization works.
-        _process_iter.return_value[0].name.assert_not_called()
+        # Nothing to look for, process list isn't scanned at all.
+        assert running == {}
+        _process_iter.assert_not_called()
 
 
     def test_matching_process_is_running(self, _system_env, _process_iter):
@@ -329,3 +462,833 @@ class TestProcess:
 
         # These should be filtered out by the 'if process_exe != current_exe_path' check.
         assert is_process_already_running(process_name) is False
+
+
+class TestProcessTable:
+
+    def test_incremental_refresh(self, _system):
+        """
+        Tests that only new pids are resolved on refresh, surviving
+        ones are only checked for reuse and vanished ones are removed.
+        """
+
+        from kutil.process import ProcessTable
+
+        table, process_mock = _system
+        table.update({1: ("init", "/sbin/init"), 2: ("app", "/opt/app"), 3: ("app", "denied")})
+
+        process_table = ProcessTable(ttl=60)
+        processes = process_table.get_processes()
+
+        assert sorted(processes) == [1, 2, 3]
+        assert processes[2].name == "app"
+        assert processes[2].exe == "/opt/app"
+        assert processes[2].create_time == 2.0
+        assert processes[3].exe is None
+        assert processes[2].to_process().info["exe"] == "/opt/app"
+        assert process_mock.call_count == 4
+
+        del table[1]
+        table[4] = ("worker", "/opt/worker")
+        process_table.refresh()
+
+        refreshed = process_table.get_processes()
+
+        assert sorted(refreshed) == [2, 3, 4]
+        assert refreshed[2] is processes[2]
+        assert refreshed[3] is processes[3]
+
+        # Create time of 2 and 3 is checked, 4 is resolved.
+        assert process_mock.call_count == 7
+
+        # Previous snapshot isn't modified.
+        assert sorted(processes) == [1, 2, 3]
+
+    def test_ttl(self, _system, mocker):
+
+        from kutil.process import ProcessTable
+
+        table, _ = _system
+        table[1] = ("init", "/sbin/init")
+
+        now = mocker.patch("kutil.process.time.monotonic", return_value=100.0)
+        process_table = ProcessTable(ttl=2)
+
+        assert ProcessTable() is process_table
+        assert sorted(process_table.get_processes()) == [1]
+
+        table[2] = ("app", "/opt/app")
+        now.return_value = 101.0
+
+        assert sorted(process_table.get_processes()) == [1]
+
+        now.return_value = 102.0
+
+        assert sorted(process_table.get_processes()) == [1, 2]
+
+    def test_configure(self, _system, mocker):
+        """
+        Tests that configured ttl applies to the existing table,
+        to tables created after reset and to kutil.process functions.
+        """
+
+        from kutil.meta import reset
+        from kutil.process import ProcessTable, DEFAULT_PROCESS_TABLE_TTL, get_running_processes
+
+        table, _ = _system
+        table[1] = ("app", "/opt/app")
+        now = mocker.patch("kutil.process.time.monotonic", return_value=100.0)
+
+        process_table = ProcessTable()
+
+        assert process_table.ttl == DEFAULT_PROCESS_TABLE_TTL
+
+        # Table already exists, constructor argument is ignored.
+        assert ProcessTable(ttl=5).ttl == DEFAULT_PROCESS_TABLE_TTL
+
+        ProcessTable.configure(ttl=10)
+
+        assert process_table.ttl == 10
+        assert list(get_running_processes(["app"], cached=True)) == ["app"]
+
+        table[2] = ("other", "/opt/other")
+        now.return_value = 105.0
+
+        assert sorted(process_table.get_processes()) == [1]
+
+        reset(ProcessTable)
+
+        assert ProcessTable().ttl == 10
+
+        with pytest.raises(ValueError):
+            ProcessTable.configure(ttl=-1)
+
+    def test_vanished_before_resolve(self, _system, module_patch):
+
+        from kutil.process import ProcessTable
+
+        table, _ = _system
+        table[1] = ("init", "/sbin/init")
+        module_patch("psutil.pids", return_value=[1, 2])
+
+        assert sorted(ProcessTable().get_processes()) == [1]
+
+    def test_find(self, _system):
+
+        from kutil.process import ProcessTable
+
+        table, _ = _system
+        table.update({1: ("app", "/opt/app"), 2: ("app", "/opt/app"), 3: ("other", "/opt/other")})
+
+        found = ProcessTable().find(["app", "missing"])
+
+        assert list(found) == ["app"]
+        assert [info.pid for info in found["app"]] == [1, 2]
+
+    def test_cached_get_running_processes(self, _system, module_patch):
+
+        from kutil.process import get_running_processes
+
+        table, _ = _system
+        table.update({1: ("app", "/opt/app"), 2: ("other", "/opt/other")})
+        process_iter = module_patch("psutil.process_iter")
+
+        running = get_running_processes(["app"], attrs=["exe"], cached=True)
+
+        assert [process.pid for process in running["app"]] == [1]
+        assert running["app"][0].info["exe"] == "/opt/app"
+        process_iter.assert_not_called()
+
+        with pytest.raises(ValueError):
+            get_running_processes(["app"], attrs=["cmdline"], cached=True)
+
+    def test_cached_is_process_already_running(self, _system, module_patch):
+
+        from kutil.process import is_process_already_running, ProcessTable
+
+        table, _ = _system
+        module_patch("os.getpid", return_value=1)
+        module_patch("sys.executable", "/opt/app")
+        module_patch("os.path.realpath", side_effect=lambda path: path)
+
+        table.update({1: ("app", "/opt/app"), 2: ("app", "/usr/bin/app"), 3: ("app", "denied")})
+
+        assert is_process_already_running("app", cached=True) is False
+
+        table[4] = ("app", "/opt/app")
+        ProcessTable().refresh()
+
+        assert is_process_already_running("app", cached=True) is True
+
+    def test_reused_pid(self, _system, module_patch):
+        """
+        Tests that process isn't returned if its pid was reused
+        after the snapshot was taken.
+        """
+
+        from kutil.process import get_running_processes, ProcessTable
+
+        table, _ = _system
+        table.update({1: ("app", "/opt/app"), 2: ("app", "/opt/app")})
+        ProcessTable().get_processes()
+
+        process_class = psutil.Process.side_effect
+
+        def reused_process(pid):
+            process = process_class(pid)
+
+            if pid == 2:
+                process.create_time.return_value = 20.0
+
+            return process
+
+        module_patch("psutil.Process", side_effect=reused_process)
+
+        running = get_running_processes(["app"], cached=True)
+
+        assert [process.pid for process in running["app"]] == [1]
+
+    def test_reused_pid_refresh(self, _system, module_patch):
+        """
+        Tests that entry of reused pid is replaced on refresh.
+        """
+
+        from kutil.process import get_running_processes, ProcessTable
+
+        table, _ = _system
+        table.update({1: ("app", "/opt/app"), 2: ("app", "/opt/app")})
+        process_table = ProcessTable()
+        processes = process_table.get_processes()
+
+        module_patch("psutil.Process", side_effect=_reused(psutil.Process.side_effect, table, 2, 20.0))
+        table[2] = ("worker", "/opt/worker")
+        process_table.refresh()
+
+        refreshed = process_table.get_processes()
+
+        assert refreshed[1] is processes[1]
+        assert refreshed[2] == (2, "worker", "/opt/worker", 20.0)
+
+        running = get_running_processes(["app", "worker"], cached=True)
+
+        assert [process.pid for process in running["app"]] == [1]
+        assert [process.pid for process in running["worker"]] == [2]
+
+
+class TestInstanceLock:
+
+    @pytest.fixture(autouse=True)
+    def _runtime_directory(self, tmp_path):
+        from kutil.process import set_runtime_directory
+
+        set_runtime_directory(str(tmp_path))
+        yield tmp_path
+        set_runtime_directory(None)
+
+    def test_single_instance(self, _runtime_directory):
+        """
+        Tests that only one lock of the name can be acquired at a time.
+        """
+
+        from kutil.process import InstanceLock
+
+        first = InstanceLock("app")
+        second = InstanceLock("app")
+
+        assert first.path == str(_runtime_directory / "app.lock")
+        assert first.acquire() is True
+        assert first.acquire() is True
+        assert first.locked
+
+        assert second.acquire() is False
+        assert not second.locked
+        assert second.get_owner_pid() == os.getpid()
+
+        # Other names are independent.
+        assert InstanceLock("other").acquire() is True
+
+        first.release()
+        first.release()
+
+        assert first.get_owner_pid() is None
+        assert second.acquire() is True
+
+        second.release()
+
+    def test_context_manager(self, tmp_path):
+
+        from kutil.process import InstanceLock
+
+        directory = str(tmp_path / "nested" / "run")
+
+        with InstanceLock("app", directory) as lock:
+            assert lock.locked
+
+            with pytest.raises(RuntimeError, match=f"pid {os.getpid()}"):
+                with InstanceLock("app", directory):
+                    pass
+
+        assert not lock.locked
+
+        with InstanceLock("app", directory):
+            pass
+
+    @pytest.mark.skipif(os.name != "posix", reason="Test process locks with fcntl")
+    def test_other_process(self, _runtime_directory):
+        """
+        Tests that lock is held against another process
+        and released by the OS when the owner exits.
+        """
+
+        import subprocess
+        from kutil.process import InstanceLock
+
+        script = ("import fcntl, os, sys\n"
+                  "descriptor = os.open(sys.argv[1], os.O_RDWR | os.O_CREAT)\n"
+                  "fcntl.flock(descriptor, fcntl.LOCK_EX)\n"
+                  "print('locked', flush=True)\n"
+                  "sys.stdin.read()\n")
+
+        lock = InstanceLock("app")
+        owner = subprocess.Popen([sys.executable, "-c", script, lock.path],
+                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+        try:
+            assert owner.stdout.readline() == "locked\n"
+            assert lock.acquire() is False
+
+        finally:
+            owner.stdin.close()
+            owner.wait()
+
+        assert lock.acquire() is True
+        lock.release()
+
+    def test_default_directory(self, monkeypatch):
+
+        import tempfile
+        from kutil.process import get_runtime_directory, set_runtime_directory, InstanceLock
+
+        set_runtime_directory(None)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+
+        assert get_runtime_directory() == "/run/user/1000"
+        assert InstanceLock("app").path == os.path.join("/run/user/1000", "app.lock")
+
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+
+        assert get_runtime_directory() == tempfile.gettempdir()
+
+
+class TestProcessWatcher:
+
+    def test_events(self, _system):
+        """
+        Tests that start and exit of watched processes
+        are reported once, relative to the baseline.
+        """
+
+        from kutil.process import ProcessWatcher, PROCESS_STARTED, PROCESS_EXITED
+
+        table, process_mock = _system
+        table.update({1: ("init", "/sbin/init"), 2: ("worker", "/opt/worker")})
+
+        events = []
+        watcher = ProcessWatcher(["worker"])
+        watcher.subscribe(events.append)
+
+        assert watcher.poll() == []
+
+        table.update({3: ("worker", "/opt/worker"), 4: ("other", "/opt/other")})
+        del table[2]
+
+        assert [(event.kind, event.info.pid) for event in watcher.poll()] == [
+            (PROCESS_EXITED, 2), (PROCESS_STARTED, 3)
+        ]
+        assert [event.info.name for event in events] == ["worker", "worker"]
+
+        resolved = process_mock.call_count
+
+        # Nothing changed, create times are checked but nothing is resolved again.
+        assert watcher.poll() == []
+        assert process_mock.call_count == resolved + len(table)
+
+        watcher.unsubscribe(events.append)
+        del table[3]
+
+        assert [event.kind for event in watcher.poll()] == [PROCESS_EXITED]
+        assert len(events) == 2
+
+    def test_reused_pid(self, _system, module_patch):
+        """
+        Tests that reuse of watched pid is reported
+        as exit of the old process and start of the new one.
+        """
+
+        from kutil.process import ProcessWatcher, PROCESS_STARTED, PROCESS_EXITED
+
+        table, _ = _system
+        table.update({1: ("worker", "/opt/worker")})
+
+        watcher = ProcessWatcher(["worker"])
+        watcher.poll()
+
+        module_patch("psutil.Process", side_effect=_reused(psutil.Process.side_effect, table, 1, 10.0))
+
+        assert [(event.kind, event.info.create_time) for event in watcher.poll()] == [
+            (PROCESS_EXITED, 1.0), (PROCESS_STARTED, 10.0)
+        ]
+        assert watcher.poll() == []
+
+    def test_all_processes(self, _system):
+
+        from kutil.process import ProcessWatcher, PROCESS_STARTED
+
+        table, _ = _system
+        watcher = ProcessWatcher()
+        watcher.poll()
+
+        table.update({5: ("a", "/a"), 6: ("b", "/b")})
+
+        assert [(event.kind, event.info.name) for event in watcher.poll()] == [
+            (PROCESS_STARTED, "a"), (PROCESS_STARTED, "b")
+        ]
+
+    def test_backoff(self, _system):
+
+        from kutil.process import ProcessWatcher
+
+        table, _ = _system
+        watcher = ProcessWatcher(["app"], min_interval=1, max_interval=5, backoff=2)
+
+        assert watcher.interval == 1
+
+        intervals = []
+
+        for _ in range(4):
+            watcher.poll()
+            intervals.append(watcher.interval)
+
+        assert intervals == [2, 4, 5, 5]
+
+        table[1] = ("app", "/opt/app")
+        watcher.poll()
+
+        assert watcher.interval == 1
+
+        with pytest.raises(ValueError):
+            ProcessWatcher(min_interval=2, max_interval=1)
+
+        with pytest.raises(ValueError):
+            ProcessWatcher(backoff=0.5)
+
+    def test_failing_callback(self, _system):
+
+        from kutil.process import ProcessWatcher
+
+        table, _ = _system
+        received = []
+
+        def fail(_):
+            raise RuntimeError("boom")
+
+        watcher = ProcessWatcher(["app"])
+        watcher.subscribe(fail)
+        watcher.subscribe(received.append)
+        watcher.poll()
+
+        table[1] = ("app", "/opt/app")
+
+        assert len(watcher.poll()) == 1
+        assert len(received) == 1
+
+    def test_thread(self, _system):
+
+        import threading
+        from kutil.process import ProcessWatcher
+
+        table, _ = _system
+        started = threading.Event()
+
+        watcher = ProcessWatcher(["app"], min_interval=0.01, max_interval=0.02)
+        watcher.subscribe(lambda event: started.set())
+        watcher.start()
+
+        try:
+            table[1] = ("app", "/opt/app")
+            assert started.wait(5)
+
+        finally:
+            watcher.stop()
+
+    def test_async_iteration(self, _system):
+
+        import asyncio
+        from kutil.process import ProcessWatcher, PROCESS_STARTED, PROCESS_EXITED
+
+        table, _ = _system
+        table[1] = ("app", "/opt/app")
+        watcher = ProcessWatcher(["app"], min_interval=0.01, max_interval=0.02)
+
+        async def collect():
+            events = []
+
+            async for event in watcher:
+                events.append((event.kind, event.info.pid))
+
+                if event.kind == PROCESS_STARTED:
+                    del table[1]
+
+                else:
+                    watcher.stop()
+
+            return events
+
+        async def run():
+            task = asyncio.create_task(collect())
+            await asyncio.sleep(0.05)
+            table[2] = ("app", "/opt/app")
+            return await asyncio.wait_for(task, 5)
+
+        assert asyncio.run(run()) == [(PROCESS_STARTED, 2), (PROCESS_EXITED, 1)]
+
+    def test_async_stop(self, _system):
+        """
+        Tests that stop() ends asynchronous iteration
+        without waiting for the polling interval.
+        """
+
+        import asyncio
+        import threading
+        import time
+        from kutil.process import ProcessWatcher
+
+        table, _ = _system
+        watcher = ProcessWatcher(min_interval=60, max_interval=60)
+
+        async def collect():
+            return [event async for event in watcher]
+
+        async def run():
+            task = asyncio.create_task(collect())
+            await asyncio.sleep(0.05)
+
+            stopping = threading.Thread(target=watcher.stop)
+            stopping.start()
+
+            started = time.monotonic()
+            events = await asyncio.wait_for(task, 5)
+            stopping.join()
+
+            return events, time.monotonic() - started
+
+        events, elapsed = asyncio.run(run())
+
+        assert events == []
+        assert elapsed < 1
+
+
+class TestResourceSampler:
+
+    @staticmethod
+    def create_process(pid: int, rss_values: list[int], cpu_values: list[float] = None) -> mock.MagicMock:
+        """
+        Creates mock process returning next of the values on each sample.
+        """
+
+        process = mock.MagicMock(spec=psutil.Process)
+        process.pid = pid
+        process.memory_info.side_effect = [mock.Mock(rss=rss) for rss in rss_values]
+        process.cpu_percent.side_effect = [0.0] + (cpu_values or [1.0] * len(rss_values))
+
+        return process
+
+    def test_sample(self, mocker):
+        """
+        Tests that every process is read within a single oneshot
+        context per tick and samples are kept in order.
+        """
+
+        from kutil.process import ResourceSampler, RSS_METRIC, CPU_PERCENT_METRIC
+
+        now = mocker.patch("kutil.process.time.monotonic", return_value=10.0)
+        first = self.create_process(1, [100, 200, 300], [5.0, 10.0, 15.0])
+        second = self.create_process(2, [50, 50, 50])
+
+        sampler = ResourceSampler()
+        sampler.add(first, second, first)
+
+        assert sampler.pids == [1, 2]
+
+        for moment in (11.0, 12.0, 13.0):
+            now.return_value = moment
+            assert sampler.sample() == moment
+
+        assert first.oneshot.call_count == 3
+        assert first.memory_info.call_count == 3
+        assert sampler.get_samples(1, RSS_METRIC) == [(11.0, 100), (12.0, 200), (13.0, 300)]
+        assert sampler.get_samples(1, CPU_PERCENT_METRIC, window=1.5) == [(12.0, 10.0), (13.0, 15.0)]
+        assert sampler.get_samples(3, RSS_METRIC) == []
+
+        with pytest.raises(ValueError):
+            sampler.get_samples(1, "num_threads")
+
+    def test_ring_buffer(self, mocker):
+
+        from kutil.process import ResourceSampler, RSS_METRIC
+
+        now = mocker.patch("kutil.process.time.monotonic")
+        sampler = ResourceSampler(metrics=[RSS_METRIC], capacity=3)
+        sampler.add(self.create_process(1, list(range(10))))
+
+        for moment in range(10):
+            now.return_value = float(moment)
+            sampler.sample()
+
+        assert sampler.get_samples(1, RSS_METRIC) == [(7.0, 7), (8.0, 8), (9.0, 9)]
+
+    def test_stats(self, mocker):
+
+        from kutil.process import ResourceSampler, ResourceStats, RSS_METRIC
+
+        now = mocker.patch("kutil.process.time.monotonic")
+        values = list(range(1, 101))
+        sampler = ResourceSampler(metrics=[RSS_METRIC], capacity=100)
+        sampler.add(self.create_process(1, values))
+
+        for moment in range(100):
+            now.return_value = float(moment)
+            sampler.sample()
+
+        assert sampler.get_stats(1, RSS_METRIC) == ResourceStats(100, 50.5, 95, 100)
+        assert sampler.get_stats(1, RSS_METRIC, window=9) == ResourceStats(10, 95.5, 100, 100)
+        assert sampler.get_stats(2, RSS_METRIC) is None
+
+    def test_exited_process(self, mocker):
+        """
+        Tests that exited process isn't sampled anymore,
+        but its samples are kept until removed.
+        """
+
+        from kutil.process import ResourceSampler, RSS_METRIC
+
+        mocker.patch("kutil.process.time.monotonic", return_value=1.0)
+        process = self.create_process(1, [100])
+        process.memory_info.side_effect = [mock.Mock(rss=100), psutil.NoSuchProcess(1)]
+        denied = self.create_process(2, [])
+        denied.memory_info.side_effect = psutil.AccessDenied(2)
+
+        sampler = ResourceSampler(metrics=[RSS_METRIC])
+        sampler.add(process, denied)
+        sampler.sample()
+        sampler.sample()
+        sampler.sample()
+
+        assert not sampler.is_running(1)
+        assert sampler.is_running(2)
+        assert process.memory_info.call_count == 2
+        assert sampler.get_samples(1, RSS_METRIC) == [(1.0, 100)]
+        assert sampler.get_samples(2, RSS_METRIC) == []
+
+        sampler.remove(1)
+
+        assert sampler.pids == [2]
+
+    def test_add_pid(self):
+
+        from kutil.process import ResourceSampler, RSS_METRIC
+
+        sampler = ResourceSampler()
+        sampler.add(os.getpid(), 2 ** 22 + 1)
+        sampler.sample()
+
+        assert sampler.pids == [os.getpid()]
+        assert sampler.get_stats(os.getpid(), RSS_METRIC).max > 0
+
+        with pytest.raises(ValueError):
+            ResourceSampler(metrics=["io"])
+
+        with pytest.raises(ValueError):
+            ResourceSampler(capacity=0)
+
+    def test_thread(self):
+
+        import time
+        from kutil.process import ResourceSampler, RSS_METRIC
+
+        sampler = ResourceSampler(metrics=[RSS_METRIC])
+        sampler.add(os.getpid())
+        sampler.start(interval=0.01)
+
+        try:
+            deadline = time.monotonic() + 5
+
+            while not sampler.get_samples(os.getpid(), RSS_METRIC) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        finally:
+            sampler.stop()
+
+        assert sampler.get_samples(os.getpid(), RSS_METRIC)
+
+
+class TestProcessRunner:
+
+    def test_initialize_worker(self, module_patch):
+
+        from kutil.process import initialize_worker
+
+        worker_logging = module_patch("initialize_worker_logging")
+        reset = module_patch("reset")
+        hooks = [mock.Mock(), mock.Mock()]
+
+        initialize_worker("queue", "logback.json", True, hooks)
+
+        worker_logging.assert_called_once_with("queue", "logback.json")
+        reset.assert_called_once_with()
+
+        for hook in hooks:
+            hook.assert_called_once_with()
+
+        worker_logging.reset_mock()
+        reset.reset_mock()
+
+        initialize_worker(reset_singletons=False)
+
+        # Inherited handlers are replaced even without queue.
+        worker_logging.assert_called_once_with(None, None)
+        reset.assert_not_called()
+
+    def test_worker_initializer(self, module_patch):
+        """
+        Tests that workers get log queue and logback of the parent.
+        """
+
+        from kutil.process import ProcessRunner, initialize_worker
+
+        get_log_queue = module_patch("get_log_queue", return_value="queue")
+        module_patch("get_logback_path", return_value="logback.json")
+        worker_log_queue = module_patch("WorkerLogQueue")
+        executor = module_patch("ProcessPoolExecutor")
+
+        runner = ProcessRunner(3, warm_ups=[_WarmUp])
+
+        assert runner.max_workers == 3
+        get_log_queue.assert_called_once_with(None)
+        worker_log_queue.assert_not_called()
+        executor.assert_called_once_with(3, mp_context=None, initializer=initialize_worker,
+                                         initargs=("queue", "logback.json", True, (_WarmUp,)))
+
+    def test_worker_log_queue(self, module_patch):
+        """
+        Tests that runner collects records of workers through its own
+        queue when parent doesn't aggregate logs, closed on shutdown.
+        """
+
+        from kutil.process import ProcessRunner, initialize_worker
+
+        module_patch("get_log_queue", return_value=None)
+        module_patch("get_logback_path", return_value=None)
+        worker_log_queue = module_patch("WorkerLogQueue")
+        executor = module_patch("ProcessPoolExecutor")
+        context = mock.Mock()
+
+        runner = ProcessRunner(2, mp_context=context)
+
+        worker_log_queue.assert_called_once_with(context)
+        executor.assert_called_once_with(2, mp_context=context, initializer=initialize_worker,
+                                         initargs=(worker_log_queue.return_value.queue, None, True, ()))
+
+        runner.shutdown()
+        runner.shutdown()
+
+        worker_log_queue.return_value.close.assert_called_once_with()
+
+    def test_map(self):
+
+        from kutil.process import ProcessRunner
+
+        with ProcessRunner(2, warm_ups=[_WarmUp]) as runner:
+            assert list(runner.map(_square, range(20), chunk_size=3)) == [value * value for value in range(20)]
+            assert sorted(runner.map(_square, range(10), ordered=False)) == [value * value for value in range(10)]
+            assert list(runner.map(_square, [])) == []
+
+            # Hooks ran in the workers, not in this process.
+            warm_up_pids = {runner.submit(_get_warm_up_pid).result() for _ in range(4)}
+
+            assert None not in warm_up_pids
+            assert os.getpid() not in warm_up_pids
+            assert _WarmUp.pid is None
+
+            with pytest.raises(ValueError):
+                runner.map(_square, range(3), chunk_size=0)
+
+            with pytest.raises(ValueError):
+                runner.map(_square, range(3), max_in_flight=0)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork start method.")
+    @pytest.mark.parametrize("start_method, options", [
+        ("fork", {}),
+        ("fork", {"use_queue": True, "queue_size": 10}),
+        ("fork", {"aggregate": True}),
+        ("spawn", {"aggregate": True}),
+    ])
+    def test_worker_logging(self, tmp_path, _logging, start_method, options):
+        """
+        Tests that records of workers are written by the parent
+        in every logging mode, without workers blocking on queue
+        they inherited and nothing drains.
+        """
+
+        import logging
+        import multiprocessing
+        from kutil.process import ProcessRunner
+
+        _logging.initialize_logging(str(tmp_path), "missing_logback.json", **options)
+
+        with ProcessRunner(1, mp_context=multiprocessing.get_context(start_method)) as runner:
+            assert runner.submit(_log_records, 50).result(timeout=30) == 50
+
+            # Worker only sends records to the parent.
+            assert runner.submit(_get_root_handlers).result(timeout=30) == ["QueueHandler"]
+
+        logging.getLogger("com.app.parent").warning("Parent record")
+        _logging.shutdown_logging()
+
+        with open(tmp_path / "my_service.log", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+
+        assert sum("(com.app.worker:" in line for line in lines) == 50
+        assert sum("Parent record" in line for line in lines) == 1
+
+    def test_bounded_in_flight(self):
+        """
+        Tests that items are read only as far as
+        max_in_flight chunks ahead of consumed results.
+        """
+
+        from kutil.process import ProcessRunner
+
+        consumed = []
+
+        def items():
+            for value in range(1000):
+                consumed.append(value)
+                yield value
+
+        with ProcessRunner(1) as runner:
+            results = runner.map(_square, items(), chunk_size=5, max_in_flight=2)
+
+            assert consumed == []
+            assert next(results) == 0
+            assert len(consumed) == 10
+
+            results.close()
+
+        assert len(consumed) == 10
+
+    def test_parallel_map(self):
+
+        from kutil.process import parallel_map
+
+        assert list(parallel_map(_square, range(7), chunk_size=2, max_workers=2)) == [0, 1, 4, 9, 16, 25, 36]
@@ -0,0 +1,316 @@
+import os
+from unittest import mock
+
+import psutil
+import pytest
+
+
+def _stat(pid: int, name: str, state: str = "S", start_ticks: int = 100, cpu_ticks: int = 0, threads: int = 1):
+    fields = [state, "1"] + ["0"] * 9 + [str(cpu_ticks), "0"] + ["0"] * 4 + [str(threads), "0", str(start_ticks)]
+    return f"{pid} ({name}) {' '.join(fields + ['0'] * 30)}\n"
+
+
+def _sampled_process(pid: int, create_time: float):
+    process = mock.MagicMock(spec=psutil.Process, pid=pid)
+    process.create_time.return_value = create_time
+    return process
+
+
+class TestProcfs:
+
+    @pytest.fixture
+    def _proc(self, tmp_path, module_patch):
+        """
+        Fake /proc tree, returns function adding a process to it.
+        """
+
+        import kutil.procfs  # noqa
+
+        module_patch("PROC_PATH", str(tmp_path))
+        module_patch("_CLOCK_TICKS", 100)
+        module_patch("_PAGE_SIZE", 4096)
+        module_patch("psutil.boot_time", return_value=1000.0)
+
+        (tmp_path / "self").mkdir()
+        (tmp_path / "uptime").write_text("1.0 1.0\n")
+
+        def add_process(pid: int, name: str, exe=None, cmdline: str = "", state: str = "S"):
+            directory = tmp_path / str(pid)
+            directory.mkdir()
+            (directory / "stat").write_text(_stat(pid, name, state, start_ticks=pid * 100))
+            (directory / "cmdline").write_text(cmdline)
+            (directory / "statm").write_text("100 25 10 1 0 20 0\n")
+
+            if exe is not None:
+                os.symlink(exe, directory / "exe")
+
+            return directory
+
+        return add_process
+
+    def test_iter_processes(self, _proc, tmp_path):
+
+        from kutil.procfs import iter_processes
+
+        app = tmp_path / "app"
+        app.write_text("")
+
+        _proc(10, "app", exe=str(app), cmdline="app\x00--flag\x00")
+        _proc(2, "kthreadd")
+        _proc(30, "defunct", state="Z")
+        _proc(40, "gone", exe="/opt/gone (deleted)")
+
+        assert list(iter_processes()) == [
+            (2, "kthreadd", "", 1002.0),
+            (10, "app", str(app), 1010.0),
+            (30, "defunct", None, 1030.0),
+            (40, "gone", "/opt/gone", 1040.0),
+        ]
+
+    def test_name_filter(self, _proc, module_patch):
+        """
+        Tests that executable isn't read for processes with other names.
+        """
+
+        from kutil.procfs import iter_processes
+
+        _proc(1, "app", exe="/opt/app")
+        _proc(2, "other", exe="/opt/other")
+        _proc(3, "app", exe="/opt/app")
+
+        readlink = module_patch("os.readlink", wraps=os.readlink)
+
+        assert [entry[0] for entry in iter_processes(["app", "missing"])] == [1, 3]
+        assert readlink.call_count == 2
+
+    def test_truncated_name(self, _proc):
+        """
+        Tests that names truncated by kernel are completed
+        from cmdline only if it starts with the name.
+        """
+
+        from kutil.procfs import iter_processes
+
+        _proc(1, "long-process-na", cmdline="/usr/bin/long-process-name\x00-v\x00")
+        _proc(2, "long-process-na", cmdline="python3\x00script.py\x00")
+        _proc(3, "another-long-na", cmdline="/usr/bin/another-long-name --changed-title")
+        _proc(4, "exactly-15-char")
+
+        assert [entry[1] for entry in iter_processes()] == [
+            "long-process-name", "long-process-na", "another-long-name", "exactly-15-char"
+        ]
+
+        assert [entry[0] for entry in iter_processes(["long-process-name"])] == [1]
+        assert [entry[0] for entry in iter_processes(["long-process-na"])] == [2]
+
+    def test_vanished_process(self, _proc):
+
+        from kutil.procfs import read_process
+
+        _proc(1, "app")
+
+        assert read_process(2) is None
+        assert read_process(1, names={"other"}) is None
+        assert read_process(1, boot_time=0.0) == (1, "app", "", 1.0)
+
+    def test_read_create_time(self, _proc):
+
+        from kutil.procfs import read_create_time, read_process
+
+        directory = _proc(1, "app (worker) 2")
+
+        assert read_create_time(1) == read_process(1)[3] == 1001.0
+        assert read_create_time(1, boot_time=0.0) == 1.0
+        assert read_create_time(2) is None
+
+        (directory / "stat").write_text(_stat(1, "app", start_ticks=500))
+
+        assert read_create_time(1) == 1005.0
+
+    def test_read_usage(self, _proc, tmp_path):
+
+        from kutil.procfs import read_usage
+
+        directory = _proc(1, "app (worker) 2")
+        (directory / "stat").write_text(_stat(1, "app (worker) 2", cpu_ticks=250, threads=4))
+
+        assert read_usage(1) == (2.5, 25 * 4096, 4, 1001.0)
+        assert read_usage(1, boot_time=0.0)[3] == 1.0
+        assert read_usage(2) is None
+
+    @pytest.mark.skipif(not psutil.LINUX, reason="/proc is available only on Linux")
+    def test_usage_parity(self):
+
+        from kutil.procfs import read_usage
+
+        process = psutil.Process()
+        cpu_time, rss, num_threads, create_time = read_usage(process.pid)
+
+        assert cpu_time == pytest.approx(sum(process.cpu_times()[:2]), abs=0.05)
+        assert rss == pytest.approx(process.memory_info().rss, rel=0.1)
+        assert num_threads == process.num_threads()
+        assert create_time == process.create_time()
+
+    @pytest.mark.skipif(not psutil.LINUX, reason="/proc is available only on Linux")
+    def test_psutil_parity(self):
+        """
+        Tests that values read from real /proc are the same psutil reports.
+        """
+
+        from kutil.procfs import iter_processes
+
+        expected = {}
+
+        for process in psutil.process_iter(["name", "exe", "create_time"]):
+            info = process.info
+            expected[process.pid] = (process.pid, info["name"], info["exe"], info["create_time"])
+
+        entries = {entry[0]: entry for entry in iter_processes()}
+        common = set(expected) & set(entries)
+
+        assert os.getpid() in common
+
+        for pid in common:
+            assert entries[pid][:3] == expected[pid][:3]
+            assert entries[pid][3] == pytest.approx(expected[pid][3])
+
+
+class TestProcBackend:
+
+    @pytest.fixture
+    def _entries(self, module_patch, mocker):
+        """
+        Simulated /proc entries, extend the list to change them.
+        """
+
+        from kutil.process import PROC_BACKEND
+
+        entries = []
+
+        mocker.patch("kutil.process._backend", PROC_BACKEND)
+        module_patch("iter_processes",
+                     side_effect=lambda names=None: (entry for entry in entries
+                                                     if names is None or entry[1] in set(names)))
+
+        return entries
+
+    def test_set_process_backend(self, module_patch, mocker):
+
+        from kutil.process import get_process_backend, set_process_backend, PROC_BACKEND, PSUTIL_BACKEND
+
+        mocker.patch("kutil.process._backend", PROC_BACKEND)
+
+        set_process_backend(PSUTIL_BACKEND)
+        assert get_process_backend() == PSUTIL_BACKEND
+
+        with pytest.raises(ValueError):
+            set_process_backend("wmi")
+
+        module_patch("is_available", return_value=False)
+
+        with pytest.raises(ValueError):
+            set_process_backend(PROC_BACKEND)
+
+    def test_get_running_processes(self, _entries, module_patch):
+
+        from kutil.process import get_running_processes
+
+        process_class = psutil.Process
+
+        def create_process(pid):
+            process = mock.Mock(spec=process_class)
+            process.pid = pid
+            process.create_time.return_value = 5.0 if pid == 3 else float(pid)
+            return process
+
+        module_patch("psutil.Process", side_effect=create_process)
+        process_iter = module_patch("psutil.process_iter")
+
+        _entries.extend([(1, "app", "/opt/app", 1.0), (2, "other", "/opt/other", 2.0), (3, "app", "/opt/app", 3.0)])
+
+        running = get_running_processes(["app"], attrs=["exe"])
+
+        # Pid 3 was reused by another process.
+        assert [process.pid for process in running["app"]] == [1]
+        assert running["app"][0].info == {"exe": "/opt/app", "name": "app"}
+        process_iter.assert_not_called()
+
+        # Attributes not read from /proc fall back to psutil.
+        get_running_processes(["app"], attrs=["cmdline"])
+        process_iter.assert_called_once_with(["cmdline", "name"])
+
+    def test_is_process_already_running(self, _entries, module_patch):
+
+        from kutil.process import is_process_already_running
+
+        module_patch("os.getpid", return_value=1)
+        module_patch("sys.executable", "/opt/app")
+        module_patch("os.path.realpath", side_effect=lambda path: path)
+        process_iter = module_patch("psutil.process_iter")
+
+        _entries.extend([(1, "app", "/opt/app", 1.0), (2, "app", "/usr/bin/app", 2.0), (3, "app", None, None)])
+
+        assert is_process_already_running("app") is False
+
+        _entries.append((4, "app", "/opt/app", 4.0))
+
+        assert is_process_already_running("app") is True
+        process_iter.assert_not_called()
+
+    def test_resource_sampler(self, module_patch, mocker):
+        """
+        Tests that metrics are read from /proc once per process and tick,
+        with CPU percent relative to the previous read.
+        """
+
+        from kutil.process import ResourceSampler, ResourceStats, PROC_BACKEND, CPU_PERCENT_METRIC, RSS_METRIC
+
+        mocker.patch("kutil.process._backend", PROC_BACKEND)
+        now = mocker.patch("kutil.process.time.monotonic", return_value=0.0)
+        module_patch("psutil.boot_time", return_value=1000.0)
+        usage = {1: (1.0, 4096, 2, 1001.0)}
+        read_usage = module_patch("read_usage", side_effect=lambda pid, boot_time: usage.get(pid))
+
+        sampler = ResourceSampler()
+        sampler.add(_sampled_process(1, 1001.0))
+
+        now.return_value = 2.0
+        usage[1] = (2.0, 8192, 2, 1001.0)
+        sampler.sample()
+
+        assert read_usage.call_count == 2
+        assert sampler.get_samples(1, CPU_PERCENT_METRIC) == [(2.0, 50.0)]
+        assert sampler.get_samples(1, RSS_METRIC) == [(2.0, 8192)]
+
+        del usage[1]
+        sampler.sample()
+
+        assert not sampler.is_running(1)
+        assert sampler.get_stats(1, RSS_METRIC) == ResourceStats(1, 8192, 8192, 8192)
+
+    def test_resource_sampler_reused_pid(self, module_patch, mocker):
+        """
+        Tests that process is considered exited once its pid is reused,
+        rather than sampling the new process into its series.
+        """
+
+        from kutil.process import ResourceSampler, PROC_BACKEND, CPU_PERCENT_METRIC
+
+        mocker.patch("kutil.process._backend", PROC_BACKEND)
+        now = mocker.patch("kutil.process.time.monotonic", return_value=0.0)
+        module_patch("psutil.boot_time", return_value=1000.0)
+        usage = {1: (10.0, 4096, 2, 1001.0), 2: (1.0, 4096, 1, 1050.0)}
+        module_patch("read_usage", side_effect=lambda pid, boot_time: usage.get(pid))
+
+        sampler = ResourceSampler()
+        sampler.add(_sampled_process(1, 1001.0), _sampled_process(2, 1002.0))
+
+        # Pid 2 was reused before it was added.
+        assert sampler.pids == [1]
+
+        now.return_value = 1.0
+        usage[1] = (0.5, 8192, 8, 1060.0)
+        sampler.sample()
+
+        assert not sampler.is_running(1)
+        assert sampler.get_samples(1, CPU_PERCENT_METRIC) == []
@@ -175,3 +175,138 @@ class TestReflectionUtil:
 
         assert len(methods) == 1
         assert methods[0] == ("test_method", instance.test_method)
+
+
+class TestMemberCache:
+
+    @pytest.fixture
+    def _plugins(self, tmp_path, monkeypatch):
+        """
+        Creates importable package with plugin modules, returns
+        its name and directory. Modules are unloaded after the test.
+        """
+
+        import sys
+        from kutil.reflection import set_member_cache_path
+
+        package_name = f"plugins_{tmp_path.name}".replace("-", "_")
+        package_directory = tmp_path / package_name
+        (package_directory / "nested").mkdir(parents=True)
+        (package_directory / "__init__.py").write_text("")
+        (package_directory / "nested" / "__init__.py").write_text("")
+
+        (package_directory / "base.py").write_text("class Plugin:\n    pass\n")
+        (package_directory / "first.py").write_text(
+            f"from {package_name}.base import Plugin\n\nclass First(Plugin):\n    pass\n"
+        )
+        (package_directory / "nested" / "second.py").write_text(
+            f"from {package_name}.base import Plugin\n\nclass Second(Plugin):\n    pass\n"
+        )
+        (package_directory / "helpers.py").write_text("class Helper:\n    pass\n")
+
+        monkeypatch.syspath_prepend(str(tmp_path))
+        set_member_cache_path(str(tmp_path / "cache" / "members.json"))
+
+        yield package_name, package_directory
+
+        set_member_cache_path(None)
+
+        for module_name in [name for name in sys.modules if name.startswith(package_name)]:
+            del sys.modules[module_name]
+
+    def test_warm_start(self, _plugins, mocker):
+        """
+        Tests that once cached, only modules with
+        matching members are imported, without walk.
+        """
+
+        import importlib
+        import json
+        import pkgutil
+        from kutil.reflection import get_members, get_member_cache_path, set_member_cache_path
+
+        package_name, _ = _plugins
+        plugin_class = importlib.import_module(f"{package_name}.base").Plugin
+
+        import_module = mocker.patch("kutil.reflection.importlib.import_module", wraps=importlib.import_module)
+        walk_packages = mocker.patch("kutil.reflection.pkgutil.walk_packages", wraps=pkgutil.walk_packages)
+
+        cold = sorted(name for name, _ in get_members(package_name, plugin_class, cached=True))
+
+        assert cold == ["First", "Second"]
+        assert walk_packages.called
+
+        persisted = json.loads(open(get_member_cache_path()).read())
+        assert list(persisted.values())[0]["modules"] == [f"{package_name}.first", f"{package_name}.nested.second"]
+
+        # Reload from disk, as a new process would.
+        set_member_cache_path(get_member_cache_path())
+        import_module.reset_mock()
+        walk_packages.reset_mock()
+
+        warm = sorted(name for name, _ in get_members(package_name, plugin_class, cached=True))
+
+        assert warm == cold
+        walk_packages.assert_not_called()
+        assert [call.args[0] for call in import_module.call_args_list] == [
+            f"{package_name}.first", f"{package_name}.nested.second"
+        ]
+
+    def test_invalidation(self, _plugins):
+        """
+        Tests that added or modified modules invalidate the cache.
+        """
+
+        import importlib
+        import os
+        import sys
+        from kutil.reflection import get_members
+
+        package_name, package_directory = _plugins
+        plugin_class = importlib.import_module(f"{package_name}.base").Plugin
+
+        def names():
+            return sorted(name for name, _ in get_members(package_name, plugin_class, cached=True))
+
+        assert names() == ["First", "Second"]
+
+        (package_directory / "third.py").write_text(
+            f"from {package_name}.base import Plugin\n\nclass Third(Plugin):\n    pass\n"
+        )
+
+        assert names() == ["First", "Second", "Third"]
+
+        helpers = package_directory / "helpers.py"
+        helpers.write_text(f"from {package_name}.base import Plugin\n\nclass Helper(Plugin):\n    pass\n")
+        os.utime(helpers, ns=(0, 10 ** 9))
+        del sys.modules[f"{package_name}.helpers"]
+
+        assert names() == ["First", "Helper", "Second", "Third"]
+
+    def test_clear_member_cache(self, _plugins):
+
+        import importlib
+        import os
+        from kutil.reflection import clear_member_cache, get_members, get_member_cache_path
+
+        package_name, _ = _plugins
+        plugin_class = importlib.import_module(f"{package_name}.base").Plugin
+
+        list(get_members(package_name, plugin_class, cached=True))
+
+        assert os.path.exists(get_member_cache_path())
+
+        clear_member_cache()
+        clear_member_cache()
+
+        assert not os.path.exists(get_member_cache_path())
+        assert len(list(get_members(package_name, plugin_class, cached=True))) == 2
+
+    def test_default_cache_path(self, monkeypatch):
+
+        import os
+        from kutil.reflection import get_member_cache_path
+
+        monkeypatch.setenv("XDG_CACHE_HOME", "/var/cache/app")
+
+        assert get_member_cache_path() == os.path.join("/var/cache/app", "kutil", "members.json")